@@ -9,13 +9,28 @@ ALGORITHM_DIRECT = 4   # SciPy: DIRECT algorithm
 ALGORITHM_MOEAD = 5    # PyGMO: Multi-Objective Evolutionary Algorithm based on Decomposition
 ALGORITHM_MACO = 6     # PyGMO: Multi-objective Ant Colony Optimizer
 ALGORITHM_PSO = 7      # PyGMO: Non-dominated Sorting Particle Swarm Optimizer
+ALGORITHM_MILP = 8     # SciPy/HiGHS: exact MILP for branched networks (Stage 1)
+ALGORITHM_IDE = 9      # Native: integer Differential Evolution
 
 # Global Optimization Parameters
 PENALTY_VALUE = 1e9          # Base penalty added to infeasible solutions in SciPy
 MAX_RETRIES = 3              # Default number of retries if an algorithm fails to improve the baseline
 MAX_ALGORITHM_TIME = 120    # Maximum time (in seconds) allowed per algorithm execution
 
+# Integer Differential Evolution (IDE)
+IDE_BUDGET = 10000               # Default number of evaluated designs per run
+IDE_MIN_POPULATION = 10          # Population size bounds (the size is about the square root of the budget)
+IDE_MAX_POPULATION = 200
+IDE_MUTATION = 0.3               # Differential weight F
+IDE_CROSSOVER = 0.7              # Binomial crossover probability
+
+# Accelerated Unit Headloss Heuristic (UHMode FAST)
+UH_MAX_BATCH_FRACTION = 0.2      # Share of pipes upgraded per iteration when the deficit equals the required pressure
+
 # Local Search (FLS-H) Settings
 LS_MAX_ITER = 50                 # Maximum iterations for the refinement loop
 LS_ACCEPTANCE_THRESHOLD = 0.01   # Percentage (0.01 = 1%) of allowed cost worsening to escape local minima
 LS_NEIGHBORHOOD_SIZE = 20        # Number of mutated candidate solutions generated per iteration
+
+# Native Hydraulic Engine
+NATIVE_BATCH_SIZE = 256          # Designs solved together in one stacked system
@@ -0,0 +1,150 @@
+"""Dominance-based feasibility inference for pipe network designs.
+
+Pressures grow (very nearly) monotonically with the pipe diameters, so once a
+design is known to be feasible every design with all indexes greater or equal
+is feasible too, and once a design is known to be infeasible every design with
+all indexes lower or equal is infeasible. This module keeps the two frontiers
+of known results, the minimal feasible designs and the maximal infeasible ones,
+and answers feasibility queries from them without simulating.
+
+Monotonicity is an approximation (e.g. with pumps or valves it may not hold),
+so a fraction of the inferred answers is verified by simulation; the index
+disables itself at the first contradiction.
+"""
+
+import logging
+from typing import Dict, Optional
+
+import numpy as np
+
+# Logger configuration
+logger = logging.getLogger(__name__)
+
+# Verifications awaiting their simulation; withheld designs that are never
+# simulated (e.g. dropped by the caller) are forgotten oldest first
+_MAX_PENDING = 64
+
+
+class _Frontier:
+    """Antichain of designs under the componentwise order.
+
+    With `upper` False the designs are minimal (a query is covered when it is
+    greater or equal than some design); with `upper` True they are maximal (a
+    query is covered when it is lower or equal than some design).
+    """
+
+    def __init__(self, dimension: int, max_entries: int, upper: bool):
+        self.upper = upper
+        self.max_entries = max_entries
+        self._designs = np.empty((0, dimension), dtype=np.int16)
+        self._sums = np.empty(0, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self._sums)
+
+    def covers(self, x: np.ndarray) -> bool:
+        """Whether a stored design dominates x in the frontier's direction."""
+        total = int(x.sum())
+        # Componentwise order implies order of the sums: a cheap prefilter
+        candidates = self._sums >= total if self.upper else self._sums <= total
+        if not candidates.any():
+            return False
+        designs = self._designs[candidates]
+        if self.upper:
+            return bool((designs >= x).all(axis=1).any())
+        return bool((designs <= x).all(axis=1).any())
+
+    def add(self, x: np.ndarray) -> None:
+        """Inserts x unless it is covered, dropping the designs it covers."""
+        if self.covers(x):
+            return
+        if len(self._sums):
+            covered = (self._designs <= x) if self.upper else (self._designs >= x)
+            keep = ~covered.all(axis=1)
+            self._designs, self._sums = self._designs[keep], self._sums[keep]
+        self._designs = np.vstack([self._designs, x.astype(np.int16)[np.newaxis, :]])
+        self._sums = np.append(self._sums, int(x.sum()))
+        if len(self._sums) > self.max_entries:
+            # Oldest designs go first
+            self._designs, self._sums = self._designs[1:], self._sums[1:]
+
+
+class DominanceIndex:
+    """Frontiers of known feasible and infeasible designs.
+
+    Attributes:
+        verify_rate (float): Fraction of inferred answers that are withheld so
+            the design is simulated and the inference checked.
+        enabled (bool): False once an inference was contradicted by a simulation.
+        inferred (int): Number of queries answered from the frontiers.
+        verified (int): Number of inferences checked by simulation.
+    """
+
+    def __init__(self, dimension: int, verify_rate: float = 0.02, max_entries: int = 2048,
+                 seed: Optional[int] = None):
+        """Initializes empty frontiers.
+
+        Args:
+            dimension: Number of sized pipes.
+            verify_rate: Fraction of inferences checked by simulation.
+            max_entries: Maximum number of designs kept in each frontier.
+            seed: Seed of the verification sampling.
+        """
+        self.verify_rate = verify_rate
+        self.enabled = True
+        self.inferred = 0
+        self.verified = 0
+        self._feasible = _Frontier(dimension, max_entries, upper=False)
+        self._infeasible = _Frontier(dimension, max_entries, upper=True)
+        self._rng = np.random.default_rng(seed)
+        self._pending: Dict[bytes, bool] = {}
+
+    def infer(self, x: np.ndarray, feasible_only: bool = False) -> Optional[bool]:
+        """Returns the feasibility of x implied by the known designs, or None if unknown.
+
+        Inferences sampled for verification are returned as unknown; the caller
+        simulates the design and the result is checked when it is `add`-ed.
+
+        Args:
+            x: Design to classify.
+            feasible_only: Answer only implied feasibility, for callers that
+                simulate infeasible designs anyway; those are not counted as
+                inferred.
+        """
+        if not self.enabled:
+            return None
+        x = np.asarray(x)
+        if self._feasible.covers(x):
+            feasible = True
+        elif not feasible_only and self._infeasible.covers(x):
+            feasible = False
+        else:
+            return None
+        if self.verify_rate > 0 and self._rng.random() < self.verify_rate:
+            if len(self._pending) >= _MAX_PENDING:
+                del self._pending[next(iter(self._pending))]
+            self._pending[x.astype(np.int16).tobytes()] = feasible
+            return None
+        self.inferred += 1
+        return feasible
+
+    def add(self, x: np.ndarray, feasible: bool) -> None:
+        """Records the simulated feasibility of a design."""
+        if not self.enabled:
+            return
+        x = np.asarray(x)
+        expected = self._pending.pop(x.astype(np.int16).tobytes(), None)
+        if expected is not None:
+            self.verified += 1
+            if expected != feasible:
+                logger.warning("Dominance inference contradicted by a simulation: "
+                               "feasibility is not monotone in this network; inference disabled.")
+                self.enabled = False
+                return
+        (self._feasible if feasible else self._infeasible).add(x)
+
+    def summary(self) -> str:
+        """Returns a one-line description of the index statistics."""
+        state = "" if self.enabled else " (disabled)"
+        return (f"Dominance index{state}: {self.inferred} inferred, {self.verified} verified, "
+                f"{len(self._feasible)} feasible / {len(self._infeasible)} infeasible frontier designs")
@@ -0,0 +1,223 @@
+"""Shared evaluation cache for pipe network designs.
+
+Every stage of the pipeline (UH + FLS-H, the metaheuristics and the final
+refinement) asks the same `Optimization` instance to evaluate designs. This
+module provides the bounded, least-recently-used cache that instance owns, so
+a design simulated once is never simulated again during the run. The cache
+can be backed by a persistent `EvaluationStore` to reuse evaluations across runs.
+"""
+
+import sys
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Logger configuration
+logger = logging.getLogger(__name__)
+
+# Approximate per-entry overhead besides the key: dictionary slot, slot list
+# reference and the value arrays (with their growth margin)
+_ENTRY_OVERHEAD_BYTES = 96
+
+
+class EvaluationCache:
+    """Bounded, approximately LRU cache of evaluated designs.
+
+    Entries are keyed by the bit-packed index vector of a design (the fewest
+    bits that hold the largest catalog index, e.g. 4 bits per pipe for up to
+    16 sizes) and store its cost and maximum pressure deficit. Results of
+    fast-fail feasibility checks only know the sign of the deficit; they are
+    stored as non-exact entries (0.0 when feasible, +inf when not) and are
+    upgraded when an exact evaluation of the same design is stored.
+
+    Values live in parallel NumPy arrays; a dictionary maps each key to its
+    slot. When the cache is full the least recently used entries are evicted
+    in small batches, so the cost of finding them is amortized.
+
+    Attributes:
+        max_memory_mb (float): Approximate memory cap in megabytes.
+        max_entries (Optional[int]): Explicit cap on the number of entries.
+        store (Optional[EvaluationStore]): Persistent backing store consulted on misses.
+        hits (int): Number of successful lookups.
+        misses (int): Number of failed lookups.
+        evictions (int): Number of entries discarded to respect the caps.
+        store_hits (int): Number of lookups answered by the persistent store.
+    """
+
+    def __init__(self, max_memory_mb: float = 256.0, max_size_index: int = 255,
+                 store: Optional[Any] = None, max_entries: Optional[int] = None):
+        """Initializes an empty cache.
+
+        Args:
+            max_memory_mb: Approximate memory cap in megabytes.
+            max_size_index: Largest catalog index, used to pick the key packing.
+            store: Optional `EvaluationStore` holding evaluations of earlier runs.
+            max_entries: Optional cap on the number of entries; the smaller of
+                this and the memory cap applies.
+        """
+        self.max_memory_mb = max_memory_mb
+        self.max_entries = max_entries
+        self.store = store
+        self._bits = max(1, int(max_size_index).bit_length())
+        self._shifts = np.arange(self._bits, dtype=np.uint32)
+        # Stored keys keep the byte-per-index layout of earlier versions
+        self._store_dtype = np.uint8 if max_size_index <= np.iinfo(np.uint8).max else np.uint16
+        self._slots: Dict[bytes, int] = {}
+        self._keys: List[Optional[bytes]] = []
+        self._free: List[int] = []
+        self._costs = np.empty(0, dtype=np.float64)
+        self._deficits = np.empty(0, dtype=np.float64)
+        self._exact = np.empty(0, dtype=bool)
+        self._stamps = np.empty(0, dtype=np.int64)
+        self._clock = 0
+        self._capacity: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.store_hits = 0
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def key(self, x: np.ndarray) -> bytes:
+        """Packs a design into its cache key."""
+        x = np.asarray(x)
+        if self._bits == 8:
+            return x.astype(np.uint8).tobytes()
+        if 8 % self._bits == 0:
+            # Whole indexes per byte: shift and add instead of unpacking every bit
+            per_byte = 8 // self._bits
+            padded = np.zeros(-(-len(x) // per_byte) * per_byte, dtype=np.uint8)
+            padded[:len(x)] = x
+            packed = padded[::per_byte] << (8 - self._bits)
+            for j in range(1, per_byte):
+                packed |= padded[j::per_byte] << (8 - (j + 1) * self._bits)
+            return packed.tobytes()
+        bits = (x.astype(np.uint32)[:, np.newaxis] >> self._shifts) & 1
+        return np.packbits(bits.astype(np.uint8)).tobytes()
+
+    def _store_key(self, x: np.ndarray) -> bytes:
+        """Key of a design in the persistent store."""
+        return np.asarray(x).astype(self._store_dtype).tobytes()
+
+    def get(self, x: np.ndarray, exact: bool = False) -> Optional[Tuple[float, float]]:
+        """Looks up a design.
+
+        Args:
+            x: Vector of diameter indexes.
+            exact: If True, only entries holding the exact maximum deficit match.
+
+        Returns:
+            (cost, max_deficit) or None if the design is not cached.
+        """
+        key = self.key(x)
+        slot = self._slots.get(key)
+        known_exact = slot is not None and bool(self._exact[slot])
+        if (slot is None or (exact and not known_exact)) and self.store is not None:
+            stored = self.store.get(self._store_key(x))
+            if stored is not None and (slot is None or stored[2]):
+                slot = self._insert(key, *stored)
+                known_exact = bool(stored[2])
+                if not exact or known_exact:
+                    self.store_hits += 1
+        if slot is None or (exact and not known_exact):
+            self.misses += 1
+            return None
+        self._touch(slot)
+        self.hits += 1
+        return float(self._costs[slot]), float(self._deficits[slot])
+
+    def put(self, x: np.ndarray, cost: float, max_deficit: float, exact: bool = True) -> None:
+        """Stores the evaluation of a design, evicting the oldest entries if needed.
+
+        A non-exact result never replaces an exact one.
+        """
+        key = self.key(x)
+        slot = self._slots.get(key)
+        if slot is not None and self._exact[slot] and not exact:
+            self._touch(slot)
+            return
+        self._insert(key, float(cost), float(max_deficit), bool(exact))
+        if self.store is not None:
+            self.store.put(self._store_key(x), float(cost), float(max_deficit), bool(exact))
+
+    def merge(self, entries: Iterable[Tuple[bytes, float, float, bool]]) -> None:
+        """Stores evaluations made by another model of the same problem.
+
+        Args:
+            entries: (store_key, cost, max_deficit, exact) tuples, keyed like the
+                persistent store (see `EvaluationStore.put`).
+        """
+        for key, cost, max_deficit, exact in entries:
+            self.put(np.frombuffer(key, dtype=self._store_dtype), cost, max_deficit, exact)
+
+    def _touch(self, slot: int) -> None:
+        """Marks a slot as the most recently used one."""
+        self._clock += 1
+        self._stamps[slot] = self._clock
+
+    def _insert(self, key: bytes, cost: float, max_deficit: float, exact: bool) -> int:
+        """Adds or updates an entry as the most recently used one; returns its slot."""
+        slot = self._slots.get(key)
+        if slot is None:
+            if self._capacity is None:
+                entry_bytes = sys.getsizeof(key) + _ENTRY_OVERHEAD_BYTES
+                self._capacity = max(1, int(self.max_memory_mb * 1024 * 1024 // entry_bytes))
+                if self.max_entries:
+                    self._capacity = max(1, min(self._capacity, int(self.max_entries)))
+            if len(self._slots) >= self._capacity:
+                self._evict()
+            slot = self._allocate()
+            self._slots[key] = slot
+            self._keys[slot] = key
+        self._costs[slot] = cost
+        self._deficits[slot] = max_deficit
+        self._exact[slot] = exact
+        self._touch(slot)
+        return slot
+
+    def _allocate(self) -> int:
+        """Returns a free slot, growing the value arrays geometrically if needed."""
+        if not self._free:
+            old = len(self._keys)
+            size = min(max(16, 2 * old), max(self._capacity, old + 1))
+            self._costs = np.resize(self._costs, size)
+            self._deficits = np.resize(self._deficits, size)
+            self._exact = np.resize(self._exact, size)
+            self._stamps = np.resize(self._stamps, size)
+            self._keys.extend([None] * (size - old))
+            self._free.extend(range(size - 1, old - 1, -1))
+        return self._free.pop()
+
+    def _evict(self) -> None:
+        """Discards the least recently used entries (about 1/64 of the cache)."""
+        used = np.fromiter(self._slots.values(), dtype=np.int64, count=len(self._slots))
+        count = max(1, len(used) // 64)
+        oldest = used[np.argpartition(self._stamps[used], count - 1)[:count]]
+        for slot in oldest.tolist():
+            del self._slots[self._keys[slot]]
+            self._keys[slot] = None
+            self._free.append(slot)
+        self.evictions += count
+
+    def memory_bytes(self) -> int:
+        """Returns the approximate memory held by the cache entries."""
+        keys = sum(sys.getsizeof(key) for key in self._keys if key is not None)
+        arrays = self._costs.nbytes + self._deficits.nbytes + self._exact.nbytes + self._stamps.nbytes
+        return keys + arrays + sys.getsizeof(self._slots) + sys.getsizeof(self._keys)
+
+    def summary(self) -> str:
+        """Returns a one-line description of the cache statistics."""
+        lookups = self.hits + self.misses
+        rate = 100.0 * self.hits / lookups if lookups else 0.0
+        text = (f"Evaluation cache: {self.hits} hits / {self.misses} misses ({rate:.1f}% hit rate), "
+                f"{len(self._slots)} entries, {self.evictions} evictions")
+        if self.store is not None:
+            text += f", {self.store_hits} hits from {self.store.path.name}"
+        return text
+
+    def close(self) -> None:
+        """Saves pending evaluations to the persistent store, if any."""
+        if self.store is not None:
+            self.store.close()
@@ -0,0 +1,227 @@
+"""Persistent evaluation store for pipe network designs.
+
+The in-memory `EvaluationCache` lives for a single run. This module keeps the
+evaluations on disk (SQLite) so that later runs of the same problem, e.g. with
+other seeds, algorithms or time budgets, reuse them without calling EPANET.
+
+Evaluations are grouped by a problem key: a hash of the .inp contents and of
+the [PIPES], [CATALOG] and [PRESSURES] definitions, so a store can safely be
+shared between different problems (or versions of the same one).
+
+The module is also a small maintenance tool:
+
+    python -m ppno.eval_store info <store.db>
+    python -m ppno.eval_store compact <store.db> [--drop KEY ...] [--inexact]
+"""
+
+import sys
+import sqlite3
+import logging
+import argparse
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+# Logger configuration
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS problems (
+    key TEXT PRIMARY KEY,
+    name TEXT,
+    created TEXT
+);
+CREATE TABLE IF NOT EXISTS evaluations (
+    problem TEXT NOT NULL,
+    design BLOB NOT NULL,
+    cost REAL NOT NULL,
+    max_deficit REAL NOT NULL,
+    exact INTEGER NOT NULL,
+    PRIMARY KEY (problem, design)
+) WITHOUT ROWID;
+"""
+
+# A fast-fail (non-exact) result never replaces an exact one
+_UPSERT = """
+INSERT INTO evaluations (problem, design, cost, max_deficit, exact) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (problem, design) DO UPDATE SET
+    cost = excluded.cost, max_deficit = excluded.max_deficit, exact = excluded.exact
+WHERE excluded.exact >= evaluations.exact
+"""
+
+# Pending writes are committed in batches of this size
+FLUSH_EVERY = 256
+
+
+class EvaluationStore:
+    """SQLite-backed store of the evaluations of one problem.
+
+    The database is opened on first use, so models that never evaluate through
+    the cache (e.g. evaluation workers) do not touch the file.
+
+    Attributes:
+        path (Path): Location of the SQLite database.
+        problem_key (str): Hash identifying the problem definition.
+        problem_name (str): Human-readable label stored with the problem.
+    """
+
+    def __init__(self, path: Union[str, Path], problem_key: str, problem_name: str = ''):
+        """Binds the store to a database file and a problem.
+
+        Args:
+            path: SQLite database file; created if it does not exist.
+            problem_key: Hash of the problem definition (see `Optimization.problem_key`).
+            problem_name: Label saved with the problem, for the inspection tool.
+        """
+        self.path = Path(path)
+        self.problem_key = problem_key
+        self.problem_name = problem_name
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pending: Dict[bytes, Tuple[float, float, bool]] = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(str(self.path), timeout=30.0)
+            self._conn.executescript(_SCHEMA)
+            self._conn.execute("INSERT OR IGNORE INTO problems (key, name, created) VALUES (?, ?, ?)",
+                               (self.problem_key, self.problem_name,
+                                datetime.now().isoformat(timespec='seconds')))
+            self._conn.commit()
+        return self._conn
+
+    def get(self, key: bytes) -> Optional[Tuple[float, float, bool]]:
+        """Returns the stored (cost, max_deficit, exact) of a design key, or None."""
+        entry = self._pending.get(key)
+        if entry is not None:
+            return entry
+        row = self._connect().execute(
+            "SELECT cost, max_deficit, exact FROM evaluations WHERE problem = ? AND design = ?",
+            (self.problem_key, key)).fetchone()
+        if row is None:
+            return None
+        return float(row[0]), float(row[1]), bool(row[2])
+
+    def put(self, key: bytes, cost: float, max_deficit: float, exact: bool = True) -> None:
+        """Queues an evaluation for writing; it is committed with the next flush."""
+        previous = self._pending.get(key)
+        if previous is not None and previous[2] and not exact:
+            return
+        self._pending[key] = (float(cost), float(max_deficit), bool(exact))
+        if len(self._pending) >= FLUSH_EVERY:
+            self.flush()
+
+    def flush(self) -> None:
+        """Commits the pending evaluations."""
+        if not self._pending:
+            return
+        conn = self._connect()
+        with conn:
+            conn.executemany(_UPSERT, [(self.problem_key, key, cost, max_deficit, int(exact))
+                                       for key, (cost, max_deficit, exact) in self._pending.items()])
+        self._pending.clear()
+
+    def close(self) -> None:
+        """Flushes the pending evaluations and closes the database."""
+        if self._conn is None and not self._pending:
+            return
+        try:
+            self.flush()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not save evaluations to {self.path}: {e}")
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def store_info(path: Union[str, Path]) -> List[Dict[str, object]]:
+    """Summarizes the problems held in a store.
+
+    Returns:
+        One dictionary per problem with its key, name, creation date, number of
+        entries, number of exact entries and best feasible cost (None if no
+        feasible design was stored).
+    """
+    conn = sqlite3.connect(str(path))
+    try:
+        rows = conn.execute("""
+            SELECT p.key, p.name, p.created, COUNT(e.design), COALESCE(SUM(e.exact), 0),
+                   MIN(CASE WHEN e.max_deficit <= 0 THEN e.cost END)
+            FROM problems p LEFT JOIN evaluations e ON e.problem = p.key
+            GROUP BY p.key ORDER BY p.created
+        """).fetchall()
+    finally:
+        conn.close()
+    keys = ('key', 'name', 'created', 'entries', 'exact', 'best_cost')
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def compact_store(path: Union[str, Path], drop: Optional[List[str]] = None,
+                  inexact: bool = False) -> int:
+    """Removes unwanted evaluations and reclaims the free space of a store.
+
+    Args:
+        path: SQLite database file.
+        drop: Problem keys (or unique key prefixes) to delete entirely.
+        inexact: If True, fast-fail entries (no exact deficit) are also deleted.
+
+    Returns:
+        The number of deleted evaluations.
+    """
+    conn = sqlite3.connect(str(path))
+    try:
+        deleted = 0
+        with conn:
+            for prefix in drop or []:
+                keys = [row[0] for row in conn.execute(
+                    "SELECT key FROM problems WHERE key LIKE ?", (prefix + '%',))]
+                if len(keys) != 1:
+                    raise ValueError(f"Problem key prefix '{prefix}' matches {len(keys)} problems")
+                deleted += conn.execute("DELETE FROM evaluations WHERE problem = ?", keys).rowcount
+                conn.execute("DELETE FROM problems WHERE key = ?", keys)
+            if inexact:
+                deleted += conn.execute("DELETE FROM evaluations WHERE exact = 0").rowcount
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+    return deleted
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Entry point of the store inspection tool."""
+    parser = argparse.ArgumentParser(prog='ppno-store',
+                                     description="Inspect or compact a PPNO evaluation store.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    info_cmd = commands.add_parser('info', help="list the problems and entries of a store")
+    info_cmd.add_argument('store')
+    compact_cmd = commands.add_parser('compact', help="delete entries and reclaim disk space")
+    compact_cmd.add_argument('store')
+    compact_cmd.add_argument('--drop', nargs='+', default=[], metavar='KEY',
+                             help="problem keys (or prefixes) to delete")
+    compact_cmd.add_argument('--inexact', action='store_true',
+                             help="also delete fast-fail entries")
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    path = Path(args.store)
+    if not path.exists():
+        print(f"Error: Store not found: {path}")
+        sys.exit(1)
+
+    if args.command == 'info':
+        print(f"{path} ({path.stat().st_size / 1024:.1f} KiB)")
+        for problem in store_info(path):
+            best = problem['best_cost']
+            best = f"{best:.2f}" if best is not None else "-"
+            print(f"  {problem['key'][:12]}  {problem['name'] or '?':<24} {problem['created']}  "
+                  f"{problem['entries']} entries ({problem['exact']} exact), best feasible cost {best}")
+    else:
+        size = path.stat().st_size
+        try:
+            deleted = compact_store(path, args.drop, args.inexact)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        print(f"Deleted {deleted} entries; {size / 1024:.1f} KiB -> {path.stat().st_size / 1024:.1f} KiB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+"""Parallel evaluation service for pipe network designs.
+
+The legacy EPANET toolkit keeps a single global project per process, so
+concurrent evaluations need separate processes. This module provides a pool
+of worker processes, each one loading its own copy of the optimization
+problem (and therefore its own EPANET model), to evaluate batches of
+candidate designs in parallel. With the project-handle backend the models
+can instead live in one process, served by a pool of threads.
+"""
+
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Optional, Tuple, Union
+
+import numpy as np
+
+# Logger configuration
+logger = logging.getLogger(__name__)
+
+# Problem instance owned by the current worker process
+_worker_model: Optional[Any] = None
+
+
+def _init_worker(problem_file: str) -> None:
+    """Loads the optimization problem once per worker process."""
+    global _worker_model
+    from .ppno import Optimization
+    # Workers stay quiet; the parent process reports progress
+    logging.getLogger().setLevel(logging.WARNING)
+    _worker_model = Optimization(problem_file)
+
+
+def _evaluate_chunk(X: np.ndarray) -> Tuple[np.ndarray, int]:
+    """Evaluates a chunk of designs with the model of the current worker process."""
+    return _evaluate_designs(_worker_model, X)
+
+
+def _evaluate_designs(model: Any, X: np.ndarray) -> Tuple[np.ndarray, int]:
+    """Computes the maximum pressure deficit of each design in a chunk.
+
+    Returns:
+        A tuple (max_deficits, simulation_cycles) for the chunk.
+    """
+    start_cycles = model.simulation_cycles
+    max_deficits = np.empty(len(X), dtype=np.float64)
+    for j, x in enumerate(X):
+        max_deficits[j] = model.max_deficit(x)
+    return max_deficits, model.simulation_cycles - start_cycles
+
+
+class ParallelEvaluator:
+    """Pool of worker processes, each holding its own hydraulic model.
+
+    Attributes:
+        problem_file (Path): The .ext problem definition loaded by every worker.
+        workers (int): Number of worker processes.
+    """
+
+    def __init__(self, problem_file: Union[str, Path], workers: int):
+        """Starts the worker pool.
+
+        Args:
+            problem_file: Path to the .ext file to load in each worker.
+            workers: Number of worker processes.
+        """
+        self.problem_file = Path(problem_file).resolve()
+        self.workers = workers
+        # 'spawn' gives every worker a clean toolkit state on all platforms
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(str(self.problem_file),)
+        )
+        logger.info(f"Parallel evaluation enabled: {workers} worker processes.")
+
+    def max_deficits(self, X: np.ndarray) -> Tuple[np.ndarray, int]:
+        """Evaluates the maximum pressure deficit of a batch of designs.
+
+        Args:
+            X: (pop, n_pipes) matrix of diameter indexes.
+
+        Returns:
+            A tuple (max_deficits, simulation_cycles) for the whole batch.
+        """
+        n_chunks = min(len(X), 2 * self.workers)
+        chunks = np.array_split(X, n_chunks)
+        results = list(self._executor.map(_evaluate_chunk, chunks))
+        max_deficits = np.concatenate([r[0] for r in results])
+        cycles = sum(r[1] for r in results)
+        return max_deficits, cycles
+
+    def close(self) -> None:
+        """Shuts down the worker processes."""
+        self._executor.shutdown(wait=True)
+
+
+class ThreadEvaluator:
+    """Pool of evaluation threads, each owning an in-process hydraulic model.
+
+    Requires the project-handle toolkit backend (`Backend PROJECT`): every model
+    has its own EPANET project, and the solver runs without holding the GIL.
+
+    Attributes:
+        problem_file (Path): The .ext problem definition loaded by every model.
+        workers (int): Number of threads (and models).
+    """
+
+    def __init__(self, problem_file: Union[str, Path], workers: int):
+        """Loads one model per thread.
+
+        Args:
+            problem_file: Path to the .ext file to load for each thread.
+            workers: Number of evaluation threads.
+        """
+        from .ppno import Optimization
+        self.problem_file = Path(problem_file).resolve()
+        self.workers = workers
+
+        ppno_logger = logging.getLogger('ppno.ppno')
+        level = ppno_logger.level
+        ppno_logger.setLevel(logging.WARNING)
+        try:
+            self._models = [Optimization(self.problem_file, workers=1) for _ in range(workers)]
+        finally:
+            ppno_logger.setLevel(level)
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        logger.info(f"Parallel evaluation enabled: {workers} threads with project handles.")
+
+    def max_deficits(self, X: np.ndarray) -> Tuple[np.ndarray, int]:
+        """Evaluates the maximum pressure deficit of a batch of designs.
+
+        Args:
+            X: (pop, n_pipes) matrix of diameter indexes.
+
+        Returns:
+            A tuple (max_deficits, simulation_cycles) for the whole batch.
+        """
+        chunks = np.array_split(X, min(len(X), self.workers))
+        results = list(self._executor.map(_evaluate_designs, self._models, chunks))
+        max_deficits = np.concatenate([r[0] for r in results])
+        cycles = sum(r[1] for r in results)
+        return max_deficits, cycles
+
+    def close(self) -> None:
+        """Stops the threads and closes every model."""
+        self._executor.shutdown(wait=True)
+        for model in self._models:
+            model.close()
@@ -0,0 +1,158 @@
+"""Integer Differential Evolution (IDE).
+
+SciPy's `differential_evolution` searches a continuous box and rounds inside
+the objective, so many trial vectors collapse onto the same design, and its
+population of `15 * n_vars` individuals is huge on large networks. This module
+runs DE/rand/1/bin directly on diameter indexes:
+
+- The population is an integer (pop, n_pipes) matrix.
+- Mutation `x_r1 + round(F * (x_r2 - x_r3))`, binomial crossover and the
+  bounds (bounce-back between the base vector and the violated bound) are
+  NumPy array operations over the whole generation.
+- Trials equal to their target are not evaluated, repeated trials are
+  evaluated once, and each generation is a single `evaluate_many` batch.
+- The population size follows the evaluation budget (`IDEBudget`), about
+  its square root, so population and generations grow together.
+"""
+
+import logging
+from time import perf_counter
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .constants import (
+    PENALTY_VALUE, IDE_BUDGET, IDE_MIN_POPULATION, IDE_MAX_POPULATION,
+    IDE_MUTATION, IDE_CROSSOVER
+)
+
+# Logger configuration
+logger = logging.getLogger(__name__)
+
+# Share of the initial population made of perturbations of the seed design
+_SEED_VARIANTS = 0.1
+
+
+def population_size(budget: int) -> int:
+    """Population size for an evaluation budget (about its square root)."""
+    return int(np.clip(round(np.sqrt(budget)), IDE_MIN_POPULATION, IDE_MAX_POPULATION))
+
+
+def _fitness(opt_instance, X: np.ndarray, infer: bool) -> Tuple[np.ndarray, np.ndarray]:
+    """Penalized objective of a batch, as in the SciPy solvers.
+
+    Returns:
+        A tuple (values, feasible) of (pop,) arrays.
+    """
+    values = opt_instance.cost_many(X)
+    feasible = np.ones(len(X), dtype=bool)
+    unknown = ~opt_instance.infer_feasible(X) if infer else feasible.copy()
+    if unknown.any():
+        costs, max_deficits, feasible[unknown] = opt_instance.evaluate_many(X[unknown])
+        values[unknown] = np.where(feasible[unknown], costs, PENALTY_VALUE + (max_deficits * 1e6))
+    return values, feasible
+
+
+def _initial_population(opt_instance, size: int, initial_x: Optional[np.ndarray]) -> np.ndarray:
+    """Random designs within the bounds; with a seed, the seed and a few variants of it first."""
+    lb, ub = opt_instance.lbound, opt_instance.ubound
+    P = lb + np.floor(np.random.rand(size, len(lb)) * (ub - lb + 1)).astype(np.int32)
+    if initial_x is not None:
+        logger.info("      [SEEDED] Injecting initial solution into IDE population.")
+        P[0] = initial_x
+        n_change = max(1, int(0.05 * len(lb)))
+        for i in range(1, max(1, int(_SEED_VARIANTS * size)) + 1):
+            variant = np.asarray(initial_x).astype(np.int32).copy()
+            idx = np.random.choice(len(lb), n_change, replace=False)
+            variant[idx] = np.clip(variant[idx] + np.random.choice([-1, 1], n_change), lb[idx], ub[idx])
+            if opt_instance.config.get('Repair'):
+                variant = opt_instance.repair(variant)
+            P[i] = variant
+    return P
+
+
+def _bounce_back(V: np.ndarray, base: np.ndarray, lb: np.ndarray, ub: np.ndarray) -> np.ndarray:
+    """Moves out-of-bounds entries to a random index between the base vector and the bound."""
+    r = np.random.rand(*V.shape)
+    low = V < lb
+    V = np.where(low, lb + np.floor(r * (base - lb + 1)).astype(np.int32), V)
+    high = V > ub
+    return np.where(high, ub - np.floor(r * (ub - base + 1)).astype(np.int32), V)
+
+
+def solve_ide(opt_instance, initial_x: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+    """Runs integer Differential Evolution on the pipe sizing problem.
+
+    The run stops when `IDEBudget` designs have been evaluated, when the
+    population has collapsed onto one design or when `MaxTime` is reached; in
+    the last case `opt_instance.timed_out` is set, as with the SciPy solvers.
+
+    Args:
+        opt_instance: An instance of the Optimization class.
+        initial_x: An optional feasible design (e.g., from FLS-H) injected into
+                   the initial population.
+
+    Returns:
+        Optional[np.ndarray]: The best feasible design found, or None if none was found.
+    """
+    logger.info("*** INTEGER DIFFERENTIAL EVOLUTION ***")
+    start_time = perf_counter()
+    max_time = opt_instance.config.get('MaxTime', 120)
+    budget = opt_instance.config.get('IDEBudget', IDE_BUDGET)
+    infer = bool(opt_instance.config.get('Dominance'))
+    opt_instance.timed_out = False
+    lb = np.asarray(opt_instance.lbound).astype(np.int32)
+    ub = np.asarray(opt_instance.ubound).astype(np.int32)
+
+    size = population_size(budget)
+    n_vars = len(lb)
+    P = _initial_population(opt_instance, size, initial_x)
+    values, feasible = _fitness(opt_instance, P, infer)
+    evaluations = size
+    logger.info(f"      Population: {size} | Budget: {budget} evaluations")
+
+    rows = np.arange(size)
+    generation = 0
+    while evaluations < budget:
+        if perf_counter() - start_time > max_time:
+            logger.warning(f"Time limit of {max_time}s reached.")
+            opt_instance.timed_out = True
+            break
+        generation += 1
+
+        # DE/rand/1: three distinct individuals, all different from the target
+        r = np.argsort(np.random.rand(size, size - 1), axis=1)[:, :3]
+        r += r >= rows[:, np.newaxis]
+        V = P[r[:, 0]] + np.round(IDE_MUTATION * (P[r[:, 1]] - P[r[:, 2]])).astype(np.int32)
+        V = _bounce_back(V, P[r[:, 0]], lb, ub)
+
+        # Binomial crossover, with at least one gene from the mutant
+        cross = np.random.rand(size, n_vars) < IDE_CROSSOVER
+        cross[rows, np.random.randint(n_vars, size=size)] = True
+        T = np.where(cross, V, P)
+
+        # Only new designs are evaluated, each of them once
+        changed = np.flatnonzero(np.any(T != P, axis=1))
+        if not changed.size:
+            if np.all(P == P[0]):
+                logger.info(f"      Population converged at generation {generation}.")
+                break
+            continue
+        unique, inverse = np.unique(T[changed], axis=0, return_inverse=True)
+        unique_values, unique_feasible = _fitness(opt_instance, unique, infer)
+        evaluations += len(unique)
+
+        trial_values = unique_values[inverse.ravel()]
+        better = trial_values <= values[changed]
+        winners = changed[better]
+        P[winners] = T[winners]
+        values[winners] = trial_values[better]
+        feasible[winners] = unique_feasible[inverse.ravel()][better]
+
+    best = np.flatnonzero(feasible)
+    logger.info(f"      Generations: {generation} | Evaluations: {evaluations}")
+    if not best.size:
+        return None
+    best_x = P[best[np.argmin(values[best])]].copy()
+    opt_instance.set_x(best_x)
+    return best_x if opt_instance.check(mode='TF') else None
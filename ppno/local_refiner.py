@@ -12,6 +12,13 @@ from typing import Any, List, Dict, Tuple, Optional
 # Logger configuration
 logger = logging.getLogger(__name__)
 
+# Hazen-Williams: head loss varies with diameter ** -4.871 at constant flow
+DIAMETER_EXPONENT = 4.871
+
+# Adaptive neighborhood: size factors after an improving / a stalled iteration
+ADAPT_SHRINK = 0.75
+ADAPT_GROW = 1.5
+
 
 class LocalRefiner:
     """Implements the FLS-H (Feasible Local Search – Hybrid) algorithm.
@@ -21,16 +28,49 @@ class LocalRefiner:
     while strictly maintaining the pressure constraints (feasibility).
 
     Key features include:
-    - Global Evaluation Cache: Prevents redundant simulations.
+    - Global Evaluation Cache: Evaluations go through the cache shared by the
+      whole pipeline (see `Optimization.evaluate`), preventing redundant simulations.
     - Fast Constraints: Pre-screens candidates based on approximate cost before calling EPANET.
     - Stochastic Worsening: Can accept temporary cost increases to escape local minima.
+    - Batch Evaluation: With `batched`, each iteration's candidates are evaluated
+      together (`Optimization.evaluate_many`), i.e. in parallel on the worker pool
+      or in one stacked solve with the in-process engines.
+    - Guided Neighborhood (mode 'GUIDED'): Moves are sampled from a ranking built
+      on the pressure slack and head losses of the current design instead of uniformly.
+    - Deterministic Sweep (mode 'SWEEP'): Downsizes and swaps are enumerated in
+      order of saving until none improves, i.e. up to a 1-opt local optimum.
+    - Deduplication: Repeated candidates (e.g. equal after clipping at the
+      bounds) are evaluated once.
+    - Tabu Memory: With `tabu_tenure`, reversing an accepted move is forbidden
+      for that many iterations unless it would give a new best cost.
+    - Adaptive Neighborhood: With `adaptive`, the neighborhood shrinks while
+      improvements come easily and grows when the search stalls; `patience`
+      stops the search after that many iterations without improvement.
+    - Hydraulic Repair: With `repair_budget`, an infeasible start and the
+      designs produced by `diversify` are repaired by upsizing the pipes that
+      feed deficient nodes (see `Optimization.repair`) instead of being discarded.
+    - Shared Incumbent: With `shared_best` (a `multiprocessing.Value`), parallel
+      refinements publish their best cost; while a refinement is behind the
+      best of all, it only simulates candidates cheaper than its current design
+      (see `ppno.multistart`).
+    - First Improvement (strategy 'FIRST'): Candidates are evaluated in ascending
+      cost order and the first feasible one is taken. It is the cheapest feasible
+      candidate, i.e. the one 'BEST' would pick, found with fewer simulations.
 
     Attributes:
         simulation: An instance of the Optimization class, providing EPANET simulation capabilities.
         max_iter (int): Maximum number of iterations for the refinement process.
         acceptance_threshold (float): Maximum acceptable cost increase (as a decimal percentage, e.g., 0.01 = 1%).
         neighborhood_size (int): Number of candidate solutions generated per iteration.
-        cache (Dict[bytes, Dict[str, Any]]): Cache of evaluated solutions to speed up the search.
+        mode (str): Search mode, 'RANDOM', 'GUIDED' or 'SWEEP'.
+        strategy (str): Candidate selection, 'BEST' (evaluate all) or 'FIRST'.
+        max_swaps (int): Swap moves examined per sweep in 'SWEEP' mode.
+        batched (bool): Whether candidates are evaluated as batches.
+        tabu_tenure (int): Iterations a reversed move stays forbidden (0 disables the tabu list).
+        adaptive (bool): Whether the neighborhood size adapts to the improvement rate.
+        patience (int): Iterations without improvement before stopping early (0 disables).
+        repair_budget (int): Simulations per hydraulic repair (0 disables it).
+        shared_best (Optional[Any]): Best cost shared with other refinements, or None.
     """
 
     def __init__(self, simulation: Any, config: Optional[Dict[str, Any]] = None):
@@ -45,7 +85,18 @@ class LocalRefiner:
         self.max_iter = config.get('max_iter', 50)
         self.acceptance_threshold = config.get('acceptance_threshold', 0.01)
         self.neighborhood_size = config.get('neighborhood_size', 20)
-        self.cache = {}
+        self.mode = config.get('mode', 'RANDOM')
+        self.strategy = config.get('strategy', 'BEST')
+        self.max_swaps = config.get('max_swaps', self.max_iter * self.neighborhood_size)
+        self.batched = config.get('batched', False)
+        self.tabu_tenure = config.get('tabu_tenure', 0)
+        self.adaptive = config.get('adaptive', False)
+        self.patience = config.get('patience', 0)
+        self.repair_budget = config.get('repair_budget', 0)
+        self.shared_best = config.get('shared_best')
+        self._tabu_until = np.empty((0, 2), dtype=np.int64)
+        self._weights_key: Optional[bytes] = None
+        self._weights: Tuple[np.ndarray, np.ndarray] = (np.empty(0), np.empty(0))
 
     def refine(self, x0: np.ndarray) -> np.ndarray:
         """Executes the main FLS-H loop to improve a given feasible solution.
@@ -61,6 +112,8 @@ class LocalRefiner:
         Returns:
             np.ndarray: The refined (improved) solution vector.
         """
+        if self.mode == 'SWEEP':
+            return self.sweep(x0)
         logger.info("[FLS-H] Starting Local Search Refinement...")
         
         x = x0.copy()
@@ -68,58 +121,246 @@ class LocalRefiner:
         
         if not best_eval['feasible']:
             logger.warning("[FLS-H] Started with an infeasible solution. Attempting to repair...")
-            x = self.repair(x)
+            x = self.repair_hydraulics(self.repair(x))
             best_eval = self.evaluate(x)
             if not best_eval['feasible']:
                 logger.error("[FLS-H] Could not find a feasible starting point for refinement.")
                 return x0
 
         best_cost = best_eval['cost']
+        self.publish(best_cost)
         current_x = x.copy()
         current_cost = best_cost
-
-        for i in range(self.max_iter):
-            logger.debug(f"[FLS-H] Iteration {i+1}/{self.max_iter} | Best Cost: {best_cost:.2f}")
+        size = self.neighborhood_size
+        stalled = 0
+        # Per pipe, last iteration at which a downsize (column 0) or upsize (column 1) is tabu
+        self._tabu_until = np.full((len(x), 2), -1, dtype=np.int64)
+        # The budget is counted in generated neighbors, so that an adaptive
+        # neighborhood trades size for iterations: a fixed size runs `max_iter` iterations
+        budget = self.max_iter * self.neighborhood_size
+        generated = 0
+        i = -1
+
+        while generated < budget:
+            i += 1
+            generated += size
+            logger.debug(f"[FLS-H] Iteration {i+1} ({generated}/{budget} neighbors) | Best Cost: {best_cost:.2f}")
             
-            vecinos = self.generate_neighborhood(current_x)
+            vecinos = self.unique_candidates(self.generate_neighborhood(current_x, size))
             
-            # Apply repair and fast filters to candidates
-            candidates = []
-            for v in vecinos:
-                v_repaired = self.repair(v)
-                if self.is_promising(v_repaired, current_cost):
-                    candidates.append(v_repaired)
-
-            if not candidates:
-                current_x = self.diversify(current_x)
-                continue
-
-            # Evaluate candidates
-            eval_results = []
-            for v in candidates:
-                res = self.evaluate(v)
-                if res['feasible']:
-                    eval_results.append((v, res))
+            # Apply fast filters to candidates
+            candidates = [v for v in vecinos if self.is_promising(v, current_cost)
+                          and not self.is_tabu(current_x, v, i, best_cost)]
 
-            if not eval_results:
-                current_x = self.diversify(current_x)
-                continue
+            # Evaluate candidates and pick the best in neighborhood
+            best_neigh = self.select_candidate(candidates) if candidates else None
+            improved = False
 
-            # Pick the best in neighborhood
-            best_neigh_x, best_neigh_eval = min(eval_results, key=lambda item: item[1]['cost'])
-            
-            if best_neigh_eval['cost'] < best_cost:
-                best_cost = best_neigh_eval['cost']
-                x = best_neigh_x.copy()
-                current_x = best_neigh_x.copy()
-                current_cost = best_neigh_eval['cost']
+            if best_neigh is None:
+                current_x = self.repair_hydraulics(self.diversify(current_x))
             else:
-                current_x, current_cost = self.accept_or_reject(current_x, current_cost, best_neigh_x, best_neigh_eval)
+                best_neigh_x, best_neigh_eval = best_neigh
+                previous_x = current_x
+                if best_neigh_eval['cost'] < best_cost:
+                    improved = True
+                    best_cost = best_neigh_eval['cost']
+                    self.publish(best_cost)
+                    x = best_neigh_x.copy()
+                    current_x = best_neigh_x.copy()
+                    current_cost = best_neigh_eval['cost']
+                else:
+                    current_x, current_cost = self.accept_or_reject(current_x, current_cost, best_neigh_x, best_neigh_eval)
+                self.record_move(previous_x, current_x, i)
+
+            stalled = 0 if improved else stalled + 1
+            if self.adaptive:
+                size = self.adapt_size(size, improved)
+            if self.patience and stalled >= self.patience:
+                logger.info(f"[FLS-H] No improvement in {stalled} iterations; stopping at iteration {i+1}.")
+                break
 
         logger.info(f"[FLS-H] Refinement complete. Final Cost: {best_cost:.2f}")
         return x
 
-    def generate_neighborhood(self, x: np.ndarray) -> List[np.ndarray]:
+    def sweep(self, x0: np.ndarray) -> np.ndarray:
+        """Deterministic best-savings descent (1-opt downsizes, then swaps).
+
+        Single-pipe downsizes are tried in order of cost saving and the first
+        feasible one is accepted. When none is feasible, swaps (downsize one
+        pipe, upsize another) with a positive net saving are tried in order of
+        net saving, at most `max_swaps` per sweep. The search stops when a full
+        sweep finds no improvement.
+
+        A downsize found infeasible is not retried while the design only
+        shrinks, since a smaller design cannot make it feasible; before
+        stopping, those moves are checked once more so the result is 1-opt
+        even where pressures are not monotone in the diameters.
+
+        Args:
+            x0 (np.ndarray): Initial solution vector.
+
+        Returns:
+            np.ndarray: The locally optimal solution vector.
+        """
+        logger.info("[FLS-H] Starting deterministic sweep...")
+        x = self.repair_hydraulics(self.repair(x0))
+        if not self.evaluate(x)['feasible']:
+            logger.error("[FLS-H] Sweep needs a feasible starting point.")
+            return x0
+
+        blocked = np.zeros(len(x), dtype=bool)  # downsizes known infeasible
+        sweeps = 0
+        while True:
+            sweeps += 1
+            moved = self._sweep_downsizes(x, ~blocked, blocked)
+            if moved is None:
+                moved = self._sweep_swaps(x)
+                if moved is not None:
+                    blocked[:] = False
+            if moved is None and blocked.any():
+                # Confirmation pass over the skipped downsizes
+                moved = self._sweep_downsizes(x, blocked.copy(), blocked)
+            if moved is None:
+                break
+            x = moved
+
+        cost = float(self.simulation.cost_many(x[np.newaxis, :])[0])
+        logger.info(f"[FLS-H] Sweep complete after {sweeps} sweeps. Final Cost: {cost:.2f}")
+        return x
+
+    def _sweep_downsizes(self, x: np.ndarray, allowed: np.ndarray,
+                         blocked: np.ndarray) -> Optional[np.ndarray]:
+        """Returns the first feasible downsize of `x` in order of saving, or None.
+
+        Downsizes found infeasible are flagged in `blocked`; the accepted one clears it.
+        """
+        sim = self.simulation
+        rows = np.arange(len(x))
+        smaller = np.maximum(x - 1, sim.lbound)
+        savings = sim.cost_matrix[rows, x] - sim.cost_matrix[rows, smaller]
+        candidates = np.flatnonzero(allowed & (x > sim.lbound) & (savings > 0))
+        order = candidates[np.argsort(-savings[candidates], kind='stable')]
+
+        def downsize(i: int) -> np.ndarray:
+            v = x.copy()
+            v[i] -= 1
+            return v
+
+        for start in range(0, len(order), self._chunk_size()):
+            chunk = order[start:start + self._chunk_size()]
+            results = self.evaluate_candidates([downsize(i) for i in chunk])
+            for i, res in zip(chunk, results):
+                if res['feasible']:
+                    blocked[i] = False
+                    return downsize(i)
+                blocked[i] = True
+        return None
+
+    def _sweep_swaps(self, x: np.ndarray) -> Optional[np.ndarray]:
+        """Returns the first feasible swap of `x` in order of net saving, or None."""
+        sim = self.simulation
+        rows = np.arange(len(x))
+        smaller = np.maximum(x - 1, sim.lbound)
+        larger = np.minimum(x + 1, sim.ubound)
+        savings = np.where(x > sim.lbound, sim.cost_matrix[rows, x] - sim.cost_matrix[rows, smaller], -np.inf)
+        extras = np.where(x < sim.ubound, sim.cost_matrix[rows, larger] - sim.cost_matrix[rows, x], np.inf)
+        net = savings[:, np.newaxis] - extras[np.newaxis, :]
+        np.fill_diagonal(net, -np.inf)
+        pairs = np.flatnonzero(net > 0)
+        if not pairs.size:
+            return None
+        order = pairs[np.argsort(-net.ravel()[pairs], kind='stable')][:self.max_swaps]
+        downs, ups = np.unravel_index(order, net.shape)
+
+        for start in range(0, len(order), self._chunk_size()):
+            chunk = []
+            for down, up in zip(downs[start:start + self._chunk_size()], ups[start:start + self._chunk_size()]):
+                v = x.copy()
+                v[down] -= 1
+                v[up] += 1
+                chunk.append(v)
+            for v, res in zip(chunk, self.evaluate_candidates(chunk)):
+                if res['feasible']:
+                    return v
+        return None
+
+    def is_tabu(self, current_x: np.ndarray, v: np.ndarray, iteration: int, best_cost: float) -> bool:
+        """Whether candidate `v` reverses a recent move of `current_x`.
+
+        A tabu candidate is still allowed when its cost beats `best_cost`
+        (aspiration), since it can then only be a new best design.
+        """
+        if not self.tabu_tenure:
+            return False
+        step = np.asarray(v) - current_x
+        active = self._tabu_until >= iteration
+        tabu = ((step < 0) & active[:, 0]) | ((step > 0) & active[:, 1])
+        if not tabu.any():
+            return False
+        return float(self.simulation.cost_many(np.asarray(v)[np.newaxis, :])[0]) >= best_cost
+
+    def record_move(self, previous_x: np.ndarray, new_x: np.ndarray, iteration: int) -> None:
+        """Makes the reverse of the move from `previous_x` to `new_x` tabu for `tabu_tenure` iterations."""
+        if not self.tabu_tenure:
+            return
+        step = np.asarray(new_x) - previous_x
+        # An upsize forbids the downsize of the same pipe, and vice versa
+        self._tabu_until[step > 0, 0] = iteration + self.tabu_tenure
+        self._tabu_until[step < 0, 1] = iteration + self.tabu_tenure
+
+    def adapt_size(self, size: int, improved: bool) -> int:
+        """Returns the next neighborhood size: smaller after an improvement, larger after a stall.
+
+        The size stays between a quarter and four times `neighborhood_size`.
+        """
+        low, high = max(1, self.neighborhood_size // 4), max(1, 4 * self.neighborhood_size)
+        size = int(size * ADAPT_SHRINK) if improved else int(np.ceil(size * ADAPT_GROW))
+        return int(np.clip(size, low, high))
+
+    def unique_candidates(self, neighborhood: List[np.ndarray]) -> List[np.ndarray]:
+        """Repairs a neighborhood and keeps the first occurrence of every candidate.
+
+        A copy of the current design (a move clipped at the bounds) is kept once:
+        it is the option to stay, answered by the evaluation cache, and dropping
+        it would send the search to `diversify` whenever no move is feasible.
+        """
+        seen = set()
+        unique = []
+        for v in neighborhood:
+            v = self.repair(v)
+            key = v.tobytes()
+            if key not in seen:
+                seen.add(key)
+                unique.append(v)
+        return unique
+
+    def select_candidate(self, candidates: List[np.ndarray]) -> Optional[Tuple[np.ndarray, Dict[str, Any]]]:
+        """Returns the cheapest feasible candidate and its evaluation, or None if none is feasible.
+
+        With strategy 'BEST' every candidate is evaluated. With 'FIRST' they are
+        evaluated in ascending cost order (in chunks when batched) and the
+        search stops at the first feasible one, which is the same choice.
+        """
+        if self.strategy != 'FIRST':
+            feasible = [(v, res) for v, res in zip(candidates, self.evaluate_candidates(candidates))
+                        if res['feasible']]
+            return min(feasible, key=lambda item: item[1]['cost']) if feasible else None
+
+        costs = self.simulation.cost_many(np.array(candidates))
+        order = [candidates[i] for i in np.argsort(costs, kind='stable')]
+        chunk_size = max(1, -(-self._chunk_size() // 4))
+        for start in range(0, len(order), chunk_size):
+            chunk = order[start:start + chunk_size]
+            for v, res in zip(chunk, self.evaluate_candidates(chunk)):
+                if res['feasible']:
+                    return v, res
+        return None
+
+    def _chunk_size(self) -> int:
+        """Moves evaluated together by the sweep: one at a time unless batched."""
+        return max(1, self.neighborhood_size) if self.batched else 1
+
+    def generate_neighborhood(self, x: np.ndarray, size: Optional[int] = None) -> List[np.ndarray]:
         """Generates a list of valid neighboring solutions via stochastic perturbation.
 
         The neighborhood is created by randomly selecting a small number of pipes
@@ -128,14 +369,19 @@ class LocalRefiner:
 
         Args:
             x (np.ndarray): Current solution vector.
+            size (Optional[int]): Number of neighbors (default: `neighborhood_size`).
 
         Returns:
             List[np.ndarray]: List of mutated candidate solution vectors.
         """
+        size = self.neighborhood_size if size is None else size
+        if self.mode == 'GUIDED':
+            return self.generate_guided_neighborhood(x, size)
+
         neighborhood = []
         n_vars = len(x)
         
-        for _ in range(self.neighborhood_size):
+        for _ in range(size):
             new_x = x.copy()
             # Mutate 1-2 random pipes (capped by total available variables)
             n_mutations = min(n_vars, np.random.randint(1, 3))
@@ -150,6 +396,71 @@ class LocalRefiner:
             
         return neighborhood
 
+    def generate_guided_neighborhood(self, x: np.ndarray, size: Optional[int] = None) -> List[np.ndarray]:
+        """Generates neighbors by sampling moves ranked by hydraulic sensitivity.
+
+        Each neighbor downsizes one pipe, drawn with probability proportional to
+        its cost saving, discounted when the extra head loss of the smaller size
+        exceeds the smallest nodal pressure slack. Half of the neighbors also
+        upsize another pipe, drawn by head loss relief per unit of extra cost,
+        so that a binding node can be relieved by a cheaper pipe elsewhere.
+
+        Args:
+            x (np.ndarray): Current solution vector.
+            size (Optional[int]): Number of neighbors (default: `neighborhood_size`).
+
+        Returns:
+            List[np.ndarray]: List of mutated candidate solution vectors.
+        """
+        down, up = self.move_weights(x)
+        if not down.any():
+            return []
+
+        neighborhood = []
+        for _ in range(self.neighborhood_size if size is None else size):
+            new_x = x.copy()
+            i = np.random.choice(len(x), p=down / down.sum())
+            new_x[i] -= 1
+            up_i = up.copy()
+            up_i[i] = 0.0
+            if np.random.random() < 0.5 and up_i.any():
+                j = np.random.choice(len(x), p=up_i / up_i.sum())
+                new_x[j] += 1
+            neighborhood.append(new_x)
+        return neighborhood
+
+    def move_weights(self, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the sampling weights of the downsize and upsize moves of each pipe.
+
+        They are derived from one simulation of `x` (see
+        `Optimization.hydraulic_state`), repeated only when `x` changes. Head
+        loss changes are estimated at constant flow.
+        """
+        key = np.asarray(x).tobytes()
+        if key == self._weights_key:
+            return self._weights
+
+        sim = self.simulation
+        slack, headloss = sim.hydraulic_state(x)
+        min_slack = max(float(slack.min()) if slack.size else np.inf, 1e-6)
+        rows = np.arange(len(x))
+        diameters = sim.catalog_diameters()
+        smaller = np.maximum(x - 1, sim.lbound)
+        larger = np.minimum(x + 1, sim.ubound)
+        current = diameters[rows, x]
+
+        drop = headloss * ((current / diameters[rows, smaller]) ** DIAMETER_EXPONENT - 1.0)
+        saving = sim.cost_matrix[rows, x] - sim.cost_matrix[rows, smaller]
+        down = np.where(x > sim.lbound, saving * np.minimum(1.0, min_slack / np.maximum(drop, 1e-12)), 0.0)
+
+        relief = headloss * (1.0 - (current / diameters[rows, larger]) ** DIAMETER_EXPONENT)
+        extra = sim.cost_matrix[rows, larger] - sim.cost_matrix[rows, x]
+        up = np.where(x < sim.ubound, relief / np.maximum(extra, 1e-12), 0.0)
+
+        self._weights_key = key
+        self._weights = (np.maximum(down, 0.0), np.maximum(up, 0.0))
+        return self._weights
+
     def repair(self, x: np.ndarray) -> np.ndarray:
         """Applies hydraulic engineering repair rules to a candidate solution.
         
@@ -165,17 +476,23 @@ class LocalRefiner:
         repaired = np.round(x).astype(np.int32)
         repaired = np.clip(repaired, self.simulation.lbound, self.simulation.ubound)
         
-        # Note: Advanced repair logic could use current pressure results to increase 
-        # diameters of upstream critical pipes. For now, we ensure bounds are respected.
+        # Hydraulic repair (upsizing the pipes feeding deficient nodes) needs
+        # simulations and is applied separately, see `repair_hydraulics`.
         return repaired
 
 
+    def repair_hydraulics(self, x: np.ndarray) -> np.ndarray:
+        """Repairs an infeasible design with `Optimization.repair` when `repair_budget` is set."""
+        if not self.repair_budget:
+            return x
+        return self.simulation.repair(x, self.repair_budget)
+
     def evaluate(self, x: np.ndarray) -> Dict[str, Any]:
         """Evaluates a solution using the EPANET hydraulic simulation engine.
         
-        Employs a hashing mechanism on the solution vector to prevent redundant
-        evaluations of previously tested configurations, significantly speeding up
-        the local search process.
+        Evaluations go through the simulation's shared evaluation cache, so
+        previously tested configurations (in this or any earlier stage) are not
+        simulated again.
 
         Args:
             x (np.ndarray): The solution vector to evaluate.
@@ -183,20 +500,22 @@ class LocalRefiner:
         Returns:
             Dict[str, Any]: A dictionary containing the 'cost' and 'feasible' status.
         """
-        key = x.tobytes()
-        if key in self.cache:
-            return self.cache[key]
-
-        # Run simulation
-        self.simulation.set_x(x)
-        cost = self.simulation.get_cost()
-        feasible = self.simulation.check(mode='TF')
-        # Propagate simulation count to the parent instance
-        # (check() already increments simulation_cycles internally)
-        
-        result = {'cost': float(cost), 'feasible': bool(feasible)}
-        self.cache[key] = result
-        return result
+        cost, max_deficit = self.simulation.evaluate(x)
+        return {'cost': float(cost), 'feasible': bool(max_deficit <= 0)}
+
+    def evaluate_candidates(self, candidates: List[np.ndarray]) -> List[Dict[str, Any]]:
+        """Evaluates a list of candidates, as one batch when `batched` is set.
+
+        Args:
+            candidates (List[np.ndarray]): The solution vectors to evaluate.
+
+        Returns:
+            List[Dict[str, Any]]: One `evaluate`-style result per candidate, in order.
+        """
+        if not self.batched or len(candidates) < 2:
+            return [self.evaluate(v) for v in candidates]
+        costs, _, feasible = self.simulation.evaluate_many(np.array(candidates), exact=False)
+        return [{'cost': float(cost), 'feasible': bool(ok)} for cost, ok in zip(costs, feasible)]
 
     def is_promising(self, x: np.ndarray, current_cost: float) -> bool:
         """Pre-screens candidates to avoid simulating obviously expensive solutions.
@@ -212,17 +531,22 @@ class LocalRefiner:
         Returns:
             bool: True if the candidate's cost is within acceptable limits, False otherwise.
         """
-        pipes = self.simulation.pipes
-        catalog = self.simulation.catalog
-        
-        approx_cost = 0.0
-        for i, pipe in enumerate(pipes):
-            sn = str(pipe['series'])
-            idx = int(x[i])
-            approx_cost += float(pipe['length']) * float(catalog[sn][idx]['price'])
-            
+        approx_cost = float(self.simulation.cost_many(x[np.newaxis, :])[0])
+
         # Accept if cost is lower or only slightly higher (to allow finding feasible paths)
-        return approx_cost < (current_cost * (1.0 + self.acceptance_threshold))
+        limit = current_cost * (1.0 + self.acceptance_threshold)
+        if self.shared_best is not None and current_cost > self.shared_best.value:
+            # Behind the best of the parallel refinements: only cheaper designs are worth simulating
+            limit = current_cost
+        return approx_cost < limit
+
+    def publish(self, cost: float) -> None:
+        """Lowers the shared best cost to `cost` if it improves it."""
+        if self.shared_best is None:
+            return
+        with self.shared_best.get_lock():
+            if cost < self.shared_best.value:
+                self.shared_best.value = cost
 
     def accept_or_reject(self, current_x: np.ndarray, current_cost: float, 
                          new_x: np.ndarray, new_eval: Dict[str, Any]) -> Tuple[np.ndarray, float]:
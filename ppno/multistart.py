@@ -0,0 +1,169 @@
+"""Multi-start FLS-H refinement.
+
+A single FLS-H run depends heavily on its random trajectory. This module runs
+several independent refinements: one from the incumbent design and the rest
+from perturbations of it (a few pipes moved one size, then repaired to
+feasibility). Every start
+gets its own random stream, spawned from the run seed. The starts share the
+best cost found so far through a `multiprocessing.Value`, which tightens the
+`is_promising` filter of all of them (see `LocalRefiner.shared_best`).
+
+With `Workers` > 1 the starts run in worker processes, each loading its own
+copy of the problem; otherwise they run one after the other in-process.
+Workers do not open the persistent evaluation store (`CacheFile`): their
+evaluations are sent back with each result and stored by the parent.
+"""
+
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .local_refiner import LocalRefiner
+
+# Logger configuration
+logger = logging.getLogger(__name__)
+
+# Share of pipes moved one size to build a perturbed start
+START_PERTURBATION = 0.05
+
+# Problem instance and shared incumbent of the current worker process
+_worker_model: Optional[Any] = None
+_worker_best: Optional[Any] = None
+
+
+class _EvaluationLog:
+    """Stand-in for the evaluation store of a worker model.
+
+    It records the evaluations instead of writing them, so only the parent
+    process writes to the SQLite file.
+    """
+
+    def __init__(self):
+        self.entries: List[Tuple[bytes, float, float, bool]] = []
+
+    def get(self, key: bytes) -> None:
+        return None
+
+    def put(self, key: bytes, cost: float, max_deficit: float, exact: bool = True) -> None:
+        self.entries.append((key, cost, max_deficit, exact))
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+def _init_worker(problem_file: str, shared_best: Any) -> None:
+    """Loads the optimization problem once per worker process."""
+    global _worker_model, _worker_best
+    from .ppno import Optimization
+    # Workers stay quiet; the parent process reports progress
+    logging.getLogger().setLevel(logging.WARNING)
+    _worker_model = Optimization(problem_file, workers=1)
+    _worker_model.eval_cache.store = _EvaluationLog()
+    _worker_best = shared_best
+
+
+def _refine_in_worker(task: Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[str, Any], int]
+                      ) -> Tuple[Tuple[np.ndarray, float, bool, int], List[Tuple[bytes, float, float, bool]]]:
+    """Runs one start with the model of the current worker process.
+
+    Returns:
+        The result of `_refine_start` and the evaluations made during the start.
+    """
+    x0, lbound, ubound, config, seed = task
+    _worker_model.lbound, _worker_model.ubound = lbound, ubound
+    log = _worker_model.eval_cache.store
+    log.entries = []
+    # Worker models run with a single worker, so only their engine decides on batching
+    config = {**config, 'batched': _worker_model.batch_capable}
+    return _refine_start(_worker_model, _worker_best, x0, config, seed), log.entries
+
+
+def _refine_start(model: Any, shared_best: Any, x0: np.ndarray, config: Dict[str, Any],
+                  seed: int) -> Tuple[np.ndarray, float, bool, int]:
+    """Refines one start with its own random stream.
+
+    Returns:
+        A tuple (design, cost, feasible, simulation_cycles).
+    """
+    start_cycles = model.simulation_cycles
+    np.random.seed(seed)
+    refiner = LocalRefiner(model, {**config, 'shared_best': shared_best})
+    x = refiner.refine(x0)
+    cost, max_deficit = model.evaluate(x)
+    return x, float(cost), bool(max_deficit <= 0), model.simulation_cycles - start_cycles
+
+
+def start_designs(opt_instance, x0: np.ndarray, starts: int) -> List[np.ndarray]:
+    """Returns the incumbent followed by `starts - 1` repaired perturbations of it.
+
+    `LocalRefiner.diversify` jumps are too far for a start: on large networks
+    their repair costs far more than the incumbent, so the perturbations only
+    move a few pipes by one size.
+    """
+    incumbent = np.asarray(x0).astype(np.int32)
+    n_change = max(1, int(START_PERTURBATION * len(incumbent)))
+    designs = [incumbent]
+    for _ in range(starts - 1):
+        x = incumbent.copy()
+        idx = np.random.choice(len(x), n_change, replace=False)
+        x[idx] += np.random.choice([-1, 1], n_change)
+        designs.append(opt_instance.repair(x))
+    return designs
+
+
+def refine_multi_start(opt_instance, x0: np.ndarray, config: Dict[str, Any], starts: int) -> np.ndarray:
+    """Runs `starts` FLS-H refinements and returns the cheapest feasible result.
+
+    Args:
+        opt_instance: An instance of the Optimization class.
+        x0: Incumbent feasible design.
+        config: `LocalRefiner` configuration shared by every start.
+        starts: Number of refinements.
+
+    Returns:
+        np.ndarray: The best feasible design found (`x0` if none improves it).
+    """
+    logger.info(f"[FLS-H] Multi-start refinement: {starts} starts.")
+    seed = opt_instance.config.get('RandomSeed')
+    seeds = [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(seed).spawn(starts)]
+    designs = start_designs(opt_instance, x0, starts)
+    best_x = np.asarray(x0).astype(np.int32)
+    best_cost, max_deficit = opt_instance.evaluate(best_x)
+    if max_deficit > 0:
+        best_cost = np.inf
+
+    workers = min(opt_instance.config.get('Workers', 1), starts)
+    if workers > 1:
+        shared_best = multiprocessing.get_context('spawn').Value('d', best_cost)
+        tasks = [(x, opt_instance.lbound, opt_instance.ubound, config, s)
+                 for x, s in zip(designs, seeds)]
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_init_worker,
+                                 initargs=(str(opt_instance.problem_file), shared_best)) as pool:
+            results = []
+            for result, evaluations in pool.map(_refine_in_worker, tasks):
+                opt_instance.eval_cache.merge(evaluations)
+                results.append(result)
+    else:
+        shared_best = multiprocessing.Value('d', best_cost)
+        state = np.random.get_state()
+        try:
+            results = [_refine_start(opt_instance, shared_best, x, config, s) for x, s in zip(designs, seeds)]
+        finally:
+            # The starts draw from their own streams; the caller's stream is left as it was
+            np.random.set_state(state)
+        # In-process simulations are already counted
+        results = [(x, cost, feasible, 0) for x, cost, feasible, _ in results]
+
+    for k, (x, cost, feasible, cycles) in enumerate(results):
+        opt_instance.simulation_cycles += cycles
+        logger.info(f"      Start {k + 1}: {cost:.2f}" + ("" if feasible else " (infeasible)"))
+        if feasible and cost < best_cost:
+            best_x, best_cost = x, cost
+    return best_x
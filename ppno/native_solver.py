@@ -0,0 +1,522 @@
+"""Native steady-state hydraulic solver.
+
+A NumPy/SciPy implementation of the Global Gradient Algorithm (Todini & Pilati)
+used by EPANET, for single-period networks made of pipes, junctions and fixed
+head nodes (reservoirs and tanks). The network is parsed directly from the
+EPANET .inp file, so designs can be evaluated without any toolkit call.
+
+The head loss formulas (Hazen-Williams and Darcy-Weisbach with the
+Swamee-Jain approximation and Dunlop's transitional interpolation) follow
+EPANET 2.2 and work internally in its US units (ft, cfs).
+"""
+
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from scipy import sparse
+from scipy.linalg import solveh_banded
+from scipy.sparse.csgraph import reverse_cuthill_mckee
+from scipy.sparse.linalg import spsolve
+
+from . import section_parser as sp
+
+# Logger configuration
+logger = logging.getLogger(__name__)
+
+# Flow units per cfs (EPANET internal flow unit)
+FLOW_UNITS = {
+    'CFS': (1.0, False), 'GPM': (448.831, False), 'MGD': (0.64632, False),
+    'IMGD': (0.5382, False), 'AFD': (1.9837, False),
+    'LPS': (28.317, True), 'LPM': (1699.0, True), 'MLD': (2.4466, True),
+    'CMH': (101.94, True), 'CMD': (2446.6, True),
+}
+M_PER_FT = 0.3048
+PSI_PER_FT = 0.4333
+VISCOSITY = 1.1e-5       # Kinematic viscosity of water at 20 deg C (ft2/s)
+RQ_TOL = 1e-7            # Minimum head loss gradient (EPANET RQtol)
+HW_EXP = 1.852           # Hazen-Williams flow exponent
+MAX_BANDWIDTH = 64       # Widest reordered system solved as a banded matrix
+
+# Darcy-Weisbach friction factor constants (EPANET hydcoeffs.c)
+_A1 = 1000.0 * np.pi                # Re = 4000 in terms of w = q / (nu d)
+_A2 = 500.0 * np.pi                 # Re = 2000
+_A8 = 5.74 * (np.pi / 4.0) ** 0.9
+_A9 = -2.0 / np.log(10.0)
+_AB = 5.74 / 4000.0 ** 0.9
+_AC = -2.0 * 0.9 * 2.0 / np.log(10.0) * _AB
+
+
+class NativeSolver:
+    """Single-period GGA hydraulic solver for pipe networks.
+
+    Pipe properties are set and results are read in the units of the .inp file
+    (mm or inches, meters or feet, meters or psi of pressure), like the toolkit.
+
+    Attributes:
+        node_ids (List[str]): Node IDs (junctions first, then fixed head nodes).
+        link_ids (List[str]): IDs of the open pipes.
+        headloss_formula (str): 'H-W' or 'D-W'.
+        si_units (bool): True for SI flow units.
+        converged (bool): Whether the last solve met the accuracy target.
+        iterations (int): Newton iterations used by the last solve.
+    """
+
+    def __init__(self, node_ids: List[str], n_junctions: int, elevation: np.ndarray,
+                 demand: np.ndarray, fixed_head: np.ndarray, link_ids: List[str],
+                 from_node: np.ndarray, to_node: np.ndarray, length: np.ndarray,
+                 diameter: np.ndarray, roughness: np.ndarray, minor_loss: np.ndarray,
+                 headloss_formula: str = 'H-W', si_units: bool = False,
+                 viscosity: float = VISCOSITY, specific_gravity: float = 1.0,
+                 accuracy: float = 0.001, max_trials: int = 40,
+                 fixed_elevation: Optional[np.ndarray] = None):
+        """Builds the network from arrays in internal units (ft, cfs).
+
+        Use `from_inp` to load an EPANET input file.
+
+        Args:
+            node_ids: Node IDs; the first `n_junctions` are junctions.
+            n_junctions: Number of junctions (unknown heads).
+            elevation: Junction elevations (ft).
+            demand: Junction demands (cfs).
+            fixed_head: Heads of the fixed head nodes (ft).
+            link_ids: Pipe IDs.
+            from_node: Start node position of each pipe.
+            to_node: End node position of each pipe.
+            length: Pipe lengths (ft).
+            diameter: Pipe diameters (ft).
+            roughness: Hazen-Williams C or Darcy-Weisbach roughness (ft).
+            minor_loss: Minor loss coefficients.
+            headloss_formula: 'H-W' or 'D-W'.
+            si_units: Whether values are reported in SI units.
+            viscosity: Kinematic viscosity (ft2/s).
+            specific_gravity: Specific gravity of the fluid.
+            accuracy: Convergence limit on the relative flow change.
+            max_trials: Maximum number of Newton iterations.
+            fixed_elevation: Elevations of the fixed head nodes (ft), used for
+                their pressures; defaults to their heads (reservoirs).
+        """
+        if headloss_formula not in ('H-W', 'D-W'):
+            raise ValueError(f"Head loss formula {headloss_formula} is not supported by the native engine")
+        self.node_ids = list(node_ids)
+        self.link_ids = list(link_ids)
+        self._node_pos = {node_id: i for i, node_id in enumerate(self.node_ids)}
+        self._link_pos = {link_id: k for k, link_id in enumerate(self.link_ids)}
+        self.n_junctions = n_junctions
+        self.elevation = np.asarray(elevation, dtype=np.float64)
+        self.demand = np.asarray(demand, dtype=np.float64)
+        self.fixed_head = np.asarray(fixed_head, dtype=np.float64)
+        fixed_elevation = self.fixed_head if fixed_elevation is None else fixed_elevation
+        self._node_elevation = np.concatenate([self.elevation, np.asarray(fixed_elevation, dtype=np.float64)])
+        self.from_node = np.asarray(from_node, dtype=np.intp)
+        self.to_node = np.asarray(to_node, dtype=np.intp)
+        self.length = np.asarray(length, dtype=np.float64)
+        self.diameter = np.asarray(diameter, dtype=np.float64).copy()
+        self.roughness = np.asarray(roughness, dtype=np.float64).copy()
+        self.minor_loss = np.asarray(minor_loss, dtype=np.float64)
+        self.headloss_formula = headloss_formula
+        self.si_units = si_units
+        self.viscosity = viscosity
+        self.specific_gravity = specific_gravity
+        self.accuracy = accuracy
+        self.max_trials = max_trials
+
+        self._length_ucf = M_PER_FT if si_units else 1.0
+        self._diameter_ucf = 1000.0 * M_PER_FT if si_units else 12.0
+        self._pressure_ucf = (M_PER_FT if si_units else PSI_PER_FT) * specific_gravity
+        # Darcy-Weisbach roughness is given in mm (SI) or millifeet (US)
+        self._roughness_ucf = 1000.0 * self._length_ucf if headloss_formula == 'D-W' else 1.0
+
+        self._build_topology()
+        self.heads = np.concatenate([self.elevation, self.fixed_head])
+        self.flows = np.zeros(len(self.link_ids))
+        self.converged = False
+        self.iterations = 0
+
+    @classmethod
+    def from_inp(cls, inp_file: Union[str, Path]) -> 'NativeSolver':
+        """Loads a single-period network from an EPANET .inp file.
+
+        Raises:
+            ValueError: If the model uses features the native engine does not
+                support (pumps, valves, check valves, emitters, controls,
+                extended period simulation or the Chezy-Manning formula).
+        """
+        sections = sp.SectionParser(inp_file).read()
+
+        def rows(name: str) -> List[Tuple[str, ...]]:
+            return [sp.SectionParser.line_to_tuple(line) for _, line in sections.get(name, [])]
+
+        for name in ('PUMPS', 'VALVES', 'EMITTERS', 'CONTROLS', 'RULES'):
+            if rows(name):
+                raise ValueError(f"The native engine does not support [{name}] ({Path(inp_file).name})")
+
+        options: Dict[str, List[str]] = {}
+        for tokens in rows('OPTIONS') + rows('TIMES'):
+            for n_words in (2, 1):
+                key = ' '.join(tokens[:n_words]).upper()
+                if len(tokens) > n_words:
+                    options.setdefault(key, list(tokens[n_words:]))
+
+        def option(key: str, default: str) -> str:
+            return options.get(key, [default])[0].upper()
+
+        duration = option('DURATION', '0')
+        if any(float(part) > 0 for part in duration.split(':') if part.replace('.', '', 1).isdigit()):
+            raise ValueError("The native engine only solves single-period models (Duration 0)")
+
+        units = option('UNITS', 'GPM')
+        if units not in FLOW_UNITS:
+            raise ValueError(f"Unknown flow units: {units}")
+        flow_ucf, si_units = FLOW_UNITS[units]
+        length_ucf = M_PER_FT if si_units else 1.0
+        formula = option('HEADLOSS', 'H-W')
+        viscosity = float(option('VISCOSITY', '1'))
+        viscosity = viscosity * VISCOSITY if viscosity > 1e-3 else viscosity / length_ucf ** 2
+
+        patterns: Dict[str, float] = {}
+        for tokens in rows('PATTERNS'):
+            if len(tokens) > 1:
+                patterns.setdefault(tokens[0], float(tokens[1]))
+        default_pattern = options.get('PATTERN', ['1'])[0]
+        multiplier = float(option('DEMAND MULTIPLIER', '1'))
+
+        node_ids, elevation, demand = [], [], []
+        for tokens in rows('JUNCTIONS'):
+            node_ids.append(tokens[0])
+            elevation.append(float(tokens[1]) / length_ucf)
+            base = float(tokens[2]) if len(tokens) > 2 else 0.0
+            pattern = tokens[3] if len(tokens) > 3 else default_pattern
+            demand.append(base * patterns.get(pattern, 1.0))
+        n_junctions = len(node_ids)
+        junction_pos = {node_id: i for i, node_id in enumerate(node_ids)}
+
+        # [DEMANDS] entries replace the demand given in [JUNCTIONS]
+        replaced = set()
+        for tokens in rows('DEMANDS'):
+            i = junction_pos[tokens[0]]
+            if i not in replaced:
+                demand[i] = 0.0
+                replaced.add(i)
+            pattern = tokens[2] if len(tokens) > 2 else default_pattern
+            demand[i] += float(tokens[1]) * patterns.get(pattern, 1.0)
+        demand = np.array(demand) * multiplier / flow_ucf
+
+        fixed_head, fixed_elevation = [], []
+        for tokens in rows('RESERVOIRS'):
+            node_ids.append(tokens[0])
+            pattern = tokens[2] if len(tokens) > 2 else None
+            fixed_head.append(float(tokens[1]) * patterns.get(pattern, 1.0) / length_ucf)
+            fixed_elevation.append(fixed_head[-1])
+        for tokens in rows('TANKS'):
+            node_ids.append(tokens[0])
+            fixed_head.append((float(tokens[1]) + float(tokens[2])) / length_ucf)
+            fixed_elevation.append(float(tokens[1]) / length_ucf)
+        if not fixed_head:
+            raise ValueError("The network has no reservoir or tank")
+        node_pos = {node_id: i for i, node_id in enumerate(node_ids)}
+
+        closed = {tokens[0] for tokens in rows('STATUS') if len(tokens) > 1 and tokens[1].upper() == 'CLOSED'}
+        diameter_ucf = 1000.0 * M_PER_FT if si_units else 12.0
+        roughness_ucf = 1000.0 * length_ucf if formula == 'D-W' else 1.0
+        link_ids, from_node, to_node, length, diameter, roughness, minor_loss = [], [], [], [], [], [], []
+        for tokens in rows('PIPES'):
+            status = tokens[7].upper() if len(tokens) > 7 else 'OPEN'
+            if status == 'CV':
+                raise ValueError(f"The native engine does not support check valves (pipe {tokens[0]})")
+            if status == 'CLOSED' or tokens[0] in closed:
+                continue
+            link_ids.append(tokens[0])
+            from_node.append(node_pos[tokens[1]])
+            to_node.append(node_pos[tokens[2]])
+            length.append(float(tokens[3]) / length_ucf)
+            diameter.append(float(tokens[4]) / diameter_ucf)
+            roughness.append(float(tokens[5]) / roughness_ucf)
+            minor_loss.append(float(tokens[6]) if len(tokens) > 6 else 0.0)
+
+        return cls(node_ids, n_junctions, np.array(elevation), demand, np.array(fixed_head),
+                   link_ids, np.array(from_node), np.array(to_node), np.array(length),
+                   np.array(diameter), np.array(roughness), np.array(minor_loss),
+                   headloss_formula=formula, si_units=si_units, viscosity=viscosity,
+                   specific_gravity=float(option('SPECIFIC GRAVITY', '1')),
+                   accuracy=float(option('ACCURACY', '0.001')),
+                   max_trials=int(float(option('TRIALS', '40'))),
+                   fixed_elevation=np.array(fixed_elevation))
+
+    def _build_topology(self) -> None:
+        """Precomputes the incidence matrices and the sparsity pattern of the GGA system."""
+        n_nodes = len(self.node_ids)
+        n_links = len(self.link_ids)
+        links = np.arange(n_links)
+        # B[i, k] = +1 if pipe k enters node i, -1 if it leaves it
+        incidence = sparse.csr_matrix(
+            (np.concatenate([-np.ones(n_links), np.ones(n_links)]),
+             (np.concatenate([self.from_node, self.to_node]), np.concatenate([links, links]))),
+            shape=(n_nodes, n_links))
+        self._b_junctions = incidence[:self.n_junctions].tocsr()
+        self._b_junctions_t = self._b_junctions.T.tocsr()
+        self._b_fixed_t = incidence[self.n_junctions:].T.tocsr()
+
+        # Jacobian A = Bj P Bj^T: every entry is a signed sum of link coefficients,
+        # so its values are `assembly @ p` on a storage layout computed once.
+        rows, cols, data, owners = [], [], [], []
+        for k, (i, j) in enumerate(zip(self.from_node.tolist(), self.to_node.tolist())):
+            for a, b, sign in ((i, i, 1.0), (j, j, 1.0), (i, j, -1.0), (j, i, -1.0)):
+                if a < self.n_junctions and b < self.n_junctions:
+                    rows.append(a); cols.append(b); data.append(sign); owners.append(k)
+        rows, cols = np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp)
+        n = self.n_junctions
+        pattern = sparse.coo_matrix((np.ones(len(rows)), (rows, cols)), shape=(n, n)).tocsr()
+
+        # Reverse Cuthill-McKee keeps pipe networks (trees in particular) narrowly
+        # banded, so the SPD system can be solved with a banded Cholesky.
+        perm = reverse_cuthill_mckee(pattern, symmetric_mode=True).astype(np.intp)
+        rank = np.empty(n, dtype=np.intp)
+        rank[perm] = np.arange(n)
+        bandwidth = int(np.max(np.abs(rank[rows] - rank[cols]), initial=0))
+        if bandwidth <= MAX_BANDWIDTH:
+            upper = rank[rows] <= rank[cols]
+            # Upper banded storage: ab[bw + i - j, j] = A[i, j]
+            slots = (bandwidth + rank[rows] - rank[cols]) * n + rank[cols]
+            self._assembly = sparse.csr_matrix(
+                (np.array(data)[upper], (slots[upper], np.array(owners)[upper])),
+                shape=((bandwidth + 1) * n, n_links))
+            self._band = (bandwidth + 1, n)
+            self._perm = perm
+        else:
+            pattern = pattern.tocsc()
+            pattern.sort_indices()
+            self._pattern = pattern
+            position = sparse.csc_matrix((np.arange(pattern.nnz) + 1, pattern.indices, pattern.indptr),
+                                         shape=(n, n))
+            slots = np.asarray(position[rows, cols]).ravel() - 1
+            self._assembly = sparse.csr_matrix((data, (slots, owners)), shape=(pattern.nnz, n_links))
+            self._band = None
+
+    def _solve_linear(self, p: np.ndarray, rhs: np.ndarray) -> np.ndarray:
+        """Solves the GGA systems (Bj P Bj^T) H = rhs of a population at once.
+
+        The systems of all members share one sparsity pattern, so they are
+        stacked into a single block-diagonal system and solved with one call.
+
+        Args:
+            p: (pop, n_links) inverse head loss gradients.
+            rhs: (pop, n_junctions) right-hand sides.
+
+        Returns:
+            (pop, n_junctions) junction heads.
+        """
+        pop, n = rhs.shape
+        values = self._assembly @ p.T                   # (storage slots, pop)
+        if self._band is not None:
+            # Blocks placed side by side in banded storage form a banded
+            # matrix of the same bandwidth: the padding slots are zero.
+            n_diagonals = self._band[0]
+            ab = values.reshape(n_diagonals, n, pop).transpose(0, 2, 1).reshape(n_diagonals, pop * n)
+            solution = solveh_banded(ab, rhs[:, self._perm].ravel(), check_finite=False)
+            heads = np.empty_like(rhs)
+            heads[:, self._perm] = solution.reshape(pop, n)
+            return heads
+        pattern = self._pattern
+        indices = (pattern.indices[np.newaxis, :] + n * np.arange(pop)[:, np.newaxis]).ravel()
+        indptr = np.concatenate([(pattern.indptr[:-1][np.newaxis, :]
+                                  + pattern.nnz * np.arange(pop)[:, np.newaxis]).ravel(),
+                                 [pattern.nnz * pop]])
+        matrix = sparse.csc_matrix((values.T.ravel(), indices, indptr), shape=(pop * n, pop * n))
+        return np.asarray(spsolve(matrix, rhs.ravel())).reshape(pop, n)
+
+    def _resistances(self, d: np.ndarray, roughness: np.ndarray,
+                     positions: Union[slice, np.ndarray] = slice(None)) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the resistance and minor loss coefficients (internal units) of the
+        pipes at `positions` (all pipes by default)."""
+        length = self.length[positions]
+        if self.headloss_formula == 'H-W':
+            resistance = 4.727 * length / roughness ** HW_EXP / d ** 4.871
+        else:
+            resistance = length / (2.0 * 32.2 * d * (np.pi * d ** 2 / 4.0) ** 2)
+        return resistance, 0.02517 * self.minor_loss[positions] / d ** 4
+
+    def link_headloss(self, positions: np.ndarray, flows: np.ndarray, diameters: np.ndarray,
+                      roughness: np.ndarray) -> np.ndarray:
+        """Head loss (internal units, signed like the flow) of the pipes at `positions`.
+
+        Args:
+            positions: Solver positions of the pipes.
+            flows: Flows (cfs), broadcastable to the properties.
+            diameters: Diameters in .inp units, with `len(positions)` as last axis.
+            roughness: Roughness in .inp units, same shape as `diameters`.
+        """
+        d = np.asarray(diameters, dtype=np.float64) / self._diameter_ucf
+        rough = np.asarray(roughness, dtype=np.float64) / self._roughness_ucf
+        r, minor = self._resistances(d, rough, positions)
+        hloss, _ = self._gradients(np.broadcast_to(flows, d.shape), d, rough, r, minor)
+        return hloss
+
+    def link_positions(self, link_ids: Sequence[str]) -> np.ndarray:
+        """Maps pipe IDs to solver positions."""
+        try:
+            return np.array([self._link_pos[str(link_id)] for link_id in link_ids], dtype=np.intp)
+        except KeyError as e:
+            raise ValueError(f"Pipe {e.args[0]} is not an open pipe of the native model")
+
+    def node_positions(self, node_ids: Sequence[str]) -> np.ndarray:
+        """Maps node IDs to solver positions."""
+        try:
+            return np.array([self._node_pos[str(node_id)] for node_id in node_ids], dtype=np.intp)
+        except KeyError as e:
+            raise ValueError(f"Node {e.args[0]} is not a node of the native model")
+
+    def set_pipes(self, positions: np.ndarray, diameters: np.ndarray, roughness: np.ndarray) -> None:
+        """Sets pipe diameters and roughness, in .inp units."""
+        self.diameter[positions] = np.asarray(diameters, dtype=np.float64) / self._diameter_ucf
+        self.roughness[positions] = np.asarray(roughness, dtype=np.float64) / self._roughness_ucf
+
+    def _gradients(self, q: np.ndarray, d: np.ndarray, roughness: np.ndarray,
+                   r: np.ndarray, minor: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the head loss and its derivative for the link flows `q`.
+
+        All arguments broadcast, so `q` may hold the flows of a whole population.
+        """
+        aq = np.abs(q)
+        if self.headloss_formula == 'H-W':
+            qa = (RQ_TOL / HW_EXP / r) ** (1.0 / (HW_EXP - 1.0))
+            linear = aq <= qa
+            safe_q = np.where(linear, 1.0, aq)
+            hgrad = np.where(linear, RQ_TOL, HW_EXP * r * safe_q ** (HW_EXP - 1.0))
+            hloss = np.where(linear, hgrad * aq, hgrad * aq / HW_EXP)
+            hloss = hloss + minor * aq * aq
+            hgrad = hgrad + 2.0 * minor * aq
+        else:
+            s = self.viscosity * d
+            e = roughness / d
+            w = aq / s
+            laminar = w <= _A2
+            turbulent = w >= _A1
+            safe_q = np.where(laminar, 1.0, aq)
+            # Swamee-Jain (Re >= 4000)
+            y1 = _A8 / np.where(turbulent, w, _A1) ** 0.9
+            y2 = e / 3.7 + y1
+            y3 = _A9 * np.log(y2)
+            f_t = 1.0 / y3 ** 2
+            dfdq_t = 1.8 * f_t * y1 * _A9 / y2 / y3 / safe_q
+            # Dunlop's interpolation (2000 < Re < 4000)
+            y2 = e / 3.7 + _AB
+            y3 = _A9 * np.log(y2)
+            fa = 1.0 / y3 ** 2
+            fb = (2.0 + _AC / (y2 * y3)) * fa
+            rr = w / _A2
+            x1 = 7.0 * fa - fb
+            x2 = 0.128 - 17.0 * fa + 2.5 * fb
+            x3 = -0.128 + 13.0 * fa - (fb + fb)
+            x4 = 0.032 - 3.0 * fa + 0.5 * fb
+            f_d = x1 + rr * (x2 + rr * (x3 + rr * x4))
+            dfdq_d = (x2 + rr * (2.0 * x3 + rr * 3.0 * x4)) / s / _A2
+            f = np.where(turbulent, f_t, f_d)
+            dfdq = np.where(turbulent, dfdq_t, dfdq_d)
+
+            r1 = f * r + minor
+            hloss = np.where(laminar, aq * (16.0 * np.pi * s * r + minor * aq), r1 * aq * aq)
+            hgrad = np.where(laminar, 16.0 * np.pi * s * r + 2.0 * minor * aq,
+                             2.0 * r1 * aq + dfdq * r * aq * aq)
+        hgrad = np.maximum(hgrad, RQ_TOL)
+        return np.sign(q) * hloss, hgrad
+
+    def _newton(self, q: np.ndarray, d: np.ndarray,
+                roughness: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+        """Runs the GGA iterations for a population of designs.
+
+        Args:
+            q: (pop, n_links) initial flows.
+            d: (pop, n_links) diameters (ft).
+            roughness: (pop, n_links) roughness (internal units).
+
+        Returns:
+            A tuple (flows, junction_heads, converged, iterations); the iterations
+            stop when every member meets the accuracy target.
+        """
+        r, minor = self._resistances(d, roughness)
+        fixed_term = self._b_fixed_t @ self.fixed_head
+        converged = np.zeros(len(q), dtype=bool)
+        heads = None
+        iterations = 0
+        for iterations in range(1, self.max_trials + 1):
+            hloss, hgrad = self._gradients(q, d, roughness, r, minor)
+            p = 1.0 / hgrad
+            y = hloss * p
+            rhs = (q - y - p * fixed_term) @ self._b_junctions_t - self.demand
+            heads = self._solve_linear(p, rhs)
+            q_new = q - y - p * (heads @ self._b_junctions + fixed_term)
+            change = np.sum(np.abs(q_new - q), axis=1) / np.maximum(np.sum(np.abs(q_new), axis=1), 1e-12)
+            q = q_new
+            converged = change <= self.accuracy
+            if converged.all():
+                break
+        return q, heads, converged, iterations
+
+    def _initial_flows(self, d: np.ndarray) -> np.ndarray:
+        """Warm start from the last solution, or EPANET's 1 ft/s initial velocity."""
+        if np.any(self.flows):
+            return np.broadcast_to(self.flows, d.shape).copy()
+        return np.pi * d ** 2 / 4.0
+
+    def solve(self) -> bool:
+        """Solves the network for the current pipe properties.
+
+        Returns:
+            True if the solution converged within `max_trials` iterations.
+        """
+        d, roughness = self.diameter[np.newaxis, :], self.roughness[np.newaxis, :]
+        q, heads, converged, self.iterations = self._newton(self._initial_flows(d), d, roughness)
+        self.flows = q[0]
+        self.heads = np.concatenate([heads[0], self.fixed_head])
+        self.converged = bool(converged[0])
+        return self.converged
+
+    def solve_batch(self, positions: np.ndarray, diameters: np.ndarray,
+                    roughness: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Solves a population of designs together.
+
+        The pipes not listed in `positions` keep their current properties. The
+        state used by `solve`, `pressures` and `headlosses` is not modified.
+
+        Args:
+            positions: Solver positions of the sized pipes.
+            diameters: (pop, len(positions)) diameters, in .inp units.
+            roughness: (pop, len(positions)) roughness, in .inp units.
+
+        Returns:
+            A tuple (heads, converged): (pop, n_nodes) node heads in internal
+            units, to be passed to `pressures`, and a (pop,) convergence mask.
+        """
+        pop = len(diameters)
+        d = np.tile(self.diameter, (pop, 1))
+        rough = np.tile(self.roughness, (pop, 1))
+        d[:, positions] = np.asarray(diameters, dtype=np.float64) / self._diameter_ucf
+        rough[:, positions] = np.asarray(roughness, dtype=np.float64) / self._roughness_ucf
+        _, heads, converged, _ = self._newton(self._initial_flows(d), d, rough)
+        heads = np.concatenate([heads, np.broadcast_to(self.fixed_head, (pop, len(self.fixed_head)))], axis=1)
+        return heads, converged
+
+    def pressures(self, positions: np.ndarray, heads: Optional[np.ndarray] = None) -> np.ndarray:
+        """Returns node pressures (meters or psi).
+
+        Args:
+            positions: Solver positions of the nodes.
+            heads: Optional (pop, n_nodes) heads from `solve_batch`; defaults to
+                the heads of the last `solve`.
+
+        Returns:
+            The pressures, with shape (len(positions),) or (pop, len(positions)).
+        """
+        heads = self.heads if heads is None else heads
+        return (heads[..., positions] - self._node_elevation[positions]) * self._pressure_ucf
+
+    def headlosses(self, positions: np.ndarray) -> np.ndarray:
+        """Returns absolute pipe head losses (meters or feet) from the last solve, like EN_HEADLOSS."""
+        return np.abs(self.heads[self.from_node[positions]] - self.heads[self.to_node[positions]]) * self._length_ucf
+
+    def velocities(self, positions: np.ndarray) -> np.ndarray:
+        """Returns absolute pipe velocities (m/s or ft/s) from the last solve, like EN_VELOCITY."""
+        area = np.pi / 4.0 * self.diameter[positions] ** 2
+        return np.abs(self.flows[positions]) / area * self._length_ucf
@@ -6,6 +6,8 @@ algorithms (Unit Headloss Heuristic, Differential Evolution, Dual Annealing, NSG
 
 import os
 import sys
+import ctypes
+import hashlib
 import logging
 from time import perf_counter, localtime, strftime
 from pathlib import Path
@@ -24,6 +26,7 @@ except ImportError:
         import entoolkit as et
 from . import section_parser as sp
 from .local_refiner import LocalRefiner
+from .eval_cache import EvaluationCache
 
 # Logger configuration
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
@@ -33,8 +36,9 @@ logger = logging.getLogger(__name__)
 from .constants import (
     ALGORITHM_UH, ALGORITHM_DE, ALGORITHM_DA, ALGORITHM_NSGA2,
     ALGORITHM_DIRECT, ALGORITHM_MOEAD, ALGORITHM_MACO,
-    ALGORITHM_PSO, MAX_RETRIES,
-    LS_MAX_ITER, LS_ACCEPTANCE_THRESHOLD, LS_NEIGHBORHOOD_SIZE
+    ALGORITHM_PSO, ALGORITHM_MILP, ALGORITHM_IDE, MAX_RETRIES, IDE_BUDGET,
+    LS_MAX_ITER, LS_ACCEPTANCE_THRESHOLD, LS_NEIGHBORHOOD_SIZE, UH_MAX_BATCH_FRACTION,
+    NATIVE_BATCH_SIZE
 )
 
 
@@ -48,24 +52,31 @@ class Optimization:
         problem_file (Path): Path to the .ext problem definition file.
         inp_file (Path): Path to the original EPANET .inp file.
         rpt_file (Path): Path to the generated EPANET .rpt file.
+        backend (str): Toolkit backend, 'LEGACY' (global EN* API) or 'PROJECT'.
         algorithm (int): Chosen optimization algorithm ID.
         pipes (np.ndarray): Array of pipes to be sized.
         nodes (np.ndarray): Array of nodes to check for pressure requirements.
         catalog (Dict[str, np.ndarray]): Available pipe series and their properties.
+        cost_matrix (np.ndarray): Padded (n_pipes, max_sizes) matrix of length x price
+            per pipe and catalog index; unavailable sizes are priced as infinity.
         dimension (int): Number of variable pipes.
         lbound (np.ndarray): Lower bounds for variable indexes.
         ubound (np.ndarray): Upper bounds for variable indexes.
         algorithms (List[int]): List of Stage 2 metaheuristic algorithms to execute.
         max_retries (int): Maximum retry attempts for failed algorithms.
         simulation_cycles (int): Counter for network hydraulic simulation runs.
+        timed_out (bool): Whether the last SciPy run was stopped by `MaxTime`.
+        eval_cache (EvaluationCache): Evaluations shared by every stage of the pipeline.
         results (List[Dict[str, Any]]): Collected performance data.
     """
 
-    def __init__(self, problem_file: Union[str, Path]):
+    def __init__(self, problem_file: Union[str, Path], workers: Optional[int] = None):
         """Initializes the optimization problem and performs full validation.
 
         Args:
             problem_file: Path to the .ext file containing problem data.
+            workers: Optional number of evaluation worker processes; overrides
+                the `Workers` option of the problem file.
 
         Raises:
             FileNotFoundError: If the problem or input files are missing.
@@ -95,15 +106,21 @@ class Optimization:
         self.algorithm = ALGORITHM_UH
 
         # 2. Open Toolkit for entity validation
+        self.backend = self._read_backend(sections.get('OPTIONS', []), parser)
+        if self.backend == 'PROJECT':
+            from .project_toolkit import ProjectToolkit
+            self._et = ProjectToolkit()
+        else:
+            self._et = et
         rpt = os.devnull
         try:
-            et.ENopen(str(self.inp_file), rpt)
+            self._et.ENopen(str(self.inp_file), rpt)
         except Exception as e:
             raise ValueError(f"Line {inp_line_num}: Failed to load EPANET model {self.inp_file.name} ({str(e)})")
         
-        et.ENopenH()
+        self._et.ENopenH()
         try:
-            et.ENsetstatusreport(0)
+            self._et.ENsetstatusreport(0)
         except Exception:
             pass
 
@@ -111,7 +128,42 @@ class Optimization:
         self._validate_config(sections, parser)
 
         # 4. Load Data
+        self.config = {
+            'MaxTime': 120,
+            'RandomSeed': None,
+            'PopulationSize': 100,
+            'Generations': 100,
+            'Patience': 10,
+            'MaxTrials': 250,
+            'IDEBudget': IDE_BUDGET,
+            'RefinerIters': LS_MAX_ITER,
+            'RefinerNeighbors': LS_NEIGHBORHOOD_SIZE,
+            'RefinerWorsening': LS_ACCEPTANCE_THRESHOLD,
+            'Workers': 1,
+            'CacheMemory': 256.0,
+            'CacheEntries': None,
+            'CacheFile': None,
+            'Engine': 'AUTO',
+            'Dominance': False,
+            'DominanceVerify': 0.02,
+            'TightenBounds': False,
+            'MinVelocity': None,
+            'UHMode': 'CLASSIC',
+            'RefinerMode': 'RANDOM',
+            'RefinerStrategy': 'BEST',
+            'RefinerTabu': 0,
+            'RefinerAdaptive': False,
+            'RefinerPatience': 0,
+            'RefinerStarts': 1,
+            'Repair': False,
+            'RepairBudget': 10
+        }
         self._load_options(sections.get('OPTIONS', []), parser)
+        if workers is not None:
+            if int(workers) < 1:
+                raise ValueError(f"Invalid number of workers {workers} (expected 1 or more)")
+            self.config['Workers'] = int(workers)
+        self._evaluator = None
 
         logger.info(f"Loading optimization problem: {self.problem_file}")
         logger.info("-" * 80)
@@ -120,34 +172,52 @@ class Optimization:
         self._load_pipes(sections.get('PIPES', []), parser)
         self._load_pressures(sections.get('PRESSURES', []), parser)
         self._load_catalog(sections.get('CATALOG', []), parser)
+        self._init_result_getters()
+        self._init_engine()
 
         self.dimension = len(self.pipes)
+        self.n_sources = int(self._et.ENgetcount(self._et.EN_TANKCOUNT))  # reservoirs and tanks
         self._current_x = np.zeros(self.dimension, dtype=np.int32)
         self.lbound = np.zeros(self.dimension, dtype=np.int32)
         self.ubound = np.array([len(self.catalog[str(p['series'])]) - 1 for p in self.pipes], dtype=np.int32)
-        
-        self.config = {
-            'MaxTime': 120,
-            'RandomSeed': None,
-            'PopulationSize': 100,
-            'Generations': 100,
-            'Patience': 10,
-            'MaxTrials': 250,
-            'RefinerIters': LS_MAX_ITER,
-            'RefinerNeighbors': LS_NEIGHBORHOOD_SIZE,
-            'RefinerWorsening': LS_ACCEPTANCE_THRESHOLD
-        }
-        
+        self.eval_cache = EvaluationCache(self.config['CacheMemory'],
+                                          int(self.ubound.max()) if self.dimension else 0,
+                                          store=self._open_store(),
+                                          max_entries=self.config['CacheEntries'])
+        self._supply_graph = None
+        self.dominance = None
+        if self.config['Dominance']:
+            from .dominance import DominanceIndex
+            self.dominance = DominanceIndex(self.dimension, self.config['DominanceVerify'],
+                                            seed=self.config['RandomSeed'])
+
         self.simulation_cycles = 0
+        self.timed_out = False
         self.results = []
         logger.info("-" * 80)
 
+    @staticmethod
+    def _read_backend(options_lines: List[Tuple[int, str]], parser: sp.SectionParser) -> str:
+        """Reads the toolkit backend option, which must be known before opening the model.
+
+        'LEGACY' (default) uses the process-global EN* toolkit; 'PROJECT' gives this
+        instance its own EPANET 2.2 project handle.
+        """
+        backend = 'LEGACY'
+        for line_num, content in options_lines:
+            tokens = [t for t in parser.line_to_tuple(content) if t != '=']
+            if len(tokens) >= 2 and tokens[0].upper().replace('_', '') == 'BACKEND':
+                backend = tokens[1].upper()
+                if backend not in ('LEGACY', 'PROJECT'):
+                    raise ValueError(f"Line {line_num}: Unknown toolkit backend '{tokens[1]}'")
+        return backend
+
     def _validate_config(self, sections: Dict[str, List[Tuple[int, str]]], parser: sp.SectionParser) -> None:
         """Performs semantic validation of the configuration."""
         errors = []
         
         # Check Algorithms
-        alg_map = {'UH', 'DE', 'DA', 'NSGA2', 'DIRECT', 'MOEAD', 'MACO', 'PSO'}
+        alg_map = {'UH', 'DE', 'DA', 'NSGA2', 'DIRECT', 'MOEAD', 'MACO', 'PSO', 'MILP', 'IDE'}
         options = sections.get('OPTIONS', [])
         for line_num, content in options:
             tokens = parser.line_to_tuple(content)
@@ -174,7 +244,7 @@ class Optimization:
                 continue
             pipe_id, series_name = tokens[0], tokens[1]
             try:
-                et.ENgetlinkindex(pipe_id)
+                self._et.ENgetlinkindex(pipe_id)
             except Exception:
                 errors.append(f"Line {line_num}: Pipe '{pipe_id}' not found in hydraulic model")
             
@@ -190,7 +260,7 @@ class Optimization:
                 continue
             node_id, min_p = tokens[0], tokens[1]
             try:
-                et.ENgetnodeindex(node_id)
+                self._et.ENgetnodeindex(node_id)
             except Exception:
                 errors.append(f"Line {line_num}: Node '{node_id}' not found in hydraulic model")
             try:
@@ -220,6 +290,7 @@ class Optimization:
     def _load_options(self, options_lines: List[Tuple[int, str]], parser: sp.SectionParser) -> None:
         """Parses the OPTIONS section."""
         self.algorithms = []  # Stage 2 metaheuristics; empty = only UH + FLS-H
+        self.use_milp = False  # Stage 1 by exact MILP (branched networks only)
         self.max_retries = MAX_RETRIES
         alg_map = {
             'UH': ALGORITHM_UH, 
@@ -229,7 +300,9 @@ class Optimization:
             'DIRECT': ALGORITHM_DIRECT,
             'MOEAD': ALGORITHM_MOEAD,
             'MACO': ALGORITHM_MACO,
-            'PSO': ALGORITHM_PSO
+            'PSO': ALGORITHM_PSO,
+            'MILP': ALGORITHM_MILP,
+            'IDE': ALGORITHM_IDE
         }
 
         for line_num, content in options_lines:
@@ -248,6 +321,8 @@ class Optimization:
             if key in ['ALGORITHM', 'ALGORITHMS'] and values:
                 self.algorithms = [alg_map.get(v.upper(), None) for v in values]
                 self.algorithms = [a for a in self.algorithms if a is not None and a != ALGORITHM_UH]
+                self.use_milp = ALGORITHM_MILP in self.algorithms
+                self.algorithms = [a for a in self.algorithms if a != ALGORITHM_MILP]
                 logger.info(f"Optional Metaheuristics: {', '.join(values)}")
             elif key in ['MAXRETRIES', 'RETRIES']:
                 if values:
@@ -275,12 +350,120 @@ class Optimization:
                 if values: self.config['Patience'] = int(values[0])
             elif key in ['MAXTRIALS']:
                 if values: self.config['MaxTrials'] = int(values[0])
+            elif key in ['IDEBUDGET']:
+                if values: self.config['IDEBudget'] = max(1, int(values[0]))
             elif key in ['REFINERITERS']:
                 if values: self.config['RefinerIters'] = int(values[0])
             elif key in ['REFINERNEIGHBORS']:
                 if values: self.config['RefinerNeighbors'] = int(values[0])
             elif key in ['REFINERWORSENING']:
                 if values: self.config['RefinerWorsening'] = float(values[0])
+            elif key in ['REFINERMODE']:
+                if values:
+                    mode = values[0].upper()
+                    if mode not in ('RANDOM', 'GUIDED', 'SWEEP'):
+                        raise ValueError(f"Line {line_num}: Unknown refiner mode '{values[0]}'")
+                    self.config['RefinerMode'] = mode
+                    logger.info(f"RefinerMode: {mode}")
+            elif key in ['REFINERSTRATEGY']:
+                if values:
+                    strategy = values[0].upper()
+                    if strategy not in ('BEST', 'FIRST'):
+                        raise ValueError(f"Line {line_num}: Unknown refiner strategy '{values[0]}'")
+                    self.config['RefinerStrategy'] = strategy
+                    logger.info(f"RefinerStrategy: {strategy}")
+            elif key in ['REFINERTABU']:
+                if values: self.config['RefinerTabu'] = max(0, int(values[0]))
+            elif key in ['REFINERADAPTIVE']:
+                if values: self.config['RefinerAdaptive'] = self._parse_flag(values[0], line_num, 'RefinerAdaptive')
+            elif key in ['REFINERPATIENCE']:
+                if values: self.config['RefinerPatience'] = max(0, int(values[0]))
+            elif key in ['REFINERSTARTS']:
+                if values: self.config['RefinerStarts'] = max(1, int(values[0]))
+            elif key in ['REPAIR']:
+                if values: self.config['Repair'] = self._parse_flag(values[0], line_num, 'Repair')
+            elif key in ['REPAIRBUDGET']:
+                if values: self.config['RepairBudget'] = max(1, int(values[0]))
+            elif key in ['CACHEMEMORY']:
+                if values: self.config['CacheMemory'] = float(values[0])
+            elif key in ['CACHEENTRIES']:
+                if values: self.config['CacheEntries'] = int(values[0])
+            elif key in ['CACHEFILE']:
+                if values:
+                    self.config['CacheFile'] = values[0]
+                    logger.info(f"CacheFile: {self.config['CacheFile']}")
+            elif key in ['ENGINE']:
+                if values:
+                    engine = values[0].upper()
+                    if engine not in ('AUTO', 'TOOLKIT', 'NATIVE', 'TREE'):
+                        raise ValueError(f"Line {line_num}: Unknown hydraulic engine '{values[0]}'")
+                    self.config['Engine'] = engine
+                    logger.info(f"Engine: {engine}")
+            elif key in ['DOMINANCE']:
+                if values:
+                    self.config['Dominance'] = self._parse_flag(values[0], line_num, 'Dominance')
+                    logger.info(f"Dominance: {'YES' if self.config['Dominance'] else 'NO'}")
+            elif key in ['DOMINANCEVERIFY']:
+                if values: self.config['DominanceVerify'] = float(values[0])
+            elif key in ['TIGHTENBOUNDS']:
+                if values:
+                    self.config['TightenBounds'] = self._parse_flag(values[0], line_num, 'TightenBounds')
+                    logger.info(f"TightenBounds: {'YES' if self.config['TightenBounds'] else 'NO'}")
+            elif key in ['MINVELOCITY']:
+                if values: self.config['MinVelocity'] = float(values[0])
+            elif key in ['UHMODE']:
+                if values:
+                    mode = values[0].upper()
+                    if mode not in ('CLASSIC', 'FAST'):
+                        raise ValueError(f"Line {line_num}: Unknown UH mode '{values[0]}'")
+                    self.config['UHMode'] = mode
+                    logger.info(f"UHMode: {mode}")
+            elif key in ['WORKERS']:
+                if values:
+                    if int(values[0]) < 1:
+                        raise ValueError(f"Line {line_num}: Invalid Workers value '{values[0]}' (expected 1 or more)")
+                    self.config['Workers'] = int(values[0])
+                    logger.info(f"Workers: {self.config['Workers']}")
+
+    @staticmethod
+    def _parse_flag(value: str, line_num: int, name: str) -> bool:
+        """Parses a YES/NO option value."""
+        flag = value.upper()
+        if flag not in ('YES', 'NO', 'TRUE', 'FALSE', 'ON', 'OFF', '1', '0'):
+            raise ValueError(f"Line {line_num}: Invalid {name} value '{value}' (expected YES or NO)")
+        return flag in ('YES', 'TRUE', 'ON', '1')
+
+    def _open_store(self) -> Optional[Any]:
+        """Binds the persistent evaluation store set with the `CacheFile` option, if any.
+
+        Relative paths are resolved against the directory of the problem file.
+        """
+        if not self.config['CacheFile']:
+            return None
+        from .eval_store import EvaluationStore
+        path = Path(self.config['CacheFile'])
+        if not path.is_absolute():
+            path = self.problem_file.parent / path
+        return EvaluationStore(path, self.problem_key(), self.problem_file.stem)
+
+    def problem_key(self) -> str:
+        """Returns a hash identifying the problem definition.
+
+        It covers the .inp contents, the sized pipes, catalog and pressure
+        limits and the resolved hydraulic engine, i.e. everything that
+        determines the evaluation of a design (the engines agree only to their
+        convergence tolerance, so near-limit deficits differ between them).
+        """
+        h = hashlib.sha256(self.inp_file.read_bytes())
+        h.update(f"ENGINE {self.config['Engine']}\n".encode())
+        for pipe in self.pipes:
+            h.update(f"PIPE {pipe['id']} {pipe['series']}\n".encode())
+        for name in sorted(self.catalog):
+            for d, r, p in self.catalog[name]:
+                h.update(f"SIZE {name} {float(d)!r} {float(r)!r} {float(p)!r}\n".encode())
+        for node in self.nodes:
+            h.update(f"NODE {node['id']} {float(node['min_pressure'])!r}\n".encode())
+        return h.hexdigest()
 
     def _load_pipes(self, pipe_lines: List[Tuple[int, str]], parser: sp.SectionParser) -> None:
         """Parses the PIPES section."""
@@ -289,11 +472,12 @@ class Optimization:
         for line_num, content in pipe_lines:
             tokens = parser.line_to_tuple(content)
             pipe_id, series_name = tokens[0], tokens[1]
-            link_idx = et.ENgetlinkindex(pipe_id)
-            length = et.ENgetlinkvalue(link_idx, et.EN_LENGTH)
+            link_idx = self._et.ENgetlinkindex(pipe_id)
+            length = self._et.ENgetlinkvalue(link_idx, self._et.EN_LENGTH)
             data.append((link_idx, pipe_id, length, series_name))
 
         self.pipes = np.array(data, dt)
+        self._pipe_lengths = self.pipes['length'].astype(np.float64)
         logger.info(f"Loaded {len(self.pipes)} pipes for sizing.")
 
     def _load_pressures(self, pressure_lines: List[Tuple[int, str]], parser: sp.SectionParser) -> None:
@@ -303,10 +487,18 @@ class Optimization:
         for line_num, content in pressure_lines:
             tokens = parser.line_to_tuple(content)
             node_id, min_p = tokens[0], tokens[1]
-            node_idx = et.ENgetnodeindex(node_id)
+            node_idx = self._et.ENgetnodeindex(node_id)
             data.append((node_idx, node_id, float(min_p)))
 
         self.nodes = np.array(data, dtype=dt)
+        self._node_indices = [int(idx) for idx in self.nodes['node_idx']]
+        self._min_pressures = [float(p) for p in self.nodes['min_pressure']]
+        self._min_pressure_array = np.array(self._min_pressures, dtype=np.float64)
+
+        # Adaptive fast-fail order: the nodes that bind most often are checked first
+        self._node_violations = [0] * len(self.nodes)
+        self._node_check_order = list(range(len(self.nodes)))
+        self._node_rank = list(range(len(self.nodes)))
         logger.info(f"Loaded {len(self.nodes)} pressure constraints.")
 
     def _load_catalog(self, catalog_lines: List[Tuple[int, str]], parser: sp.SectionParser) -> None:
@@ -326,20 +518,207 @@ class Optimization:
             for name, data in raw_data.items()
         }
         logger.info(f"Loaded {len(self.catalog)} pipe series catalogs.")
+        self._build_catalog_tables()
 
-    def set_x(self, x: np.ndarray) -> None:
-        """Updates the hydraulic model with the new diameter indexes."""
-        self._current_x = x.astype(np.int32)
+    def _build_catalog_tables(self) -> None:
+        """Precomputes padded per-pipe catalog tables (cost, diameter, roughness).
+
+        Rows follow `self.pipes` and columns the catalog index, so the cost engine
+        and `set_x` work with plain array gathers instead of structured lookups.
+        """
+        n_pipes = len(self.pipes)
+        max_sizes = max((len(series) for series in self.catalog.values()), default=0)
+        self.cost_matrix = np.full((n_pipes, max_sizes), np.inf, dtype=np.float64)
+        self._diameter_table = np.full((n_pipes, max_sizes), np.nan, dtype=np.float64)
+        self._roughness_table = np.full((n_pipes, max_sizes), np.nan, dtype=np.float64)
         for i, pipe in enumerate(self.pipes):
-            link_idx = int(pipe['link_idx'])
             series = self.catalog[str(pipe['series'])]
-            size_idx = int(self._current_x[i])
+            n_sizes = len(series)
+            self.cost_matrix[i, :n_sizes] = float(pipe['length']) * series['price'].astype(np.float64)
+            self._diameter_table[i, :n_sizes] = series['diameter']
+            self._roughness_table[i, :n_sizes] = series['roughness']
+        self._pipe_rows = np.arange(n_pipes)
+        self._link_indices = [int(idx) for idx in self.pipes['link_idx']]
+
+        # Sizes currently pushed to the toolkit (-1 = unknown, i.e. as read from the .inp)
+        self._applied_x = np.full(n_pipes, -1, dtype=np.int32)
+        self._applied_roughness = np.full(n_pipes, np.nan, dtype=np.float64)
+
+    def _init_result_getters(self) -> None:
+        """Selects how hydraulic results are retrieved after each period.
+
+        EPANET builds that export the array getters (ENgetnodevalues /
+        ENgetlinkvalues, EPANET >= 2.3) are read with one call per period into a
+        preallocated buffer. Otherwise results are read with a loop over
+        pre-indexed toolkit handles.
+        """
+        self._bulk_nodes = None
+        self._bulk_links = None
+        lib = getattr(self._et, '_lib', None)
+        if not isinstance(lib, ctypes.CDLL):
+            return
+        try:
+            if hasattr(lib, 'ENgetnodevalues'):
+                n_total = int(self._et.ENgetcount(self._et.EN_NODECOUNT))
+                self._bulk_nodes = (lib.ENgetnodevalues, np.zeros(n_total, dtype=np.float32),
+                                    np.array(self._node_indices, dtype=np.intp) - 1)
+            if hasattr(lib, 'ENgetlinkvalues'):
+                n_total = int(self._et.ENgetcount(self._et.EN_LINKCOUNT))
+                self._bulk_links = (lib.ENgetlinkvalues, np.zeros(n_total, dtype=np.float32),
+                                    np.array(self._link_indices, dtype=np.intp) - 1)
+        except Exception:
+            self._bulk_nodes = None
+            self._bulk_links = None
+
+    def _init_engine(self) -> None:
+        """Selects the hydraulic engine used by `set_x` and `check`.
+
+        'TOOLKIT' always uses EPANET. 'NATIVE' solves the network with the
+        built-in GGA solver and 'TREE' with the exact evaluator for branched
+        networks; neither makes toolkit calls. 'AUTO' (default) picks 'TREE'
+        when the network is branched and 'TOOLKIT' otherwise. The toolkit model
+        is still used to validate and load the problem. `config['Engine']`
+        holds the engine finally selected.
+        """
+        self._native = None
+        self._tree = None
+        self._tree_model = None
+        self._head_to_pressure = None
+        engine = self.config['Engine']
+        if engine == 'TOOLKIT':
+            return
+
+        from .native_solver import NativeSolver
+        from .tree_evaluator import TreeEvaluator
+        try:
+            network = NativeSolver.from_inp(self.inp_file)
+            links = network.link_positions(self.pipes['id'])
+            nodes = network.node_positions(self.nodes['id'])
+            if engine == 'NATIVE':
+                self._native, self._native_links, self._native_nodes = network, links, nodes
+            elif engine == 'TREE' or TreeEvaluator.is_branched(network):
+                self._tree = TreeEvaluator(network, links, nodes, self._diameter_table, self._roughness_table)
+                engine = 'TREE'
+            else:
+                engine = 'TOOLKIT'
+        except Exception as e:
+            if engine != 'AUTO':
+                raise ValueError(f"Engine {engine} cannot be used with {self.inp_file.name}: {e}")
+            logger.debug(f"Branched network detection skipped: {e}")
+            engine = 'TOOLKIT'
+        if self.config['Engine'] == 'AUTO' and engine == 'TREE':
+            logger.info("Branched network detected: using the exact tree evaluator.")
+        self.config['Engine'] = engine
+
+    @property
+    def batch_capable(self) -> bool:
+        """Whether batches of designs are evaluated faster than one by one.
+
+        Batches pay off with the worker pool (`Workers` > 1) or with the
+        in-process `NATIVE`/`TREE` engines, which solve them as one stacked system.
+        """
+        return self.config['Workers'] > 1 or self.config['Engine'] in ('NATIVE', 'TREE')
+
+    def tree_model(self) -> Optional[Any]:
+        """Returns the `TreeEvaluator` of the network, or None if it is not branched.
 
+        The evaluator of the 'TREE' engine is reused; with other engines it is
+        built on demand (the engine in use is not changed).
+        """
+        if self._tree is None and self._tree_model is None:
+            from .native_solver import NativeSolver
+            from .tree_evaluator import TreeEvaluator
             try:
-                et.ENsetlinkvalue(link_idx, et.EN_DIAMETER, float(series[size_idx]['diameter']))
-                et.ENsetlinkvalue(link_idx, et.EN_ROUGHNESS, float(series[size_idx]['roughness']))
-            except Exception:
-                pass
+                network = NativeSolver.from_inp(self.inp_file)
+                if TreeEvaluator.is_branched(network):
+                    self._tree_model = TreeEvaluator(
+                        network, network.link_positions(self.pipes['id']),
+                        network.node_positions(self.nodes['id']),
+                        self._diameter_table, self._roughness_table)
+            except Exception as e:
+                logger.debug(f"No tree model for {self.inp_file.name}: {e}")
+            if self._tree_model is None:
+                self._tree_model = False
+        return self._tree if self._tree is not None else (self._tree_model or None)
+
+    @staticmethod
+    def _read_bulk(getter: Tuple[Any, np.ndarray, np.ndarray], prop: int) -> Optional[np.ndarray]:
+        """Reads one property for every node or link through an array getter."""
+        func, buffer, positions = getter
+        ierr = func(prop, buffer.ctypes.data_as(ctypes.POINTER(ctypes.c_float)))
+        if ierr != 0:
+            return None
+        return buffer[positions].astype(np.float64)
+
+    def _read_pressures(self) -> np.ndarray:
+        """Returns the current pressures of the constrained nodes."""
+        if self._bulk_nodes is not None:
+            values = self._read_bulk(self._bulk_nodes, self._et.EN_PRESSURE)
+            if values is not None:
+                return values
+        getter, prop = self._et.ENgetnodevalue, self._et.EN_PRESSURE
+        return np.fromiter((getter(i, prop) for i in self._node_indices),
+                           dtype=np.float64, count=len(self._node_indices))
+
+    def _read_headlosses(self) -> np.ndarray:
+        """Returns the current headlosses of the sized pipes."""
+        return self._read_link_values(self._et.EN_HEADLOSS)
+
+    def _read_link_values(self, prop: int) -> np.ndarray:
+        """Returns the current values of a link property for the sized pipes."""
+        if self._bulk_links is not None:
+            values = self._read_bulk(self._bulk_links, prop)
+            if values is not None:
+                return values
+        getter = self._et.ENgetlinkvalue
+        return np.fromiter((getter(i, prop) for i in self._link_indices),
+                           dtype=np.float64, count=len(self._link_indices))
+
+    def _pressures_ok(self) -> bool:
+        """Fast-fail pressure check for the current period."""
+        if self._bulk_nodes is not None:
+            period_deficits = self._min_pressure_array - self._read_pressures()
+            violated = np.flatnonzero(period_deficits > 0)
+            for i in violated.tolist():
+                self._record_violation(i)
+            return violated.size == 0
+
+        getter, prop = self._et.ENgetnodevalue, self._et.EN_PRESSURE
+        for i in self._node_check_order:
+            if self._min_pressures[i] - getter(self._node_indices[i], prop) > 0:
+                self._record_violation(i)
+                return False
+        return True
+
+    def set_x(self, x: np.ndarray) -> None:
+        """Updates the hydraulic model with the new diameter indexes.
+
+        Only the pipes whose index differs from the design already loaded in the
+        toolkit are pushed, and roughness is only rewritten when it changes, so
+        the number of toolkit calls scales with the size of the move.
+        """
+        self._current_x = np.asarray(x).astype(np.int32)
+        if self._tree is not None:
+            return
+        if self._native is not None:
+            self._native.set_pipes(self._native_links,
+                                   self._diameter_table[self._pipe_rows, self._current_x],
+                                   self._roughness_table[self._pipe_rows, self._current_x])
+            return
+        changed = np.flatnonzero(self._current_x != self._applied_x)
+        if changed.size == 0:
+            return
+
+        sizes = self._current_x[changed]
+        diameters = self._diameter_table[changed, sizes]
+        roughness = self._roughness_table[changed, sizes]
+        for i, size_idx, d, r in zip(changed.tolist(), sizes.tolist(), diameters.tolist(), roughness.tolist()):
+            link_idx = self._link_indices[i]
+            self._et.ENsetlinkvalue(link_idx, self._et.EN_DIAMETER, d)
+            if r != self._applied_roughness[i]:
+                self._et.ENsetlinkvalue(link_idx, self._et.EN_ROUGHNESS, r)
+                self._applied_roughness[i] = r
+            self._applied_x[i] = size_idx
 
     def get_x(self) -> np.ndarray:
         """Returns a copy of the current vector of diameter indexes."""
@@ -348,63 +727,345 @@ class Optimization:
     def check(self, mode: str = 'TF') -> Union[bool, Tuple[bool, np.ndarray], np.ndarray]:
         """Checks pressure constraints across all time steps.
 
+        In 'TF' mode the check fails fast: nodes are visited in order of how often
+        they have been binding so far, and the extended period run is abandoned at
+        the first pressure violation.
+
         Args:
             mode: 'TF' for boolean status, 'UH' for status and sorted headlosses,
-                  'PD' for nodal pressure deficits.
+                  'PD' for nodal pressure deficits, 'VEL' for the maximum velocity
+                  of each sized pipe.
 
         Returns:
             Depending on mode: bool, (bool, np.ndarray), or np.ndarray.
         """
-        deficits = np.full(len(self.nodes), -1e10, dtype=np.float32) if mode == 'PD' else None
+        if self._native is not None or self._tree is not None:
+            return self._check_steady(mode)
+
+        deficits = np.full(len(self.nodes), -1e10, dtype=np.float32) if mode in ('PD', 'UH') else None
         max_hls = np.zeros(len(self.pipes), dtype=np.float32) if mode == 'UH' else None
+        max_vels = np.zeros(len(self.pipes), dtype=np.float64) if mode == 'VEL' else None
         overall_status = True
 
         try:
-            et.ENinitH(0)
+            self._et.ENinitH(0)
             while True:
-                et.ENrunH()
+                self._et.ENrunH()
                 self.simulation_cycles += 1
 
-                # Check nodal pressures
-                for i, node in enumerate(self.nodes):
-                    calculated_p = et.ENgetnodevalue(int(node['node_idx']), et.EN_PRESSURE)
-                    required_p = float(node['min_pressure'])
-                    deficit = required_p - calculated_p
-
-                    if deficit > 0:
+                if mode == 'TF':
+                    if not self._pressures_ok():
                         overall_status = False
+                        break
+                else:
+                    # Check nodal pressures
+                    period_deficits = self._min_pressure_array - self._read_pressures()
+                    if np.any(period_deficits > 0):
+                        overall_status = False
+                    if deficits is not None:
+                        np.maximum(deficits, period_deficits, out=deficits, casting='same_kind')
 
-                    if mode == 'PD' and deficits is not None:
-                        if deficits[i] < deficit:
-                            deficits[i] = deficit
-
-                # Track link headlosses for UH mode
-                if mode == 'UH' and max_hls is not None:
-                    for i in range(len(self.pipes)):
-                        hl = et.ENgetlinkvalue(int(self.pipes[i]['link_idx']), et.EN_HEADLOSS)
-                        gradient = abs(hl) / float(self.pipes[i]['length'])
-                        if max_hls[i] < gradient:
-                            max_hls[i] = gradient
+                    # Track link headlosses for UH mode
+                    if max_hls is not None:
+                        gradients = np.abs(self._read_headlosses()) / self._pipe_lengths
+                        np.maximum(max_hls, gradients, out=max_hls, casting='same_kind')
+                    if max_vels is not None:
+                        np.maximum(max_vels, np.abs(self._read_link_values(self._et.EN_VELOCITY)), out=max_vels)
 
-                if et.ENnextH() == 0:
+                if self._et.ENnextH() == 0:
                     break
         except Exception:
             pass
 
         if mode == 'UH':
+            self._uh_deficits = deficits
+            self._uh_gradients = max_hls
             sorted_indices = np.argsort(max_hls)[::-1]
             return overall_status, sorted_indices
         if mode == 'PD':
             return deficits if deficits is not None else np.array([])
+        if mode == 'VEL':
+            return max_vels
         return overall_status
 
+    def _check_steady(self, mode: str) -> Union[bool, Tuple[bool, np.ndarray], np.ndarray]:
+        """`check` for the in-process engines: a single steady-state solution, no toolkit calls."""
+        if self._tree is not None:
+            x = self._current_x[np.newaxis, :]
+            pressures = self._tree.pressures(x)[0]
+            headlosses = lambda: self._tree.headlosses(x)[0]
+            velocities = lambda: self._tree.velocities(x)[0]
+        else:
+            self._native.solve()
+            pressures = self._native.pressures(self._native_nodes)
+            headlosses = lambda: self._native.headlosses(self._native_links)
+            velocities = lambda: self._native.velocities(self._native_links)
+        self.simulation_cycles += 1
+        deficits = self._min_pressure_array - pressures
+        status = not np.any(deficits > 0)
+        if mode == 'UH':
+            self._uh_deficits = deficits.astype(np.float32)
+            gradients = (headlosses() / self._pipe_lengths).astype(np.float32)
+            self._uh_gradients = gradients
+            return status, np.argsort(gradients)[::-1]
+        if mode == 'PD':
+            return deficits.astype(np.float32)
+        if mode == 'VEL':
+            return velocities()
+        return status
+
+    def _record_violation(self, i: int) -> None:
+        """Counts a violation at constrained node `i` and moves it up the check order."""
+        counts = self._node_violations
+        order = self._node_check_order
+        counts[i] += 1
+        pos = self._node_rank[i]
+        while pos > 0 and counts[order[pos - 1]] < counts[i]:
+            order[pos] = order[pos - 1]
+            self._node_rank[order[pos]] = pos
+            pos -= 1
+        order[pos] = i
+        self._node_rank[i] = pos
+
+    def max_deficit(self, x: np.ndarray) -> float:
+        """Simulates a design and returns its maximum nodal pressure deficit."""
+        self.set_x(x)
+        deficits = self.check(mode='PD')
+        return float(np.max(deficits)) if len(deficits) else 0.0
+
+    def hydraulic_state(self, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Simulates a design and returns its sensitivity data.
+
+        Returns:
+            A tuple (slack, headlosses): the pressure margin of each constrained
+            node (negative when violated) and the head loss of each sized pipe
+            expressed in pressure units (worst period for extended runs).
+        """
+        self.set_x(x)
+        self.check(mode='UH')
+        if self._head_to_pressure is None:
+            us_units = self._et.ENgetflowunits() < self._et.EN_LPS
+            self._head_to_pressure = 0.4333 if us_units else 1.0  # psi per ft of water
+        slack = -np.asarray(self._uh_deficits, dtype=np.float64)
+        headlosses = np.asarray(self._uh_gradients, dtype=np.float64) * self._pipe_lengths * self._head_to_pressure
+        return slack, headlosses
+
+    def evaluate(self, x: np.ndarray, exact: bool = False) -> Tuple[float, float]:
+        """Evaluates a single design through the shared evaluation cache.
+
+        Args:
+            x: Vector of diameter indexes.
+            exact: If True, the exact maximum pressure deficit is required. Otherwise
+                uncached designs are answered by the dominance index (if enabled) or
+                checked with the fast-fail 'TF' mode, and the returned deficit only
+                carries feasibility (0.0 feasible, inf infeasible).
+
+        Returns:
+            A tuple (cost, max_deficit); the design is feasible when max_deficit <= 0.
+        """
+        cached = self.eval_cache.get(x, exact)
+        if cached is not None:
+            return cached
+
+        x = np.asarray(x).astype(np.int32)
+        cost = float(self.cost_many(x[np.newaxis, :])[0])
+        if not exact and self.dominance is not None:
+            inferred = self.dominance.infer(x)
+            if inferred is not None:
+                return cost, (0.0 if inferred else np.inf)
+        if exact:
+            max_deficit = self.max_deficit(x)
+        else:
+            self.set_x(x)
+            max_deficit = 0.0 if self.check(mode='TF') else np.inf
+        self.record_evaluation(x, max_deficit, exact, cost)
+        return cost, max_deficit
+
+    def record_evaluation(self, x: np.ndarray, max_deficit: float, exact: bool = True,
+                          cost: Optional[float] = None) -> None:
+        """Stores the result of a simulation made outside `evaluate` (cache and dominance index)."""
+        if cost is None:
+            cost = float(self.cost_many(np.asarray(x)[np.newaxis, :])[0])
+        self.eval_cache.put(x, cost, max_deficit, exact)
+        if self.dominance is not None:
+            self.dominance.add(x, max_deficit <= 0)
+
+    def supply_graph(self) -> Any:
+        """Returns the network topology used by `repair`, built on first use."""
+        if self._supply_graph is None:
+            from .repair import SupplyGraph
+            self._supply_graph = SupplyGraph(self)
+        return self._supply_graph
+
+    def repair(self, x: np.ndarray, max_sims: Optional[int] = None) -> np.ndarray:
+        """Repairs an infeasible design by upsizing the pipes that feed its deficient nodes.
+
+        Args:
+            x: Vector of diameter indexes (continuous values are rounded).
+            max_sims: Simulation budget (default: the `RepairBudget` option).
+
+        Returns:
+            np.ndarray: The repaired design; see `repair.repair_design`.
+        """
+        from .repair import repair_design
+        budget = self.config['RepairBudget'] if max_sims is None else max_sims
+        return repair_design(self, x, budget)
+
+    def infer_feasible(self, X: np.ndarray) -> np.ndarray:
+        """Flags the designs whose feasibility is implied by the dominance index.
+
+        Objectives that only need the deficit of infeasible designs (penalty
+        methods) can use the cost of the flagged designs without simulating them.
+
+        Args:
+            X: A design or a (pop, n_pipes) matrix of diameter indexes.
+
+        Returns:
+            np.ndarray: (pop,) boolean mask, all False when the index is disabled.
+        """
+        X = np.atleast_2d(np.asarray(X))
+        if self.dominance is None:
+            return np.zeros(len(X), dtype=bool)
+        return np.array([self.dominance.infer(x, feasible_only=True) is True for x in X], dtype=bool)
+
+    def evaluate_many(self, X: np.ndarray, exact: bool = True) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Evaluates a batch of designs.
+
+        Cached designs are answered from the shared evaluation cache and repeated
+        rows are simulated once. With more than one configured worker the
+        remaining simulations are distributed over the evaluation pool.
+
+        Args:
+            X: (pop, n_pipes) matrix of diameter indexes.
+            exact: If False, fast-fail cache entries and the dominance index (if
+                enabled) may answer, and those deficits only carry feasibility
+                (0.0 feasible, inf infeasible), as in `evaluate`.
+
+        Returns:
+            A tuple (costs, max_deficits, feasible) of (pop,) arrays.
+        """
+        X = np.atleast_2d(np.asarray(X)).astype(np.int32)
+        costs = self.cost_many(X)
+        max_deficits = np.empty(len(X), dtype=np.float64)
+
+        pending: Dict[bytes, List[int]] = {}
+        for j, x in enumerate(X):
+            cached = self.eval_cache.get(x, exact)
+            if cached is not None:
+                max_deficits[j] = cached[1]
+                continue
+            if not exact and self.dominance is not None:
+                inferred = self.dominance.infer(x)
+                if inferred is not None:
+                    max_deficits[j] = 0.0 if inferred else np.inf
+                    continue
+            pending.setdefault(self.eval_cache.key(x), []).append(j)
+
+        if pending:
+            rows = [indices[0] for indices in pending.values()]
+            simulated = self._simulate_many(X[rows])
+            for indices, max_deficit in zip(pending.values(), simulated):
+                max_deficits[indices] = max_deficit
+                self.eval_cache.put(X[indices[0]], costs[indices[0]], max_deficit)
+                if self.dominance is not None:
+                    self.dominance.add(X[indices[0]], max_deficit <= 0)
+
+        return costs, max_deficits, max_deficits <= 0
+
+    def _simulate_many(self, X: np.ndarray) -> np.ndarray:
+        """Simulates a batch of designs, in parallel when workers are configured.
+
+        With the native engine the whole batch is solved in-process as one
+        stacked system instead, and with the tree evaluator it is evaluated
+        directly.
+        """
+        if self._tree is not None:
+            self.simulation_cycles += len(X)
+            if not len(self.nodes):
+                return np.zeros(len(X), dtype=np.float64)
+            return (self._min_pressure_array - self._tree.pressures(X)).max(axis=1)
+        if self._native is not None:
+            return self._native_max_deficits(X)
+        if self.config['Workers'] > 1 and len(X) > 1:
+            try:
+                max_deficits, cycles = self._get_evaluator().max_deficits(X)
+                self.simulation_cycles += cycles
+                return max_deficits
+            except Exception as e:
+                logger.warning(f"Parallel evaluation failed ({e}); continuing serially.")
+                self.config['Workers'] = 1
+                self._close_evaluator()
+        return np.array([self.max_deficit(x) for x in X], dtype=np.float64)
+
+    def _native_max_deficits(self, X: np.ndarray) -> np.ndarray:
+        """Maximum pressure deficits of a batch of designs from batched native solves.
+
+        Designs whose solve did not converge get an infinite deficit.
+        """
+        max_deficits = np.zeros(len(X), dtype=np.float64)
+        for start in range(0, len(X), NATIVE_BATCH_SIZE):
+            chunk = X[start:start + NATIVE_BATCH_SIZE]
+            heads, converged = self._native.solve_batch(self._native_links,
+                                                        self._diameter_table[self._pipe_rows, chunk],
+                                                        self._roughness_table[self._pipe_rows, chunk])
+            if len(self.nodes):
+                deficits = self._min_pressure_array - self._native.pressures(self._native_nodes, heads)
+                max_deficits[start:start + len(chunk)] = deficits.max(axis=1)
+            # Pressures of unconverged solves are meaningless: those designs are infeasible
+            if not converged.all():
+                logger.debug(f"[NATIVE] {int((~converged).sum())} designs did not converge.")
+                max_deficits[start:start + len(chunk)][~converged] = np.inf
+        self.simulation_cycles += len(X)
+        return max_deficits
+
+    def _get_evaluator(self):
+        """Returns the worker pool, starting it on first use."""
+        if self._evaluator is None:
+            from .evaluator import ParallelEvaluator, ThreadEvaluator
+            # Project handles allow in-process models; the legacy toolkit needs processes
+            evaluator_class = ThreadEvaluator if self.backend == 'PROJECT' else ParallelEvaluator
+            self._evaluator = evaluator_class(self.problem_file, self.config['Workers'])
+        return self._evaluator
+
+    def _close_evaluator(self) -> None:
+        """Stops the worker pool if it was started."""
+        if self._evaluator is not None:
+            self._evaluator.close()
+            self._evaluator = None
+
     def get_cost(self) -> float:
         """Calculates total network cost based on current sizing."""
-        total = 0.0
-        x = self.get_x()
-        for i, pipe in enumerate(self.pipes):
-            total += float(pipe['length']) * float(self.catalog[str(pipe['series'])][int(x[i])]['price'])
-        return total
+        return float(self.cost_many(self._current_x[np.newaxis, :])[0])
+
+    def cost_many(self, X: np.ndarray) -> np.ndarray:
+        """Prices a batch of candidate designs with a single gather-and-sum.
+
+        Args:
+            X: (pop, n_pipes) matrix of diameter indexes.
+
+        Returns:
+            np.ndarray: (pop,) vector with the total cost of each design.
+        """
+        X = np.asarray(X, dtype=np.intp)
+        return self.cost_matrix[self._pipe_rows, X].sum(axis=1)
+
+    def catalog_diameters(self) -> np.ndarray:
+        """Returns the padded (n_pipes, max_sizes) diameters of every pipe's series (NaN past its end)."""
+        return self._diameter_table.copy()
+
+    def tighten_bounds(self) -> None:
+        """Shrinks `lbound`/`ubound` to the sizes that can appear in a feasible design.
+
+        See `preprocess.tighten_bounds`; the `MinVelocity` option adds upper bounds.
+        """
+        from .preprocess import tighten_bounds
+        start_time = perf_counter()
+        cycles = self.simulation_cycles
+        before = int((self.ubound - self.lbound).sum())
+        self.lbound, self.ubound = tighten_bounds(self, self.config['MinVelocity'])
+        after = int((self.ubound - self.lbound).sum())
+        logger.info(f"[BOUNDS] Search box reduced from {before} to {after} size steps "
+                    f"({self.simulation_cycles - cycles} simulations, {perf_counter() - start_time:.2f}s)")
 
     def solve(self) -> Optional[np.ndarray]:
         """Executes the two-stage optimization pipeline: UH+FLS-H foundation,
@@ -413,18 +1074,34 @@ class Optimization:
         self.simulation_cycles = 0
         logger.info(f"Optimization pipeline started at: {strftime('%H:%M:%S', localtime())}")
 
-        # --- STAGE 1: Mandatory Foundation (UH + LS) ---
-        logger.info("\n" + ">>> STAGE 1: HEURISTIC FOUNDATION (UH + FLS-H) <<<")
+        if self.config['TightenBounds']:
+            self.tighten_bounds()
+
+        # --- STAGE 1: Mandatory Foundation (UH + LS, or exact MILP) ---
+        solution = None
+        stage1_name = 'UH'
         start_time_s1 = perf_counter()
-        
-        # 1a. UH Heuristic
-        solution = self._solve_uh()
+        if self.use_milp:
+            logger.info("\n" + ">>> STAGE 1: EXACT FOUNDATION (MILP) <<<")
+            from . import milp_solver
+            solution = milp_solver.solve_milp(self)
+            if solution is not None:
+                stage1_name = 'MILP'
+                self.algorithm = ALGORITHM_MILP
+            else:
+                logger.warning("MILP did not provide a design; falling back to UH + FLS-H.")
+
         if solution is None:
-            logger.error("Stage 1 failed: Unit Headloss Heuristic could not find a solution.")
-            return None
-        
-        # 1b. Refinement (FLS-H) - always applied
-        solution = self._apply_refinement(solution)
+            logger.info("\n" + ">>> STAGE 1: HEURISTIC FOUNDATION (UH + FLS-H) <<<")
+
+            # 1a. UH Heuristic
+            solution = self._solve_uh()
+            if solution is None:
+                logger.error("Stage 1 failed: Unit Headloss Heuristic could not find a solution.")
+                return None
+
+            # 1b. Refinement (FLS-H) - always applied
+            solution = self._apply_refinement(solution)
         
         duration_s1 = perf_counter() - start_time_s1
         self.set_x(solution)
@@ -433,14 +1110,14 @@ class Optimization:
         logger.info(f"Stage 1 Complete | Cost: {cost_s1:.2f} | Time: {duration_s1:.2f}s")
         
         self.results.append({
-            'Algorithm': 'UH',
+            'Algorithm': stage1_name,
             'Attempt': 1,
             'Success': "YES",
             'Time (s)': f"{duration_s1:.2f}",
             'Simulations': self.simulation_cycles,
             'Cost': f"{cost_s1:.2f}"
         })
-        self._save_scn_result("UH")
+        self._save_scn_result(stage1_name)
         
         overall_best_solution = solution.copy()
         overall_best_cost = cost_s1
@@ -452,7 +1129,7 @@ class Optimization:
             alg_names = {
                 ALGORITHM_DE: 'DE', ALGORITHM_DA: 'DA', ALGORITHM_NSGA2: 'NSGA2',
                 ALGORITHM_DIRECT: 'DIRECT', ALGORITHM_MOEAD: 'MOEAD',
-                ALGORITHM_MACO: 'MACO', ALGORITHM_PSO: 'PSO'
+                ALGORITHM_MACO: 'MACO', ALGORITHM_PSO: 'PSO', ALGORITHM_IDE: 'IDE'
             }
 
             for alg_id in self.algorithms:
@@ -464,6 +1141,7 @@ class Optimization:
                     
                     start_time = perf_counter()
                     self.simulation_cycles = 0
+                    self.timed_out = False
                     self.algorithm = alg_id
                     
                     # Run metaheuristic seeded with the current best solution
@@ -472,6 +1150,9 @@ class Optimization:
                     if alg_id in [ALGORITHM_DE, ALGORITHM_DA, ALGORITHM_DIRECT]:
                         from . import scipy_solver
                         meta_solution = scipy_solver.solve_scipy(self, alg_id, initial_x=overall_best_solution)
+                    elif alg_id == ALGORITHM_IDE:
+                        from . import ide_solver
+                        meta_solution = ide_solver.solve_ide(self, initial_x=overall_best_solution)
                     elif alg_id in [ALGORITHM_NSGA2, ALGORITHM_MOEAD, ALGORITHM_MACO, ALGORITHM_PSO]:
                         from . import pygmo_solver
                         sol_f, sol_x = (None, None)
@@ -506,6 +1187,10 @@ class Optimization:
                             'Cost': f"{meta_cost:.2f}"
                         })
                         self._save_scn_result(alg_name)
+                        if self.timed_out and attempt < self.max_retries:
+                            # An interrupted run is resumed from its best design
+                            logger.info("      [RESUME] Time limit reached; the next attempt continues from the best design.")
+                            continue
                         break
                     else:
                         self.results.append({
@@ -525,6 +1210,8 @@ class Optimization:
             logger.info("\n>>> STAGE 2 Skipped: No global exploration requested <<<")
 
         self._print_summary()
+        if self.eval_cache.store is not None:
+            self.eval_cache.store.flush()
         self.set_x(overall_best_solution)
         self._handle_success(overall_best_solution)
         
@@ -567,12 +1254,18 @@ class Optimization:
             row = (f"{name:<14} {stats['tries']:<7} {stats['success']:<8} "
                    f"{stats['time']:>10.2f} {stats['sims']:>10} {cost_str:>15}")
             logger.info(row)
+        logger.info("-" * 80)
+        logger.info(self.eval_cache.summary())
+        if self.dominance is not None:
+            logger.info(self.dominance.summary())
         logger.info("=" * 80 + "\n")
 
     def _solve_uh(self) -> Optional[np.ndarray]:
         """Unit Headloss Heuristic logic."""
+        if self.config['UHMode'] == 'FAST':
+            return self._solve_uh_fast()
         logger.info("*** UNIT HEADLOSS HEURISTIC ***")
-        self.set_x(np.zeros(self.dimension, dtype=np.int32))
+        self.set_x(self.lbound.copy())
         while True:
             status, sorted_hls = self.check(mode='UH')
             if status:
@@ -589,14 +1282,71 @@ class Optimization:
             if not expanded:
                 return None
 
+    def _solve_uh_fast(self) -> Optional[np.ndarray]:
+        """Accelerated Unit Headloss Heuristic.
+
+        Each simulation upgrades a batch of the highest-gradient pipes instead of
+        one; the batch shrinks with the maximum pressure deficit, down to one
+        pipe near feasibility. The last batch, which usually overshoots, is then
+        trimmed by bisection: its upgrades are kept in gradient order up to the
+        shortest prefix that is feasible.
+        """
+        logger.info("*** UNIT HEADLOSS HEURISTIC (FAST) ***")
+        x = self.lbound.copy()
+        reference = float(self._min_pressure_array.max()) if len(self.nodes) else 1.0
+        reference = reference if reference > 0 else 1.0
+        max_batch = max(1, int(UH_MAX_BATCH_FRACTION * self.dimension))
+        self.set_x(x)
+        previous = None
+        upgraded = np.empty(0, dtype=np.intp)
+        while True:
+            status, sorted_hls = self.check(mode='UH')
+            if status:
+                break
+            previous = x.copy()
+            max_deficit = float(self._uh_deficits.max())
+            batch = int(np.clip(round(max_deficit / reference * max_batch), 1, max_batch))
+            upgradable = sorted_hls[x[sorted_hls] < self.ubound[sorted_hls]]
+            if not upgradable.size:
+                return None
+            upgraded = upgradable[:batch]
+            x = x.copy()
+            x[upgraded] += 1
+            self.set_x(x)
+
+        # Trim the last batch: smallest feasible prefix of its upgrades
+        if previous is not None and len(upgraded) > 1:
+            lo, hi = 0, len(upgraded)  # prefix lo is infeasible, prefix hi feasible
+            while hi - lo > 1:
+                mid = (lo + hi) // 2
+                candidate = previous.copy()
+                candidate[upgraded[:mid]] += 1
+                if self.evaluate(candidate)[1] <= 0:
+                    hi = mid
+                else:
+                    lo = mid
+            x = previous.copy()
+            x[upgraded[:hi]] += 1
+            self.set_x(x)
+        return x.copy()
 
     def _apply_refinement(self, solution: np.ndarray) -> np.ndarray:
         """Applies FLS-H refined local search to the current solution."""
         config = {
             'max_iter': self.config['RefinerIters'],
             'acceptance_threshold': self.config['RefinerWorsening'],
-            'neighborhood_size': self.config['RefinerNeighbors']
+            'neighborhood_size': self.config['RefinerNeighbors'],
+            'mode': self.config['RefinerMode'],
+            'strategy': self.config['RefinerStrategy'],
+            'tabu_tenure': self.config['RefinerTabu'],
+            'adaptive': self.config['RefinerAdaptive'],
+            'patience': self.config['RefinerPatience'],
+            'repair_budget': self.config['RepairBudget'] if self.config['Repair'] else 0,
+            'batched': self.batch_capable
         }
+        if self.config['RefinerStarts'] > 1 and config['mode'] != 'SWEEP':
+            from .multistart import refine_multi_start
+            return refine_multi_start(self, solution, config, self.config['RefinerStarts'])
         
         refiner = LocalRefiner(self, config)
         refined_solution = refiner.refine(solution)
@@ -645,7 +1395,9 @@ class Optimization:
             ALGORITHM_DIRECT: 'DIRECT',
             ALGORITHM_MOEAD: 'MOEAD',
             ALGORITHM_MACO: 'MACO',
-            ALGORITHM_PSO: 'PSO'
+            ALGORITHM_PSO: 'PSO',
+            ALGORITHM_MILP: 'MILP',
+            ALGORITHM_IDE: 'IDE'
         }.get(self.algorithm, 'Optimized')
 
         # Save final result to SCN file
@@ -669,10 +1421,12 @@ class Optimization:
         logger.info("*" * 56 + "\n")
 
     def close(self) -> None:
-        """Safely closes the EPANET toolkit."""
+        """Safely closes the EPANET toolkit, the evaluation workers and the evaluation store."""
+        self._close_evaluator()
+        self.eval_cache.close()
         try:
-            et.ENcloseH()
-            et.ENclose()
+            self._et.ENcloseH()
+            self._et.ENclose()
         except Exception:
             pass
 
@@ -681,17 +1435,31 @@ def main(argv: Optional[List[str]] = None) -> None:
     """Entry point for the PPNO command-line tool."""
     if argv is None:
         argv = sys.argv
-    if len(argv) < 2 or argv[1] in ['-h', '--help']:
-        print("Usage: ppno <problem_file.ext>")
+    usage = "Usage: ppno <problem_file.ext> [--workers N]"
+    args = list(argv[1:])
+    if not args or args[0] in ['-h', '--help']:
+        print(usage)
         sys.exit(0)
 
+    workers = None
+    if '--workers' in args:
+        pos = args.index('--workers')
+        try:
+            workers = int(args[pos + 1])
+        except (IndexError, ValueError):
+            workers = 0
+        del args[pos:pos + 2]
+        if workers < 1 or not args:
+            print(usage)
+            sys.exit(1)
+
     logger.info("=" * 80)
     logger.info(" PRESSURIZED PIPE NETWORK OPTIMIZER ")
     logger.info("=" * 80)
 
     opt = None
     try:
-        opt = Optimization(argv[1])
+        opt = Optimization(args[0], workers=workers)
         solution = opt.solve()
         if solution is not None:
             opt.pretty_print(solution)
@@ -0,0 +1,107 @@
+"""Bound tightening before the search.
+
+Every algorithm searches the box `lbound <= x <= ubound`, by default the whole
+catalog of every pipe. In a network fed by a single source, pressures grow with
+the diameters, so a pipe size that is infeasible with all the other pipes at
+their largest size can never be part of a feasible design, which gives a
+per-pipe lower bound. With several sources a larger pipe can shift supply
+between them and lower some pressures, so this bound is not applied.
+Optionally, sizes that would carry the pipe flow below a minimum velocity are
+discarded as oversized, which gives a (heuristic) upper bound.
+"""
+
+import logging
+from typing import Optional, Tuple
+
+import numpy as np
+
+# Logger configuration
+logger = logging.getLogger(__name__)
+
+
+def minimum_sizes(opt_instance) -> Optional[np.ndarray]:
+    """Finds, for every pipe, the smallest size that is feasible with the other pipes at maximum.
+
+    The bisections of all pipes advance together: each round evaluates one
+    design per unresolved pipe with `evaluate_many`, so the rounds are batched
+    (and parallel with workers or the in-process engines).
+
+    Returns:
+        Optional[np.ndarray]: The per-pipe minimum sizes, or None if the design
+                              with every pipe at maximum is infeasible.
+    """
+    upper = opt_instance.ubound.astype(np.int32)
+    if not opt_instance.evaluate_many(upper[np.newaxis, :])[2][0]:
+        return None
+
+    lo = opt_instance.lbound.astype(np.int32).copy()
+    hi = upper.copy()  # smallest size known to be feasible
+    while True:
+        open_pipes = np.flatnonzero(lo < hi)
+        if not open_pipes.size:
+            return hi
+        mid = (lo[open_pipes] + hi[open_pipes]) // 2
+        X = np.tile(upper, (open_pipes.size, 1))
+        X[np.arange(open_pipes.size), open_pipes] = mid
+        feasible = opt_instance.evaluate_many(X)[2]
+        hi[open_pipes[feasible]] = mid[feasible]
+        lo[open_pipes[~feasible]] = mid[~feasible] + 1
+
+
+def velocity_sizes(opt_instance, lbound: np.ndarray, min_velocity: float) -> np.ndarray:
+    """Finds, for every pipe, the largest size worth considering under a velocity floor.
+
+    Flows are taken from the designs at the lower and upper bounds, the larger
+    of the two per pipe, and rescaled to every catalog size as if the flow did
+    not change with the size (exact in branched networks). Sizes above the
+    first one that carries that flow below `min_velocity` are oversized.
+
+    Returns:
+        np.ndarray: The per-pipe upper sizes, never below `lbound`.
+    """
+    rows = np.arange(opt_instance.dimension)
+    diameters = opt_instance.catalog_diameters()
+    flows = np.zeros(opt_instance.dimension)
+    for x in (lbound, opt_instance.ubound):
+        opt_instance.set_x(x)
+        # Velocity x area is proportional to the flow
+        flows = np.maximum(flows, opt_instance.check(mode='VEL') * diameters[rows, x] ** 2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        velocities = flows[:, np.newaxis] / diameters ** 2
+    slow = velocities <= min_velocity  # NaN (sizes out of the series) compares False
+    sizes = np.where(slow.any(axis=1), slow.argmax(axis=1), opt_instance.ubound)
+    return np.clip(sizes, lbound, opt_instance.ubound).astype(np.int32)
+
+
+def tighten_bounds(opt_instance, min_velocity: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Computes tightened search bounds.
+
+    Args:
+        opt_instance: An instance of the Optimization class.
+        min_velocity: Optional velocity floor (m/s or ft/s, as the .inp units)
+            used to cap oversized pipes.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The new (lbound, ubound). The current
+        bounds are returned unchanged when the largest design is infeasible.
+        Lower bounds are only computed for single-source networks.
+    """
+    lbound, ubound = opt_instance.lbound.copy(), opt_instance.ubound.copy()
+    if opt_instance.n_sources == 1:
+        sizes = minimum_sizes(opt_instance)
+        if sizes is None:
+            logger.warning("[BOUNDS] The design with every pipe at maximum is infeasible; bounds kept.")
+            return lbound, ubound
+        lbound = np.maximum(lbound, sizes).astype(np.int32)
+    else:
+        logger.info(f"[BOUNDS] {opt_instance.n_sources} sources: pressures are not monotone "
+                    f"in the diameters, lower bounds skipped.")
+
+    if min_velocity:
+        capped = velocity_sizes(opt_instance, lbound, min_velocity)
+        # The capped box must still contain a feasible design
+        if opt_instance.evaluate_many(capped[np.newaxis, :])[2][0]:
+            ubound = capped
+        else:
+            logger.warning("[BOUNDS] Velocity-based upper bounds leave no feasible design; not applied.")
+    return lbound, ubound
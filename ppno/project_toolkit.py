@@ -0,0 +1,165 @@
+"""Project-handle backend for the EPANET 2.2 toolkit.
+
+The legacy `EN*` functions operate on a single, process-global project. This
+module exposes the same function names bound to an independent EPANET 2.2
+project handle (the `EN_createproject` API), so several hydraulic models can
+live in one process. Every `Optimization` created with `Backend PROJECT` owns
+one of these handles, which also allows evaluation threads to run their own
+models concurrently (ctypes releases the GIL while EPANET is solving).
+"""
+
+import ctypes
+from typing import Any, Tuple
+
+from entoolkit import constants as en_constants
+# entoolkit does not wrap the handle-based hydraulic stepping functions
+# (EN_openH, EN_runH, ...), so they are called on its loaded library directly.
+from entoolkit.legacy import _lib, ENtoolkitError
+
+_H = ctypes.c_void_p
+_PINT = ctypes.POINTER(ctypes.c_int)
+_PLONG = ctypes.POINTER(ctypes.c_long)
+_PDOUBLE = ctypes.POINTER(ctypes.c_double)
+
+_SIGNATURES = {
+    'EN_createproject': [ctypes.POINTER(ctypes.c_void_p)],
+    'EN_deleteproject': [_H],
+    'EN_open': [_H, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p],
+    'EN_close': [_H],
+    'EN_openH': [_H],
+    'EN_initH': [_H, ctypes.c_int],
+    'EN_runH': [_H, _PLONG],
+    'EN_nextH': [_H, _PLONG],
+    'EN_closeH': [_H],
+    'EN_setstatusreport': [_H, ctypes.c_int],
+    'EN_getcount': [_H, ctypes.c_int, _PINT],
+    'EN_getflowunits': [_H, _PINT],
+    'EN_getnodeindex': [_H, ctypes.c_char_p, _PINT],
+    'EN_getlinkindex': [_H, ctypes.c_char_p, _PINT],
+    'EN_getlinknodes': [_H, ctypes.c_int, _PINT, _PINT],
+    'EN_getnodevalue': [_H, ctypes.c_int, ctypes.c_int, _PDOUBLE],
+    'EN_getlinkvalue': [_H, ctypes.c_int, ctypes.c_int, _PDOUBLE],
+    'EN_setlinkvalue': [_H, ctypes.c_int, ctypes.c_int, ctypes.c_double],
+}
+for _name, _argtypes in _SIGNATURES.items():
+    _func = getattr(_lib, _name)
+    _func.argtypes = _argtypes
+    _func.restype = ctypes.c_int
+
+
+def _check(ierr: int, warnings_allowed: bool = False) -> None:
+    """Raises ENtoolkitError for EPANET error codes (warnings are < 100)."""
+    if ierr and (not warnings_allowed or ierr >= 100):
+        raise ENtoolkitError(ierr)
+
+
+class ProjectToolkit:
+    """Legacy-style `EN*` facade bound to its own EPANET project handle.
+
+    Only the subset of the toolkit used by PPNO is provided. `EN_*` constants
+    are resolved from `entoolkit.constants`, so an instance can replace the
+    legacy module wherever `et.ENxxx(...)` calls are made.
+    """
+
+    def __init__(self):
+        """Creates a new, empty EPANET project."""
+        self._ph = ctypes.c_void_p()
+        _check(_lib.EN_createproject(ctypes.byref(self._ph)))
+
+    def __getattr__(self, name: str) -> Any:
+        """Resolves `EN_*` constants like the legacy toolkit module does."""
+        if name.startswith('EN_'):
+            return getattr(en_constants, name)
+        raise AttributeError(name)
+
+    # --- Project management ---
+
+    def ENopen(self, inp_file: str, rpt_file: str = '', bin_file: str = '') -> None:
+        """Opens an EPANET input file into this project."""
+        _check(_lib.EN_open(self._ph, inp_file.encode(), rpt_file.encode(), bin_file.encode()),
+               warnings_allowed=True)
+
+    def ENclose(self) -> None:
+        """Closes the project and releases its handle."""
+        if self._ph:
+            _lib.EN_close(self._ph)
+            _lib.EN_deleteproject(self._ph)
+            self._ph = ctypes.c_void_p()
+
+    def ENsetstatusreport(self, status_level: int) -> None:
+        """Sets the level of hydraulic status reporting."""
+        _check(_lib.EN_setstatusreport(self._ph, status_level))
+
+    def ENgetcount(self, count_code: int) -> int:
+        """Returns the number of network components of a given type."""
+        value = ctypes.c_int()
+        _check(_lib.EN_getcount(self._ph, count_code, ctypes.byref(value)))
+        return value.value
+
+    def ENgetflowunits(self) -> int:
+        """Returns the flow units code of the project."""
+        units = ctypes.c_int()
+        _check(_lib.EN_getflowunits(self._ph, ctypes.byref(units)))
+        return units.value
+
+    # --- Hydraulic analysis ---
+
+    def ENopenH(self) -> None:
+        """Opens the hydraulic solver."""
+        _check(_lib.EN_openH(self._ph))
+
+    def ENinitH(self, init_flag: int = 0) -> None:
+        """Initializes the hydraulic solver."""
+        _check(_lib.EN_initH(self._ph, init_flag))
+
+    def ENrunH(self) -> int:
+        """Solves the current hydraulic period. Returns the simulation time."""
+        t = ctypes.c_long()
+        _check(_lib.EN_runH(self._ph, ctypes.byref(t)), warnings_allowed=True)
+        return t.value
+
+    def ENnextH(self) -> int:
+        """Advances to the next hydraulic period. Returns the time step (0 at the end)."""
+        tstep = ctypes.c_long()
+        _check(_lib.EN_nextH(self._ph, ctypes.byref(tstep)))
+        return tstep.value
+
+    def ENcloseH(self) -> None:
+        """Closes the hydraulic solver."""
+        _check(_lib.EN_closeH(self._ph))
+
+    # --- Network data ---
+
+    def ENgetnodeindex(self, node_id: str) -> int:
+        """Returns the index of a node given its ID."""
+        index = ctypes.c_int()
+        _check(_lib.EN_getnodeindex(self._ph, node_id.encode(), ctypes.byref(index)))
+        return index.value
+
+    def ENgetlinkindex(self, link_id: str) -> int:
+        """Returns the index of a link given its ID."""
+        index = ctypes.c_int()
+        _check(_lib.EN_getlinkindex(self._ph, link_id.encode(), ctypes.byref(index)))
+        return index.value
+
+    def ENgetlinknodes(self, index: int) -> Tuple[int, int]:
+        """Returns the start and end node indexes of a link."""
+        from_node, to_node = ctypes.c_int(), ctypes.c_int()
+        _check(_lib.EN_getlinknodes(self._ph, index, ctypes.byref(from_node), ctypes.byref(to_node)))
+        return from_node.value, to_node.value
+
+    def ENgetnodevalue(self, index: int, param_code: int) -> float:
+        """Returns a node property (double precision)."""
+        value = ctypes.c_double()
+        _check(_lib.EN_getnodevalue(self._ph, index, param_code, ctypes.byref(value)))
+        return value.value
+
+    def ENgetlinkvalue(self, index: int, param_code: int) -> float:
+        """Returns a link property (double precision)."""
+        value = ctypes.c_double()
+        _check(_lib.EN_getlinkvalue(self._ph, index, param_code, ctypes.byref(value)))
+        return value.value
+
+    def ENsetlinkvalue(self, index: int, param_code: int, value: float) -> None:
+        """Sets a link property."""
+        _check(_lib.EN_setlinkvalue(self._ph, index, param_code, ctypes.c_double(value)))
@@ -58,19 +58,40 @@ class PPNOProblem:
             List containing [cost, max_deficit].
         """
         diameter_indexes = np.array(x).astype(np.int32)
-        self.optimization_instance.set_x(diameter_indexes)
 
         # Objective 1: Investment Cost
-        cost = float(self.optimization_instance.get_cost())
-
         # Objective 2: Feasibility (Pressure Deficit)
         # We look for the maximum deficit across all nodes.
         # A value <= 0 means all nodes satisfy pressure requirements.
-        nodal_deficits = self.optimization_instance.check(mode='PD')
-        max_deficit = float(np.max(nodal_deficits))
+        cost, max_deficit = self.optimization_instance.evaluate(diameter_indexes, exact=True)
+        cost, max_deficit = float(cost), float(max_deficit)
 
         return [cost, max_deficit]
 
+    def batch_fitness(self, dvs: np.ndarray) -> np.ndarray:
+        """Calculates the fitness of a flattened batch of solution vectors.
+
+        Used by PyGMO batch fitness evaluators to send a whole population to
+        the parallel evaluation service in one call.
+
+        Args:
+            dvs: Concatenated decision vectors (n_individuals * dimension).
+
+        Returns:
+            Concatenated fitness vectors [cost_0, deficit_0, cost_1, ...].
+        """
+        X = np.asarray(dvs).reshape(-1, self.optimization_instance.dimension).astype(np.int32)
+        costs, max_deficits, _ = self.optimization_instance.evaluate_many(X)
+        return np.column_stack([costs, max_deficits]).ravel()
+
+    def __deepcopy__(self, memo: dict) -> 'PPNOProblem':
+        """Shares the Optimization instance between PyGMO's internal copies.
+
+        The instance drives a process-global toolkit and may own a worker pool,
+        neither of which can be duplicated.
+        """
+        return PPNOProblem(self.optimization_instance)
+
     def get_bounds(self) -> Tuple[np.ndarray, np.ndarray]:
         """Returns the lower and upper bounds for each variable."""
         return self.optimization_instance.lbound, self.optimization_instance.ubound
@@ -103,6 +124,7 @@ def evolve_ppno(optimization_instance: Any,
         individual becomes the exact initial solution. A subset of the population 
         is then filled with mutated variations of this initial solution (changing 
         ~5% of pipes) to provide genetic diversity around a known good region.
+        With the `Repair` option, infeasible variations are repaired first.
 
     Args:
         optimization_instance: The main Optimization object.
@@ -137,9 +159,17 @@ def evolve_ppno(optimization_instance: Any,
     best_valid_x: Optional[np.ndarray] = None
 
     # Initialize algorithm and population
-    algorithm = pg.algorithm(algorithm_factory())
+    uda = algorithm_factory()
+    batched = optimization_instance.batch_capable
+    if batched and hasattr(uda, 'set_bfe'):
+        # Offspring are evaluated in batches through PPNOProblem.batch_fitness
+        uda.set_bfe(pg.bfe(pg.member_bfe()))
+    algorithm = pg.algorithm(uda)
     pop_size = optimization_instance.config.get('PopulationSize', 100)
-    population = pg.population(prob, size=pop_size)
+    if batched:
+        population = pg.population(prob, size=pop_size, b=pg.bfe(pg.member_bfe()))
+    else:
+        population = pg.population(prob, size=pop_size)
 
     # Seed population with the initial solution and feasible variations
     if initial_x is not None:
@@ -165,6 +195,8 @@ def evolve_ppno(optimization_instance: Any,
                 variant[idx] = np.clip(variant[idx] + np.random.randint(-1, 2), 
                                        optimization_instance.lbound[idx], 
                                        optimization_instance.ubound[idx])
+            if optimization_instance.config.get('Repair'):
+                variant = optimization_instance.repair(variant)
             population.set_x(i, variant)
 
     max_trials = optimization_instance.config.get('MaxTrials', 250)
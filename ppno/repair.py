@@ -0,0 +1,151 @@
+"""Hydraulics-aware repair of infeasible designs.
+
+A design that violates the pressure limits is repaired by upsizing pipes that
+feed the deficient nodes. One simulation gives the nodal deficits and the pipe
+head losses; the path of least head loss from a source to a deficient node
+follows the flow (along it the head losses add up to the head drop, which no
+other path can beat), so the pipes on that path are the ones feeding the node.
+On every such path the pipe with the steepest head loss gradient is upsized
+one step, and the design is simulated again, until it is feasible or the
+simulation budget is spent. In looped networks a node is also fed around the
+loops; once its path is at the largest sizes, the steepest pipe among those
+closer to the sources (smaller head loss from a source) is upsized instead.
+"""
+
+import logging
+from typing import Dict, List, Tuple
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import dijkstra
+
+# Logger configuration
+logger = logging.getLogger(__name__)
+
+# Path weight of the links that are not sized (fixed pipes, pumps, valves)
+_FIXED_LINK_WEIGHT = 1e-6
+
+
+class SupplyGraph:
+    """Network topology used to find the sized pipes feeding each node.
+
+    Built once from the toolkit model: EPANET numbers junctions first, so the
+    last `n_sources` nodes are the reservoirs and tanks. Links closed in the
+    model are left out.
+    """
+
+    def __init__(self, opt_instance):
+        """Reads the topology of the loaded model.
+
+        Args:
+            opt_instance: An instance of the Optimization class.
+        """
+        et = opt_instance._et
+        n_nodes = int(et.ENgetcount(et.EN_NODECOUNT))
+        n_links = int(et.ENgetcount(et.EN_LINKCOUNT))
+        links = [i for i in range(1, n_links + 1) if et.ENgetlinkvalue(i, et.EN_INITSTATUS) != 0]
+        ends = np.array([et.ENgetlinknodes(i) for i in links], dtype=np.intp).reshape(-1, 2) - 1
+        position = {link: p for p, link in enumerate(opt_instance._link_indices)}
+
+        self.n_nodes = n_nodes
+        self.ends = ends
+        self.sized = np.array([position.get(link, -1) for link in links], dtype=np.intp)
+        self.sources = np.arange(n_nodes - opt_instance.n_sources, n_nodes)
+        self.targets = np.array(opt_instance._node_indices, dtype=np.intp) - 1
+        self._distances = np.zeros(n_nodes)
+        # Sized pipes joining each pair of nodes (parallel pipes share a pair)
+        self._pair_pipes: Dict[Tuple[int, int], List[int]] = {}
+        for (a, b), p in zip(ends.tolist(), self.sized.tolist()):
+            pipes = self._pair_pipes.setdefault((min(a, b), max(a, b)), [])
+            if p >= 0:
+                pipes.append(p)
+
+    def feeding_pipes(self, nodes: np.ndarray, headlosses: np.ndarray) -> List[np.ndarray]:
+        """Returns the sized pipes on the supply path of each constrained node.
+
+        Args:
+            nodes: Positions of constrained nodes (in `Optimization.nodes`).
+            headlosses: Head loss of each sized pipe, used as path weight.
+
+        Returns:
+            List[np.ndarray]: One array of sized pipe positions per node.
+        """
+        weights = np.full(len(self.sized), _FIXED_LINK_WEIGHT)
+        sized = self.sized >= 0
+        weights[sized] = np.maximum(np.abs(headlosses[self.sized[sized]]), _FIXED_LINK_WEIGHT)
+        # Parallel links would be summed by the sparse constructor: keep the lightest
+        pairs: Dict[Tuple[int, int], float] = {}
+        for (a, b), w in zip(self.ends.tolist(), weights.tolist()):
+            key = (min(a, b), max(a, b))
+            pairs[key] = min(w, pairs.get(key, np.inf))
+        rows, cols = zip(*pairs) if pairs else ((), ())
+        graph = sparse.csr_matrix((list(pairs.values()), (rows, cols)), shape=(self.n_nodes, self.n_nodes))
+        distances, predecessors, _ = dijkstra(graph, directed=False, indices=self.sources,
+                                              return_predecessors=True, min_only=True)
+        self._distances = distances
+
+        paths = []
+        for node in self.targets[np.asarray(nodes, dtype=np.intp)].tolist():
+            pipes = []
+            while predecessors[node] >= 0:
+                previous = int(predecessors[node])
+                pipes.extend(self._pair_pipes.get((min(node, previous), max(node, previous)), []))
+                node = previous
+            paths.append(np.array(pipes, dtype=np.intp))
+        return paths
+
+    def upstream_pipes(self, node: int) -> np.ndarray:
+        """Returns the sized pipes with both ends closer to the sources than a constrained node.
+
+        Distances are the head losses from the last `feeding_pipes` call.
+        """
+        limit = self._distances[self.targets[node]]
+        sized = self.sized >= 0
+        closer = (self._distances[self.ends[:, 0]] <= limit) & (self._distances[self.ends[:, 1]] <= limit)
+        return self.sized[sized & closer]
+
+
+def repair_design(opt_instance, x: np.ndarray, max_sims: int) -> np.ndarray:
+    """Upsizes the pipes feeding deficient nodes until the design is feasible.
+
+    Every simulation is recorded in the shared evaluation cache as an exact
+    evaluation, so evaluating the returned design afterwards is free.
+
+    Args:
+        opt_instance: An instance of the Optimization class.
+        x: Vector of diameter indexes (rounded and clipped to the bounds).
+        max_sims: Maximum number of simulations.
+
+    Returns:
+        np.ndarray: The repaired design. It is feasible unless the budget was
+        spent or no pipe feeding a deficient node can be upsized.
+    """
+    x = np.clip(np.round(x), opt_instance.lbound, opt_instance.ubound).astype(np.int32)
+    graph = opt_instance.supply_graph()
+    for _ in range(max_sims):
+        cached = opt_instance.eval_cache.get(x)
+        if cached is not None and cached[1] <= 0:
+            return x
+
+        slack, headlosses = opt_instance.hydraulic_state(x)
+        max_deficit = float(-slack.min()) if slack.size else 0.0
+        opt_instance.record_evaluation(x, max_deficit)
+        if max_deficit <= 0:
+            return x
+
+        gradients = headlosses / opt_instance._pipe_lengths
+        upsized = set()
+        deficient = np.flatnonzero(slack < 0)
+        for node, path in zip(deficient, graph.feeding_pipes(deficient, headlosses)):
+            path = path[x[path] < opt_instance.ubound[path]]
+            if not path.size:
+                path = graph.upstream_pipes(node)
+                path = path[x[path] < opt_instance.ubound[path]]
+            if path.size:
+                upsized.add(int(path[np.argmax(gradients[path])]))
+        if not upsized:
+            logger.debug("[REPAIR] No pipe feeding the deficient nodes can be upsized.")
+            break
+        x = x.copy()
+        x[sorted(upsized)] += 1
+    return x
@@ -42,29 +42,84 @@ def solve_scipy(opt_instance, alg_id: int, initial_x: Optional[np.ndarray] = Non
         initial_x: An optional pre-computed feasible solution vector (e.g., from FLS-H)
                    used to seed the initial population or starting point.
 
+    The objective also tracks the cheapest feasible design it has evaluated.
+    When `MaxTime` runs out, the optimizer is stopped (through its callback at
+    the end of a generation or step, or from inside the objective) and that
+    incumbent is returned; `opt_instance.timed_out` is set so the caller can
+    resume from it.
+
     Returns:
         Optional[np.ndarray]: The optimized discrete diameter index vector, or None 
-                              if the optimizer fails or times out.
+                              if the optimizer fails, or times out before
+                              evaluating any feasible design.
     """
-    bounds = list(zip(opt_instance.lbound, opt_instance.ubound))
+    # Pipes fixed by tightened bounds get a sub-step width (rounded back to their size),
+    # since DA and DIRECT require lower < upper
+    bounds = [(lb, ub if ub > lb else ub + 0.49) for lb, ub in zip(opt_instance.lbound, opt_instance.ubound)]
     start_time = perf_counter()
-
-    def objective(x_params):
-        max_time = opt_instance.config.get('MaxTime', 120)
+    # Whole populations are evaluated at once by the worker pool or the native engine
+    batched = opt_instance.batch_capable
+    # Designs implied feasible by the dominance index need no simulation
+    infer = bool(opt_instance.config.get('Dominance'))
+    max_time = opt_instance.config.get('MaxTime', 120)
+    opt_instance.timed_out = False
+    # Cheapest feasible design evaluated so far
+    incumbent = {'x': None, 'cost': np.inf}
+
+    def remember(X, costs, feasible):
+        if not np.any(feasible):
+            return
+        costs = np.where(feasible, costs, np.inf)
+        k = int(np.argmin(costs))
+        if costs[k] < incumbent['cost']:
+            incumbent['x'], incumbent['cost'] = X[k].copy(), float(costs[k])
+
+    def out_of_time():
         if perf_counter() - start_time > max_time:
+            opt_instance.timed_out = True
+        return opt_instance.timed_out
+
+    def check_time():
+        if out_of_time():
             raise SolverTimeoutError(f"Time limit of {max_time}s reached.")
-        opt_instance.set_x(np.round(x_params).astype(np.int32))
-        
-        # We use mode 'PD' to get the maximum deficit for a guided penalty
-        deficits = opt_instance.check(mode='PD')
-        max_deficit = np.max(deficits)
+
+    def stop_on_time(*args, **kwargs):
+        # Solver callback: returning True ends the run at the end of a generation/step
+        return out_of_time()
+
+    def objective(x_params):
+        check_time()
+        x = np.round(x_params).astype(np.int32)
+        if infer and opt_instance.infer_feasible(x)[0]:
+            cost = float(opt_instance.cost_many(x[np.newaxis, :])[0])
+            remember(x[np.newaxis, :], [cost], [True])
+            return cost
+        # Exact evaluation: the maximum deficit drives a guided penalty
+        cost, max_deficit = opt_instance.evaluate(x, exact=True)
         
         if max_deficit <= 0:
-            return opt_instance.get_cost()
+            remember(x[np.newaxis, :], [cost], [True])
+            return cost
         else:
             # Provide a guided penalty proportional to the violation
             return PENALTY_VALUE + (max_deficit * 1e6)
 
+    def batch_objective(x_params):
+        # Vectorized form: x_params has shape (n_vars, S); one value per column
+        check_time()
+        X = np.round(np.asarray(x_params).T).astype(np.int32)
+        if not infer:
+            costs, max_deficits, feasible = opt_instance.evaluate_many(X)
+            remember(X, costs, feasible)
+            return np.where(feasible, costs, PENALTY_VALUE + (max_deficits * 1e6))
+        values = opt_instance.cost_many(X)
+        feasible = ~np.zeros(len(X), dtype=bool)
+        unknown = ~opt_instance.infer_feasible(X)
+        if unknown.any():
+            costs, max_deficits, feasible[unknown] = opt_instance.evaluate_many(X[unknown])
+            values[unknown] = np.where(feasible[unknown], costs, PENALTY_VALUE + (max_deficits * 1e6))
+        remember(X, values, feasible)
+        return values
 
     try:
         if alg_id == ALGORITHM_DE:
@@ -84,30 +139,52 @@ def solve_scipy(opt_instance, alg_id: int, initial_x: Optional[np.ndarray] = Non
                 logger.info("      [SEEDED] Injecting initial solution into DE population.")
                 init_pop[0] = initial_x.astype(np.float64)
             
-            result = differential_evolution(objective, bounds, init=init_pop, 
-                                            popsize=popsize_factor)
+            if batched:
+                # Whole generations are sent to evaluate_many at once
+                result = differential_evolution(batch_objective, bounds, init=init_pop,
+                                                popsize=popsize_factor, vectorized=True,
+                                                updating='deferred', callback=stop_on_time)
+            else:
+                result = differential_evolution(objective, bounds, init=init_pop, 
+                                                popsize=popsize_factor, callback=stop_on_time)
         elif alg_id == ALGORITHM_DA:
             from scipy.optimize import dual_annealing
             logger.info("*** DUAL ANNEALING ***")
             if initial_x is not None:
                 logger.info("      [SEEDED] Using initial solution as starting point for DA.")
-            result = dual_annealing(objective, bounds, x0=initial_x)
+            result = dual_annealing(objective, bounds, x0=initial_x, callback=stop_on_time)
         elif alg_id == ALGORITHM_DIRECT:
             from scipy.optimize import direct
             logger.info("*** DIRECT ***")
             # DIRECT does not accept an initial point (x0). It deterministically
             # subdivides the search space from the center of the hypercube.
+            # Its callback cannot stop the run, so the time limit is enforced by the objective.
             result = direct(objective, bounds)
         else:
             return None
 
+        if opt_instance.timed_out:
+            logger.warning(f"Time limit of {max_time}s reached.")
+            return _incumbent(opt_instance, incumbent)
         if not result.success:
             return None
 
         final_x = np.round(result.x).astype(np.int32)
+        if opt_instance.config.get('Repair') and opt_instance.evaluate(final_x)[1] > 0:
+            logger.info("      Repairing the rounded result.")
+            final_x = opt_instance.repair(final_x)
         opt_instance.set_x(final_x)
         return final_x if opt_instance.check(mode='TF') else None
 
     except SolverTimeoutError as e:
         logger.warning(str(e))
+        return _incumbent(opt_instance, incumbent)
+
+
+def _incumbent(opt_instance, incumbent) -> Optional[np.ndarray]:
+    """Returns the best feasible design of an interrupted run, or None if there is none."""
+    if incumbent['x'] is None:
         return None
+    logger.info(f"      Returning the best feasible design found: {incumbent['cost']:.2f}")
+    opt_instance.set_x(incumbent['x'])
+    return incumbent['x']
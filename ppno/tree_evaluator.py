@@ -0,0 +1,181 @@
+"""Exact evaluator for branched (tree) networks.
+
+In a network where every node is fed by a single path from one fixed head
+node, pipe flows are fixed by the demands and do not depend on diameters.
+Node pressures are then the source head minus the cumulative head losses
+along the path to each node, so a design is evaluated with a lookup in a
+precomputed (pipe, size) head loss table and a sparse path sum, without
+solving the network at all. Batches of designs are evaluated the same way.
+"""
+
+import logging
+from collections import deque
+from typing import List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from .native_solver import NativeSolver
+
+# Logger configuration
+logger = logging.getLogger(__name__)
+
+
+class TreeEvaluator:
+    """Vectorized pressure evaluation for branched networks.
+
+    Attributes:
+        n_pipes (int): Number of sized pipes (columns of a design).
+        n_nodes (int): Number of constrained nodes.
+    """
+
+    def __init__(self, network: NativeSolver, pipe_positions: np.ndarray, node_positions: np.ndarray,
+                 diameter_table: np.ndarray, roughness_table: np.ndarray):
+        """Precomputes flows, path incidence and head loss tables.
+
+        Args:
+            network: Parsed network model (its current pipe properties are used
+                for the pipes that are not sized).
+            pipe_positions: Network positions of the sized pipes.
+            node_positions: Network positions of the constrained nodes.
+            diameter_table: (n_pipes, n_sizes) catalog diameters, in .inp units.
+            roughness_table: (n_pipes, n_sizes) catalog roughness, in .inp units.
+
+        Raises:
+            ValueError: If the network is not branched.
+        """
+        spanning = self._spanning_tree(network)
+        if spanning is None:
+            raise ValueError("The network is not branched: some node is fed by more than one path")
+        parent_link, order = spanning
+
+        self.n_pipes = len(pipe_positions)
+        self.n_nodes = len(node_positions)
+        n_total = len(network.node_ids)
+        n_junctions = network.n_junctions
+
+        # Flow in the link feeding each node = demand of its whole subtree
+        subtree = np.zeros(n_total)
+        subtree[:n_junctions] = network.demand
+        parent_node = np.full(n_total, -1, dtype=np.intp)
+        for node in order:
+            k = parent_link[node]
+            if k >= 0:
+                parent_node[node] = network.from_node[k] + network.to_node[k] - node
+        for node in reversed(order):
+            if parent_node[node] >= 0:
+                subtree[parent_node[node]] += subtree[node]
+
+        # Head drop along each link in the direction away from the source
+        child = np.full(len(network.link_ids), -1, dtype=np.intp)
+        for node in order:
+            if parent_link[node] >= 0:
+                child[parent_link[node]] = node
+        flow = subtree[child]
+        link_drop = network.link_headloss(np.arange(len(network.link_ids)), flow,
+                                          network.diameter * network._diameter_ucf,
+                                          network.roughness * network._roughness_ucf)
+
+        sized = np.full(len(network.link_ids), -1, dtype=np.intp)
+        sized[pipe_positions] = np.arange(self.n_pipes)
+        self._table = network.link_headloss(pipe_positions, flow[pipe_positions],
+                                            np.asarray(diameter_table).T,
+                                            np.asarray(roughness_table).T).T
+
+        # Path sums: sized pipes go to the incidence matrix, the rest to a constant
+        source_head = np.zeros(n_total)
+        source_head[n_junctions:] = network.fixed_head
+        base = np.empty(self.n_nodes)
+        rows: List[int] = []
+        cols: List[int] = []
+        for row, node in enumerate(np.asarray(node_positions).tolist()):
+            drop = 0.0
+            while parent_link[node] >= 0:
+                k = parent_link[node]
+                if sized[k] >= 0:
+                    rows.append(row)
+                    cols.append(int(sized[k]))
+                else:
+                    drop += link_drop[k]
+                node = parent_node[node]
+            base[row] = source_head[node] - drop
+        self._base = (base - network._node_elevation[node_positions]) * network._pressure_ucf
+        self._paths = sparse.csr_matrix((np.full(len(rows), network._pressure_ucf), (rows, cols)),
+                                        shape=(self.n_nodes, self.n_pipes))
+        self._rows = np.arange(self.n_pipes)
+        self._length_ucf = network._length_ucf
+        self._flows = np.abs(flow[pipe_positions])
+        self._areas = np.pi / 4.0 * (np.asarray(diameter_table) / network._diameter_ucf) ** 2
+
+    @staticmethod
+    def is_branched(network: NativeSolver) -> bool:
+        """Whether every node of the network is fed by a single path from one source."""
+        return TreeEvaluator._spanning_tree(network) is not None
+
+    @staticmethod
+    def _spanning_tree(network: NativeSolver) -> Optional[Tuple[np.ndarray, List[int]]]:
+        """Finds the link feeding each node from the fixed head nodes.
+
+        Returns:
+            A tuple (parent_link, order): the feeding link of every node (-1 for
+            fixed head nodes) and the nodes in breadth-first order from the
+            sources; or None if the network is not a forest with exactly one
+            source per component.
+        """
+        n_total = len(network.node_ids)
+        n_sources = n_total - network.n_junctions
+        if len(network.link_ids) != n_total - n_sources:
+            return None
+        adjacency: List[List[int]] = [[] for _ in range(n_total)]
+        for k, (i, j) in enumerate(zip(network.from_node.tolist(), network.to_node.tolist())):
+            adjacency[i].append(k)
+            adjacency[j].append(k)
+
+        parent_link = np.full(n_total, -1, dtype=np.intp)
+        visited = np.zeros(n_total, dtype=bool)
+        visited[network.n_junctions:] = True
+        queue = deque(range(network.n_junctions, n_total))
+        order = []
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            for k in adjacency[node]:
+                other = network.from_node[k] + network.to_node[k] - node
+                if k == parent_link[node]:
+                    continue
+                if visited[other]:
+                    return None
+                visited[other] = True
+                parent_link[other] = k
+                queue.append(other)
+        if not visited.all():
+            return None
+        return parent_link, order
+
+    def linear_model(self) -> Tuple[np.ndarray, sparse.csr_matrix, np.ndarray]:
+        """Returns the terms of the pressure model, linear in the size choices.
+
+        Returns:
+            A tuple (base, paths, table) such that the pressures of a design x
+            are `base - paths @ table[arange(n_pipes), x]`: the (n_nodes,)
+            pressures with zero loss in the sized pipes, the (n_nodes, n_pipes)
+            path incidence (scaled to pressure units) and the (n_pipes, n_sizes)
+            head losses of every catalog size (NaN for sizes out of the series).
+        """
+        return self._base, self._paths, self._table
+
+    def pressures(self, X: np.ndarray) -> np.ndarray:
+        """Returns the (pop, n_nodes) pressures (meters or psi) of a batch of designs."""
+        X = np.atleast_2d(X)
+        drops = self._table[self._rows, X]
+        return self._base - (self._paths @ drops.T).T
+
+    def headlosses(self, X: np.ndarray) -> np.ndarray:
+        """Returns the (pop, n_pipes) absolute head losses (meters or feet) of the sized pipes."""
+        X = np.atleast_2d(X)
+        return np.abs(self._table[self._rows, X]) * self._length_ucf
+
+    def velocities(self, X: np.ndarray) -> np.ndarray:
+        """Returns the (pop, n_pipes) absolute velocities (m/s or ft/s) of the sized pipes."""
+        X = np.atleast_2d(X)
+        return self._flows / self._areas[self._rows, X] * self._length_ucf
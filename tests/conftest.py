@@ -0,0 +1,45 @@
+import itertools
+import shutil
+from pathlib import Path
+
+import pytest
+
+EXAMPLES = Path(__file__).resolve().parents[1] / "ppno" / "examples"
+
+
+@pytest.fixture
+def examples_dir():
+    """Directory of the bundled example problems and networks."""
+    return EXAMPLES
+
+
+@pytest.fixture
+def example_problem(tmp_path):
+    """Copies an example .ext problem into tmp_path with extra [OPTIONS].
+
+    Returns a factory `example_problem(name="example_1.ext", **options)`. Each
+    keyword becomes a `Key value` line that replaces any line of the example
+    with the same key, e.g. `example_problem(Engine="NATIVE", Algorithm="IDE")`;
+    a None value only removes the example's line.
+    The referenced `.inp` is copied next to it, so the run outputs (such as
+    the `_result_` .scn files) are written to tmp_path and not to the package.
+    """
+    counter = itertools.count(1)
+
+    def make(name="example_1.ext", **options):
+        lines = (EXAMPLES / name).read_text().splitlines()
+        for i, line in enumerate(lines):
+            if line.strip().startswith("./examples/"):
+                inp = EXAMPLES / Path(line.strip()).name
+                if not (tmp_path / inp.name).exists():
+                    shutil.copy(inp, tmp_path)
+                lines[i] = str(tmp_path / inp.name)
+        keys = {key.upper() for key in options}
+        lines = [line for line in lines if not (line.split() and line.split()[0].upper() in keys)]
+        block = "".join(f"\n{key} {value}" for key, value in options.items() if value is not None)
+        text = "\n".join(lines).replace("[OPTIONS]", "[OPTIONS]" + block, 1) + "\n"
+        ext = tmp_path / f"{Path(name).stem}_{next(counter)}.ext"
+        ext.write_text(text)
+        return ext
+
+    return make
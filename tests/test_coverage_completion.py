@@ -57,6 +57,7 @@ def test_pygmo_missing_branches_corrected():
     opt.lbound = np.array([0]); opt.ubound = np.array([1]); opt.dimension = 1
     opt.simulation_cycles = 0
     opt.config = {'PopulationSize': 100, 'MaxTrials': 2, 'Patience': 10, 'Generations': 100, 'MaxTime': 120}
+    opt.batch_capable = False
     
     prob = PPNOProblem(opt)
     assert "Pressurized" in prob.get_name()
@@ -208,6 +209,7 @@ def test_pygmo_problem_methods(mock_et):
     opt = MagicMock()
     opt.lbound = np.array([0]); opt.ubound = np.array([1]); opt.dimension = 1
     opt.config = {'PopulationSize': 100, 'MaxTrials': 2, 'Patience': 10, 'Generations': 100, 'MaxTime': 120}
+    opt.batch_capable = False
     from ppno.pygmo_solver import PPNOProblem
     prob = PPNOProblem(opt)
     assert prob.get_nobj() == 2
@@ -215,10 +217,10 @@ def test_pygmo_problem_methods(mock_et):
     assert prob.get_name() == "Pressurized Pipe Network Optimization (Multi-objective)"
     prob.get_bounds()
     
-    opt.get_cost.return_value = 100.0
-    opt.check.return_value = np.array([0.0])
+    opt.evaluate.return_value = (100.0, 0.0)
     fit = prob.fitness(np.array([0.0]))
     assert fit == [100.0, 0.0]
+    assert opt.evaluate.call_args.kwargs == {'exact': True}
 
 def test_section_parser_end_tag(tmp_path):
     p = tmp_path / "end.txt"
@@ -251,8 +253,8 @@ def test_local_refiner_improvement(mock_et):
     opt.lbound = np.array([0])
     opt.ubound = np.array([1])
     opt.get_x.return_value = np.array([0])
-    opt.check.return_value = True
-    opt.get_cost.side_effect = [2000.0, 1000.0, 1000.0]
+    opt.evaluate.side_effect = [(2000.0, 0.0), (1000.0, 0.0)]
+    opt.cost_many.side_effect = lambda X: np.array([[20.0, 10.0][int(x[0])] * 100.0 for x in X])
     
     with patch('numpy.random.random', return_value=1.0), \
          patch('numpy.random.randint', return_value=1):
@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+from ppno.ppno import Optimization
+from ppno.dominance import DominanceIndex, _MAX_PENDING
+
+
+def test_inference_from_frontiers():
+    index = DominanceIndex(3, verify_rate=0.0)
+    assert index.infer(np.array([1, 1, 1])) is None
+    index.add(np.array([2, 1, 2]), True)
+    index.add(np.array([1, 0, 1]), False)
+    assert index.infer(np.array([2, 1, 2])) is True
+    assert index.infer(np.array([3, 1, 2])) is True
+    assert index.infer(np.array([0, 0, 1])) is False
+    assert index.infer(np.array([2, 0, 2])) is None
+    assert index.inferred == 3
+
+
+def test_frontiers_keep_extreme_designs():
+    index = DominanceIndex(2, verify_rate=0.0)
+    index.add(np.array([3, 3]), True)
+    index.add(np.array([2, 3]), True)  # dominates [3, 3] as a feasibility witness
+    index.add(np.array([4, 4]), True)  # already implied
+    assert len(index._feasible) == 1
+    index.add(np.array([1, 1]), False)
+    index.add(np.array([1, 2]), False)
+    assert len(index._infeasible) == 1
+    assert index.infer(np.array([1, 1])) is False
+
+
+def test_verification_disables_on_contradiction():
+    index = DominanceIndex(2, verify_rate=1.0)
+    index.add(np.array([1, 1]), True)
+    assert index.infer(np.array([2, 2])) is None  # withheld for verification
+    index.add(np.array([2, 2]), True)
+    assert index.enabled and index.verified == 1
+    assert index.infer(np.array([3, 3])) is None
+    index.add(np.array([3, 3]), False)
+    assert not index.enabled
+    assert index.infer(np.array([1, 1])) is None
+
+
+def test_feasible_only_inference():
+    index = DominanceIndex(2, verify_rate=0.0)
+    index.add(np.array([2, 2]), True)
+    index.add(np.array([1, 1]), False)
+    assert index.infer(np.array([0, 1]), feasible_only=True) is None
+    assert index.infer(np.array([3, 2]), feasible_only=True) is True
+    # Only the answer the caller uses is counted
+    assert index.inferred == 1
+
+
+def test_pending_verifications_are_bounded():
+    index = DominanceIndex(1, verify_rate=1.0)
+    index.add(np.array([0]), True)
+    # Withheld designs the caller never simulates
+    for i in range(1, 1000):
+        assert index.infer(np.array([i])) is None
+    assert len(index._pending) == _MAX_PENDING
+    # The most recent ones are still checked
+    index.add(np.array([999]), True)
+    assert index.verified == 1
+    index.add(np.array([1]), True)
+    assert index.verified == 1
+
+
+def test_evaluate_uses_index(example_problem):
+    opt = Optimization(example_problem(Dominance="YES", DominanceVerify=0))
+    try:
+        assert opt.dominance is not None
+        x = opt.ubound.copy()
+        x[-1] -= 1
+        assert opt.evaluate(x)[1] <= 0
+        assert opt.evaluate(opt.lbound + 1)[1] > 0
+        cycles = opt.simulation_cycles
+        assert opt.evaluate(opt.ubound)[1] == 0.0
+        assert opt.evaluate(opt.lbound)[1] == np.inf
+        assert opt.simulation_cycles == cycles
+        assert opt.infer_feasible(np.array([opt.ubound, opt.lbound])).tolist() == [True, False]
+        # Exact evaluations are always simulated
+        opt.evaluate(opt.ubound, exact=True)
+        assert opt.simulation_cycles == cycles + 1
+    finally:
+        opt.close()
+
+
+def test_dominance_option(example_problem):
+    opt = Optimization(example_problem())
+    try:
+        assert opt.dominance is None
+        assert not opt.infer_feasible(opt.ubound).any()
+    finally:
+        opt.close()
+    with pytest.raises(ValueError, match="Invalid Dominance value"):
+        Optimization(example_problem(Dominance="MAYBE"))
+
+
+def test_evaluate_many_inexact_uses_index(example_problem):
+    opt = Optimization(example_problem(Dominance="YES", DominanceVerify=0))
+    try:
+        x = opt.ubound.copy()
+        x[-1] -= 1
+        opt.evaluate(x)
+        opt.evaluate(opt.lbound + 1)
+        cycles = opt.simulation_cycles
+        _, max_deficits, feasible = opt.evaluate_many(np.array([opt.ubound, opt.lbound]), exact=False)
+        assert feasible.tolist() == [True, False] and max_deficits[1] == np.inf
+        assert opt.simulation_cycles == cycles
+        opt.evaluate_many(np.array([opt.ubound, opt.lbound]))
+        assert opt.simulation_cycles == cycles + 2
+    finally:
+        opt.close()
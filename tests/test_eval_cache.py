@@ -0,0 +1,59 @@
+import numpy as np
+from ppno.eval_cache import EvaluationCache
+
+def test_get_put_and_counters():
+    cache = EvaluationCache()
+    x = np.array([1, 2, 3])
+    assert cache.get(x) is None
+    cache.put(x, 100.0, -0.5)
+    assert cache.get(np.array([1, 2, 3], dtype=np.int64)) == (100.0, -0.5)
+    assert (cache.hits, cache.misses, len(cache)) == (1, 1, 1)
+    assert "1 hits / 1 misses" in cache.summary()
+
+def test_inexact_entries():
+    cache = EvaluationCache()
+    x = np.array([0, 1])
+    cache.put(x, 10.0, np.inf, exact=False)
+    assert cache.get(x) == (10.0, np.inf)
+    assert cache.get(x, exact=True) is None
+    cache.put(x, 10.0, 3.0)
+    # A fast-fail result never replaces an exact one
+    cache.put(x, 10.0, np.inf, exact=False)
+    assert cache.get(x, exact=True) == (10.0, 3.0)
+
+def test_lru_eviction():
+    cache = EvaluationCache(max_memory_mb=1e-9)
+    cache.put(np.array([0]), 1.0, 0.0)
+    cache.put(np.array([1]), 2.0, 0.0)
+    assert len(cache) == 1 and cache.evictions == 1
+    assert cache.get(np.array([0])) is None
+    assert cache.get(np.array([1])) == (2.0, 0.0)
+
+def test_wide_catalogs_use_16_bit_keys():
+    cache = EvaluationCache(max_size_index=300)
+    cache.put(np.array([256]), 1.0, 0.0)
+    assert cache.get(np.array([0])) is None
+    assert cache.get(np.array([256])) == (1.0, 0.0)
+
+def test_keys_are_bit_packed():
+    cache = EvaluationCache(max_size_index=15)
+    assert len(cache.key(np.arange(16))) == 8
+    assert cache.key(np.array([1, 2, 3])) != cache.key(np.array([1, 2, 4]))
+    odd = EvaluationCache(max_size_index=5)  # 3 bits per pipe
+    assert len(odd.key(np.zeros(16, dtype=int))) == 6
+    odd.put(np.array([5, 0, 3]), 7.0, 0.0)
+    assert odd.get(np.array([5, 0, 3])) == (7.0, 0.0)
+    assert odd.get(np.array([5, 0, 2])) is None
+
+def test_entry_cap_evicts_least_recently_used():
+    cache = EvaluationCache(max_size_index=15, max_entries=128)
+    for i in range(128):
+        cache.put(np.array([i % 16, i // 16]), float(i), 0.0)
+    cache.get(np.array([0, 0]))  # the oldest entry becomes the most recent
+    cache.put(np.array([15, 15]), 1.0, 0.0)
+    assert len(cache) == 127 and cache.evictions == 2
+    assert cache.get(np.array([0, 0])) == (0.0, 0.0)
+    assert cache.get(np.array([1, 0])) is None
+    for i in range(200):
+        cache.put(np.array([i % 16, 8 + i // 16]), 2.0, 0.0)
+    assert len(cache) <= 128 and len(cache._keys) == 128
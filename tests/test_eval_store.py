@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+from unittest.mock import patch
+from ppno.eval_cache import EvaluationCache
+from ppno.eval_store import EvaluationStore, store_info, compact_store, main
+from ppno.ppno import Optimization
+
+def test_store_round_trip(tmp_path):
+    db = tmp_path / "evals.db"
+    store = EvaluationStore(db, "abc", "net")
+    store.put(b"\x00\x01", 10.0, np.inf, exact=False)
+    store.put(b"\x01\x01", 20.0, -0.5)
+    assert store.get(b"\x00\x01") == (10.0, np.inf, False)  # pending writes are visible
+    store.close()
+
+    store = EvaluationStore(db, "abc")
+    assert store.get(b"\x00\x01") == (10.0, np.inf, False)
+    store.put(b"\x00\x01", 10.0, 2.0)
+    store.flush()
+    # A fast-fail result never replaces an exact one
+    store.put(b"\x00\x01", 10.0, np.inf, exact=False)
+    store.close()
+    assert EvaluationStore(db, "abc").get(b"\x00\x01") == (10.0, 2.0, True)
+    assert EvaluationStore(db, "other").get(b"\x00\x01") is None
+
+def test_cache_backed_by_store(tmp_path):
+    db = tmp_path / "evals.db"
+    cache = EvaluationCache(store=EvaluationStore(db, "abc"))
+    cache.put(np.array([1, 2]), 30.0, 0.0)
+    cache.put(np.array([2, 2]), 40.0, np.inf, exact=False)
+    assert cache.store.get(b"\x01\x02") == (30.0, 0.0, True)  # one byte per index on disk
+    cache.close()
+
+    cache = EvaluationCache(store=EvaluationStore(db, "abc"))
+    assert cache.get(np.array([1, 2]), exact=True) == (30.0, 0.0)
+    assert cache.get(np.array([2, 2])) == (40.0, np.inf)
+    assert cache.get(np.array([2, 2]), exact=True) is None
+    assert cache.get(np.array([3, 3])) is None
+    assert cache.store_hits == 2
+    assert "2 hits from evals.db" in cache.summary()
+    cache.close()
+
+def test_info_and_compact(tmp_path, capsys):
+    db = tmp_path / "evals.db"
+    for key in ["aaa1", "bbb2"]:
+        store = EvaluationStore(db, key, key.upper())
+        store.put(b"\x00", 5.0, 0.0)
+        store.put(b"\x01", 1.0, np.inf, exact=False)
+        store.close()
+    info = {p['key']: p for p in store_info(db)}
+    assert info['aaa1']['entries'] == 2 and info['aaa1']['exact'] == 1
+    assert info['aaa1']['best_cost'] == 5.0
+
+    assert compact_store(db, drop=['bbb'], inexact=True) == 3
+    assert [p['key'] for p in store_info(db)] == ['aaa1']
+    with pytest.raises(ValueError, match="matches 0 problems"):
+        compact_store(db, drop=['zzz'])
+
+    main(['info', str(db)])
+    assert "AAA1" in capsys.readouterr().out
+    with pytest.raises(SystemExit):
+        main(['compact', str(db), '--drop', 'zzz'])
+    with pytest.raises(SystemExit):
+        main(['info', str(tmp_path / "missing.db")])
+
+def test_optimization_cache_file_option(tmp_path):
+    (tmp_path / "test.inp").write_text("")
+    ext = tmp_path / "s.ext"
+    definition = ("[INP]\ntest.inp\n[OPTIONS]\nCacheFile evals.db\n[PIPES]\np1 s1\n"
+                  "[PRESSURES]\nn1 {}\n[CATALOG]\ns1 100.0 0.1 10.0\ns1 200.0 0.1 20.0\n")
+    with patch('ppno.ppno.et') as mock_et:
+        mock_et.ENgetlinkvalue.return_value = 100.0
+        mock_et.ENgetnodevalue.return_value = 25.0
+        mock_et.ENnextH.return_value = 0
+        ext.write_text(definition.format(20.0))
+        opt = Optimization(ext)
+        assert opt.eval_cache.store.path == tmp_path / "evals.db"
+        key = opt.problem_key()
+        assert opt.evaluate(np.array([1]), exact=True) == (2000.0, -5.0)
+        opt.close()
+
+        opt = Optimization(ext)
+        cycles = opt.simulation_cycles
+        assert opt.evaluate(np.array([1]), exact=True) == (2000.0, -5.0)
+        assert opt.simulation_cycles == cycles
+        opt.close()
+
+        # Another pressure limit is another problem
+        ext.write_text(definition.format(30.0))
+        assert Optimization(ext).problem_key() != key
+        # So is another hydraulic engine
+        ext.write_text(definition.format(20.0))
+        opt = Optimization(ext)
+        assert opt.problem_key() == key
+        opt.config['Engine'] = 'NATIVE'
+        assert opt.problem_key() != key
+        opt.close()
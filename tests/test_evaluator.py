@@ -0,0 +1,40 @@
+import numpy as np
+from unittest.mock import MagicMock, patch
+from ppno import evaluator
+from ppno.evaluator import ParallelEvaluator, _evaluate_chunk
+from ppno.ppno import Optimization
+
+def test_evaluate_chunk_uses_worker_model():
+    model = MagicMock()
+    model.simulation_cycles = 0
+
+    def fake_max_deficit(x):
+        model.simulation_cycles += 1
+        return float(x.sum()) - 1.0
+
+    model.max_deficit.side_effect = fake_max_deficit
+    with patch.object(evaluator, '_worker_model', model):
+        deficits, cycles = _evaluate_chunk(np.array([[0, 0], [1, 1]]))
+    assert np.array_equal(deficits, [-1.0, 1.0])
+    assert cycles == 2
+
+
+def test_parallel_matches_serial_evaluation(example_problem):
+    ext = example_problem()
+    opt = Optimization(ext)
+    try:
+        rng = np.random.default_rng(0)
+        X = rng.integers(opt.lbound, opt.ubound + 1, size=(6, opt.dimension))
+        X[0] = opt.ubound
+        costs, serial_deficits, feasible = opt.evaluate_many(X)
+        assert feasible[0]
+
+        pool = ParallelEvaluator(ext, workers=2)
+        try:
+            deficits, cycles = pool.max_deficits(X)
+        finally:
+            pool.close()
+        assert cycles == len(X)
+        assert np.allclose(deficits, serial_deficits, atol=1e-2)
+    finally:
+        opt.close()
@@ -0,0 +1,71 @@
+import pytest
+import numpy as np
+from unittest.mock import MagicMock, patch
+from ppno.ppno import Optimization
+from ppno.ide_solver import solve_ide, population_size
+from ppno.constants import ALGORITHM_IDE, IDE_MIN_POPULATION, IDE_MAX_POPULATION
+
+@pytest.fixture
+def mock_opt():
+    # Feasible when the indexes add up to at least 20; the cost is their sum
+    opt = MagicMock()
+    opt.lbound = np.zeros(6, dtype=np.int32)
+    opt.ubound = np.full(6, 7, dtype=np.int32)
+    opt.config = {'MaxTime': 120, 'IDEBudget': 900}
+    opt.cost_many.side_effect = lambda X: np.asarray(X).sum(axis=1).astype(float)
+    batches = []
+
+    def evaluate_many(X):
+        X = np.asarray(X)
+        batches.append(X.copy())
+        deficits = np.maximum(20 - X.sum(axis=1), 0) - 0.5
+        return X.sum(axis=1).astype(float), deficits, deficits <= 0
+
+    opt.evaluate_many.side_effect = evaluate_many
+    opt.check.return_value = True
+    opt.batches = batches
+    return opt
+
+
+def test_population_size_follows_budget():
+    assert population_size(10000) == 100
+    assert population_size(50) == IDE_MIN_POPULATION
+    assert population_size(10 ** 7) == IDE_MAX_POPULATION
+
+
+def test_solve_ide_finds_cheap_feasible_design(mock_opt):
+    np.random.seed(0)
+    x = solve_ide(mock_opt, initial_x=np.full(6, 7))
+    assert x.dtype == np.int32 and x.sum() == 20
+    assert mock_opt.timed_out is False
+    # The seed is in the first batch; later batches hold distinct designs
+    assert np.array_equal(mock_opt.batches[0][0], np.full(6, 7))
+    for X in mock_opt.batches[1:]:
+        assert len(np.unique(X, axis=0)) == len(X)
+        assert np.all((X >= 0) & (X <= 7))
+    assert sum(len(X) for X in mock_opt.batches) < 900 + population_size(900)
+
+
+def test_solve_ide_timeout_and_infeasible(mock_opt):
+    np.random.seed(0)
+    with patch('ppno.ide_solver.perf_counter', side_effect=[0, 400]):
+        x = solve_ide(mock_opt, initial_x=np.full(6, 7))
+    # Only the initial population was evaluated; its best feasible design is returned
+    assert mock_opt.timed_out is True
+    assert len(mock_opt.batches) == 1 and 20 <= x.sum() <= 42
+    mock_opt.ubound = np.full(6, 2, dtype=np.int32)
+    assert solve_ide(mock_opt) is None
+
+
+def test_ide_option(example_problem):
+    opt = Optimization(example_problem(Algorithm="IDE", IDEBudget=300))
+    try:
+        assert opt.algorithms == [ALGORITHM_IDE]
+        assert opt.config['IDEBudget'] == 300
+        np.random.seed(0)
+        x0 = opt.ubound.copy()
+        x = solve_ide(opt, initial_x=x0)
+        assert opt.evaluate(x, exact=True)[1] <= 0
+        assert opt.cost_many(x[np.newaxis, :])[0] < opt.cost_many(x0[np.newaxis, :])[0]
+    finally:
+        opt.close()
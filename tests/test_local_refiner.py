@@ -19,6 +19,8 @@ def mock_sim():
     }
     sim.lbound = np.zeros(size, dtype=np.int32)
     sim.ubound = np.ones(size, dtype=np.int32)
+    sim.cost_matrix = np.tile(100.0 * np.array([10.0, 25.0]), (size, 1))
+    sim.cost_many.side_effect = lambda X: sim.cost_matrix[np.arange(size), np.asarray(X)].sum(axis=1)
     return sim
 
 def test_init():
@@ -26,17 +28,15 @@ def test_init():
     refiner = LocalRefiner(sim, {'max_iter': 10, 'acceptance_threshold': 0.05, 'neighborhood_size': 5})
     assert refiner.max_iter == 10
 
-def test_evaluate_cache(mock_sim):
+def test_evaluate_uses_shared_cache(mock_sim):
     refiner = LocalRefiner(mock_sim)
     x = np.zeros(10, dtype=np.int32)
-    mock_sim.get_cost.return_value = 1000.0
-    mock_sim.check.return_value = True
-    
-    res1 = refiner.evaluate(x)
-    mock_sim.get_cost.reset_mock()
-    res2 = refiner.evaluate(x)
-    assert res2 == res1
-    mock_sim.get_cost.assert_not_called()
+    mock_sim.evaluate.return_value = (1000.0, 0.0)
+    assert refiner.evaluate(x) == {'cost': 1000.0, 'feasible': True}
+    mock_sim.evaluate.assert_called_once_with(x)
+
+    mock_sim.evaluate.return_value = (900.0, np.inf)
+    assert refiner.evaluate(x) == {'cost': 900.0, 'feasible': False}
 
 def test_repair(mock_sim):
     refiner = LocalRefiner(mock_sim)
@@ -50,6 +50,8 @@ def test_is_promising(mock_sim):
     x_cheap = np.zeros(10, dtype=np.int32)
     current_cost = 15000.0
     assert refiner.is_promising(x_cheap, current_cost) is True
+    # 10 pipes at the largest size cost 25000, well above the 10% margin
+    assert refiner.is_promising(np.ones(10, dtype=np.int32), current_cost) is False
 
 def test_accept_or_reject(mock_sim):
     refiner = LocalRefiner(mock_sim, {'acceptance_threshold': 0.1})
@@ -83,6 +85,36 @@ def test_refine_loop_stagnation(mock_sim):
             # First evaluate is for initial x0. Second is for candidate.
             refiner.refine(x0)
 
+def test_tabu_forbids_reversing_moves(mock_sim):
+    refiner = LocalRefiner(mock_sim, {'tabu_tenure': 2})
+    refiner._tabu_until = np.full((10, 2), -1)
+    previous, current = np.zeros(10, dtype=np.int32), np.zeros(10, dtype=np.int32)
+    current[3] = 1
+    refiner.record_move(previous, current, iteration=0)  # worsening upsize of pipe 3
+    best_cost = float(mock_sim.cost_many(previous[np.newaxis, :])[0])
+    assert refiner.is_tabu(current, previous, 1, best_cost)
+    assert refiner.is_tabu(current, previous, 2, best_cost)
+    assert not refiner.is_tabu(current, previous, 3, best_cost)  # tenure expired
+    # Aspiration: a reversal cheaper than the best design is allowed
+    assert not refiner.is_tabu(current, previous, 1, best_cost + 1.0)
+    other = current.copy()
+    other[4] = 1
+    assert not refiner.is_tabu(current, other, 1, best_cost)
+    assert not LocalRefiner(mock_sim).is_tabu(current, previous, 1, best_cost)
+
+def test_adaptive_size_and_patience(mock_sim):
+    refiner = LocalRefiner(mock_sim, {'neighborhood_size': 8, 'adaptive': True, 'patience': 3})
+    assert refiner.adapt_size(8, improved=True) == 6
+    assert refiner.adapt_size(2, improved=True) == 2
+    assert refiner.adapt_size(8, improved=False) == 12
+    assert refiner.adapt_size(30, improved=False) == 32
+    # No neighbor ever improves: the search stops after `patience` iterations
+    mock_sim.evaluate.return_value = (1000.0, 0.0)
+    with patch.object(LocalRefiner, 'generate_neighborhood', return_value=[]) as neighborhood, \
+         patch.object(LocalRefiner, 'diversify', side_effect=lambda x: x):
+        refiner.refine(np.zeros(10, dtype=np.int32))
+    assert [c.args[1] for c in neighborhood.call_args_list] == [8, 12, 18]
+
 def test_diversify_guaranteed(mock_sim):
     refiner = LocalRefiner(mock_sim)
     x = np.zeros(10, dtype=np.int32)
@@ -91,3 +123,109 @@ def test_diversify_guaranteed(mock_sim):
          patch('ppno.local_refiner.np.random.randint', return_value=1):
         div = refiner.diversify(x)
         assert not np.array_equal(div, x)
+
+def test_guided_neighborhood_ranks_moves(mock_sim):
+    mock_sim.catalog_diameters.return_value = np.tile([100.0, 200.0], (10, 1))
+    # Pipe 0 carries almost no head loss, pipe 1 a large one; the slack is small
+    headloss = np.full(10, 5.0)
+    headloss[0], headloss[1] = 0.01, 50.0
+    mock_sim.hydraulic_state.return_value = (np.array([0.5, 3.0]), headloss)
+    refiner = LocalRefiner(mock_sim, {'mode': 'GUIDED', 'neighborhood_size': 200})
+    x = np.ones(10, dtype=np.int32)
+    x[9] = 0
+
+    down, up = refiner.move_weights(x)
+    assert down[0] > down[1] and down[9] == 0
+    assert up[9] > 0 and not up[:9].any()
+    refiner.move_weights(x)
+    mock_sim.hydraulic_state.assert_called_once()
+
+    np.random.seed(0)
+    neighborhood = refiner.generate_neighborhood(x)
+    assert len(neighborhood) == 200
+    for v in neighborhood:
+        # Every neighbor downsizes exactly one pipe, possibly upsizing another
+        assert np.count_nonzero(v < x) == 1 and np.count_nonzero(v > x) <= 1
+    downsized = np.array([np.flatnonzero(v < x)[0] for v in neighborhood])
+    assert np.mean(downsized == 0) > np.mean(downsized == 1)
+
+
+def test_sweep_reaches_local_optimum():
+    sim = MagicMock()
+    sim.lbound = np.zeros(3, dtype=np.int32)
+    sim.ubound = np.full(3, 3, dtype=np.int32)
+    # Pipe 2 is cheap but hydraulically weak
+    sim.cost_matrix = np.array([[0.0, 10.0, 20.0, 30.0],
+                                [0.0, 12.0, 24.0, 36.0],
+                                [0.0, 3.0, 6.0, 9.0]])
+    sim.cost_many.side_effect = lambda X: sim.cost_matrix[np.arange(3), np.asarray(X)].sum(axis=1)
+    weights = np.array([3.0, 3.0, 1.0])
+    sim.evaluate.side_effect = lambda x: (sim.cost_many(np.asarray(x)[np.newaxis, :])[0],
+                                          0.0 if weights @ x >= 9 else np.inf)
+
+    refiner = LocalRefiner(sim, {'mode': 'SWEEP'})
+    x = refiner.refine(np.array([3, 3, 3]))
+    assert weights @ x >= 9
+    assert sim.cost_many(x[np.newaxis, :])[0] == 29.0  # [2, 0, 3], the optimum
+    # No feasible downsize or swap remains
+    for i in range(3):
+        if x[i] > 0:
+            v = x.copy()
+            v[i] -= 1
+            assert weights @ v < 9
+
+
+def test_sweep_rejects_infeasible_start(mock_sim):
+    mock_sim.evaluate.return_value = (1000.0, np.inf)
+    refiner = LocalRefiner(mock_sim, {'mode': 'SWEEP'})
+    x0 = np.ones(10, dtype=np.int32)
+    assert np.array_equal(refiner.refine(x0), x0)
+
+
+def test_batched_candidates_use_evaluate_many(mock_sim):
+    mock_sim.evaluate_many.side_effect = lambda X, exact: (
+        mock_sim.cost_many(X), np.where(X.sum(axis=1) >= 5, 0.0, np.inf), X.sum(axis=1) >= 5)
+    refiner = LocalRefiner(mock_sim, {'batched': True})
+    candidates = [np.ones(10, dtype=np.int32), np.zeros(10, dtype=np.int32)]
+    results = refiner.evaluate_candidates(candidates)
+    assert [r['feasible'] for r in results] == [True, False]
+    assert results[0]['cost'] == mock_sim.cost_many(candidates[:1])[0]
+    assert mock_sim.evaluate_many.call_args.kwargs == {'exact': False}
+    mock_sim.evaluate.assert_not_called()
+
+    # A single candidate, or an unbatched refiner, goes through evaluate
+    mock_sim.evaluate.return_value = (1000.0, 0.0)
+    assert LocalRefiner(mock_sim).evaluate_candidates(candidates)[1]['feasible']
+    assert mock_sim.evaluate.call_count == 2
+
+
+def test_unique_candidates(mock_sim):
+    refiner = LocalRefiner(mock_sim)
+    x = np.zeros(10, dtype=np.int32)
+    a, b = x.copy(), x.copy()
+    a[0] = 1
+    b[0] = 5  # clipped back to the upper bound, a copy of a
+    unique = refiner.unique_candidates([x, a, a.copy(), b, x.copy()])
+    assert [v.tolist() for v in unique] == [x.tolist(), a.tolist()]
+
+
+def _ones(n):
+    v = np.zeros(10, dtype=np.int32)
+    v[:n] = 1
+    return v
+
+
+def test_first_improvement_stops_at_cheapest_feasible(mock_sim):
+    mock_sim.evaluate.side_effect = lambda x: (float(mock_sim.cost_many(x[np.newaxis, :])[0]),
+                                               0.0 if x.sum() >= 2 else np.inf)
+    candidates = [_ones(3), _ones(1), _ones(2), _ones(4)]
+    best = LocalRefiner(mock_sim).select_candidate(candidates)
+    assert mock_sim.evaluate.call_count == 4
+
+    mock_sim.evaluate.reset_mock()
+    first = LocalRefiner(mock_sim, {'strategy': 'FIRST'}).select_candidate(candidates)
+    assert [c.args[0].sum() for c in mock_sim.evaluate.call_args_list] == [1, 2]
+    assert np.array_equal(first[0], best[0]) and first[1] == best[1]
+
+    mock_sim.evaluate.side_effect = lambda x: (0.0, np.inf)
+    assert LocalRefiner(mock_sim, {'strategy': 'FIRST'}).select_candidate(candidates) is None
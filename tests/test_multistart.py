@@ -0,0 +1,61 @@
+import multiprocessing
+import numpy as np
+from unittest.mock import MagicMock
+from ppno.ppno import Optimization
+from ppno.local_refiner import LocalRefiner
+from ppno.multistart import refine_multi_start, start_designs
+from ppno.eval_store import store_info
+
+def test_shared_best_tightens_filter():
+    sim = MagicMock()
+    sim.cost_many.side_effect = lambda X: np.asarray(X).sum(axis=1) * 100.0
+    shared = multiprocessing.Value('d', 1000.0)
+    refiner = LocalRefiner(sim, {'shared_best': shared, 'acceptance_threshold': 0.1})
+    x = np.array([5, 5])
+    # Ahead of the others: worsening within the threshold is allowed
+    assert refiner.is_promising(x, 950.0)
+    # Behind the shared best: only cheaper designs pass
+    assert not refiner.is_promising(np.array([6, 5]), 1050.0)
+    assert refiner.is_promising(np.array([5, 5]), 1050.0)
+    refiner.publish(900.0)
+    refiner.publish(950.0)
+    assert shared.value == 900.0
+
+
+def test_sequential_multi_start(example_problem):
+    opt = Optimization(example_problem(RefinerStarts=3, RandomSeed=5))
+    try:
+        x0 = opt.ubound.copy()
+        np.random.seed(0)
+        designs = start_designs(opt, x0, 3)
+        assert len(designs) == 3 and np.array_equal(designs[0], x0)
+        assert all(opt.evaluate(x)[1] <= 0 for x in designs)
+
+        np.random.seed(1)
+        x = opt._apply_refinement(x0)
+        np.random.seed(1)
+        assert np.array_equal(opt._apply_refinement(x0), x)
+        cost, max_deficit = opt.evaluate(x, exact=True)
+        assert max_deficit <= 0 and cost < opt.cost_many(x0[np.newaxis, :])[0]
+    finally:
+        opt.close()
+
+
+def test_parallel_multi_start(tmp_path, example_problem):
+    opt = Optimization(example_problem(RandomSeed=5, Workers=2, CacheFile="evals.db"))
+    try:
+        x0 = opt.ubound.copy()
+        cycles = opt.simulation_cycles
+        config = {'max_iter': 5, 'neighborhood_size': 5}
+        x = refine_multi_start(opt, x0, config, starts=2)
+        assert opt.simulation_cycles > cycles
+        # The evaluations of the workers were handed to the parent cache
+        assert opt.eval_cache.get(x) is not None
+        assert opt.evaluate(x, exact=True)[1] <= 0
+        assert opt.cost_many(x[np.newaxis, :])[0] < opt.cost_many(x0[np.newaxis, :])[0]
+        entries = len(opt.eval_cache)
+    finally:
+        opt.close()
+    # Only the parent wrote the store, and nothing was lost when the pool shut down
+    info = store_info(tmp_path / "evals.db")
+    assert len(info) == 1 and info[0]['entries'] == entries > 10
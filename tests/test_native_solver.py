@@ -0,0 +1,117 @@
+import numpy as np
+import pytest
+from ppno.ppno import Optimization
+from ppno.native_solver import NativeSolver
+
+@pytest.mark.parametrize("example", ["example_1.ext", "example_2.ext", "example_3.ext"])
+def test_pressures_match_epanet(example, example_problem):
+    opt = Optimization(example_problem(example, Engine="TOOLKIT"))
+    try:
+        solver = NativeSolver.from_inp(opt.inp_file)
+        links = solver.link_positions(opt.pipes['id'])
+        nodes = solver.node_positions(opt.nodes['id'])
+        rng = np.random.default_rng(1)
+        for x in [opt.ubound.copy()] + list(rng.integers(opt.lbound, opt.ubound + 1, size=(4, opt.dimension))):
+            opt.set_x(x)
+            opt._et.ENinitH(0)
+            opt._et.ENrunH()
+            solver.set_pipes(links, opt._diameter_table[opt._pipe_rows, x],
+                             opt._roughness_table[opt._pipe_rows, x])
+            assert solver.solve()
+            assert np.allclose(solver.pressures(nodes), opt._read_pressures(), rtol=1e-5, atol=1e-4)
+            assert np.allclose(solver.headlosses(links), opt._read_headlosses(), rtol=1e-5, atol=1e-4)
+    finally:
+        opt.close()
+
+
+def test_native_engine_check_modes(example_problem):
+    toolkit = Optimization(example_problem("example_1.ext", Engine="TOOLKIT"))
+    x = toolkit.ubound.copy()
+    x[::3] = 0
+    try:
+        toolkit.set_x(x)
+        expected = [toolkit.check(mode) for mode in ('TF', 'PD', 'UH')]
+    finally:
+        toolkit.close()
+
+    native = Optimization(example_problem("example_1.ext", Engine="NATIVE"))
+    try:
+        assert native.config['Engine'] == 'NATIVE'
+        native.set_x(x)
+        cycles = native.simulation_cycles
+        assert native.check('TF') == expected[0]
+        assert np.allclose(native.check('PD'), expected[1], atol=1e-3)
+        status, order = native.check('UH')
+        assert status == expected[2][0]
+        assert np.array_equal(order[:5], expected[2][1][:5])
+        assert native.simulation_cycles == cycles + 3
+    finally:
+        native.close()
+
+
+def test_unsupported_models(tmp_path, examples_dir):
+    text = (examples_dir / "NYT.inp").read_text()
+    inp = tmp_path / "pump.inp"
+    inp.write_text(text.replace("[PUMPS]\n", "[PUMPS]\n P1 1 2 HEAD 1\n"))
+    with pytest.raises(ValueError, match=r"\[PUMPS\]"):
+        NativeSolver.from_inp(inp)
+    inp.write_text(text.replace(" Duration           \t0", " Duration           \t24:00"))
+    with pytest.raises(ValueError, match="single-period"):
+        NativeSolver.from_inp(inp)
+
+
+def test_unknown_engine(example_problem):
+    with pytest.raises(ValueError, match="Unknown hydraulic engine"):
+        Optimization(example_problem("example_1.ext", Engine="FAST"))
+
+
+@pytest.mark.parametrize("example", ["example_1.ext", "example_3.ext"])
+def test_batch_matches_single_solves(example, example_problem):
+    opt = Optimization(example_problem(example, Engine="NATIVE"))
+    try:
+        solver = opt._native
+        solver.accuracy = 1e-9
+        rng = np.random.default_rng(2)
+        X = rng.integers(opt.lbound, opt.ubound + 1, size=(5, opt.dimension))
+        D = opt._diameter_table[opt._pipe_rows, X]
+        R = opt._roughness_table[opt._pipe_rows, X]
+        heads, converged = solver.solve_batch(opt._native_links, D, R)
+        assert converged.all()
+        batch = solver.pressures(opt._native_nodes, heads)
+        assert batch.shape == (5, len(opt.nodes))
+        for j in range(5):
+            solver.set_pipes(opt._native_links, D[j], R[j])
+            solver.solve()
+            assert np.allclose(batch[j], solver.pressures(opt._native_nodes), atol=1e-6)
+    finally:
+        opt.close()
+
+
+def test_evaluate_many_uses_batched_solves(example_problem):
+    opt = Optimization(example_problem("example_1.ext", Engine="NATIVE"))
+    try:
+        rng = np.random.default_rng(3)
+        X = rng.integers(opt.lbound, opt.ubound + 1, size=(8, opt.dimension))
+        costs, deficits, feasible = opt.evaluate_many(X)
+        assert opt.simulation_cycles == 8
+        serial = np.array([opt.max_deficit(x) for x in X])
+        assert np.allclose(deficits, serial, atol=1e-3)
+        assert np.array_equal(feasible, deficits <= 0)
+        assert np.allclose(costs, opt.cost_many(X))
+    finally:
+        opt.close()
+
+
+def test_unconverged_batch_members_are_infeasible(example_problem):
+    opt = Optimization(example_problem("example_1.ext", Engine="NATIVE"))
+    try:
+        opt._native.max_trials = 1
+        X = np.array([opt.ubound, opt.ubound - 1])
+        D = opt._diameter_table[opt._pipe_rows, X]
+        R = opt._roughness_table[opt._pipe_rows, X]
+        _, converged = opt._native.solve_batch(opt._native_links, D, R)
+        assert not converged.any()
+        costs, deficits, feasible = opt.evaluate_many(X)
+        assert np.all(deficits == np.inf) and not feasible.any()
+    finally:
+        opt.close()
@@ -91,6 +91,156 @@ def test_solve_full_logic_coverage(mock_et, example_files):
     with patch.object(Optimization, '_solve_uh', return_value=np.array([0])):
         opt.solve()
 
+def test_timed_out_attempt_resumes_from_incumbent(mock_et, example_files):
+    opt = Optimization(example_files[0])
+    opt.algorithms = [ALGORITHM_DE]
+    opt.max_retries = 3
+    seeds = []
+
+    def timed_out_run(instance, alg_id, initial_x=None):
+        seeds.append(initial_x.copy())
+        instance.timed_out = len(seeds) == 1
+        return np.array([len(seeds) % 2])
+
+    with patch.object(Optimization, '_solve_uh', return_value=np.array([0])), \
+         patch.object(Optimization, '_apply_refinement', side_effect=lambda x: x), \
+         patch('ppno.scipy_solver.solve_scipy', side_effect=timed_out_run), \
+         patch.object(Optimization, 'get_cost', side_effect=[1000, 900, 800, 800, 800]):
+        res = opt.solve()
+    # The interrupted first attempt is kept and the second one starts from it
+    assert [s.tolist() for s in seeds] == [[0], [1]]
+    assert res.tolist() == [0]
+    assert [r['Success'] for r in opt.results if r['Algorithm'] == 'DE'] == ['YES', 'YES']
+
+def test_cost_many_matches_get_cost(mock_et, example_files):
+    opt = Optimization(example_files[0])
+    # Single pipe of length 100 priced at 10 and 20 per unit length
+    assert opt.cost_matrix.shape == (1, 2)
+    costs = opt.cost_many(np.array([[0], [1], [1]]))
+    assert np.allclose(costs, [1000.0, 2000.0, 2000.0])
+    opt.set_x(np.array([1]))
+    assert opt.get_cost() == costs[1]
+
+def test_set_x_pushes_only_changed_pipes(mock_et, example_files):
+    opt = Optimization(example_files[0])
+    mock_et.ENsetlinkvalue.reset_mock()
+    opt.set_x(np.array([0]))
+    # First call pushes diameter and roughness
+    assert mock_et.ENsetlinkvalue.call_count == 2
+
+    mock_et.ENsetlinkvalue.reset_mock()
+    opt.set_x(np.array([0]))
+    mock_et.ENsetlinkvalue.assert_not_called()
+
+    # Same roughness across the series: only the diameter is rewritten
+    opt.set_x(np.array([1]))
+    mock_et.ENsetlinkvalue.assert_called_once_with(1, mock_et.EN_DIAMETER, 200.0)
+
+    mock_et.ENsetlinkvalue.side_effect = RuntimeError("toolkit error")
+    with pytest.raises(RuntimeError):
+        opt.set_x(np.array([0]))
+
+def test_check_tf_fails_fast_on_most_binding_node(mock_et, tmp_path):
+    ext = tmp_path / "ff.ext"
+    (tmp_path / "test.inp").write_text("")
+    ext.write_text("[INP]\ntest.inp\n[PIPES]\np1 s1\n[PRESSURES]\nn1 20.0\nn2 20.0\n"
+                   "[CATALOG]\ns1 100.0 0.1 10.0\n")
+    mock_et.ENgetnodeindex.side_effect = lambda node_id: int(node_id[1:])
+    opt = Optimization(ext)
+
+    # Node 2 is deficient; the EPS run has more periods left
+    mock_et.ENgetnodevalue.side_effect = lambda idx, prop: 25.0 if idx == 1 else 10.0
+    mock_et.ENnextH.return_value = 3600
+    assert opt.check(mode='TF') is False
+    mock_et.ENnextH.assert_not_called()
+    assert opt._node_check_order == [1, 0]
+
+    # Second check starts with node 2 and stops after a single reading
+    mock_et.ENgetnodevalue.reset_mock()
+    assert opt.check(mode='TF') is False
+    assert mock_et.ENgetnodevalue.call_count == 1
+
+def test_check_uses_bulk_getters_when_available(mock_et, example_files):
+    opt = Optimization(example_files[0])
+    # Fake array getter: node 1 (position 0) reports 15.0
+    def fake_getnodevalues(prop, ptr):
+        np.ctypeslib.as_array(ptr, shape=(3,))[:] = [15.0, 99.0, 99.0]
+        return 0
+    opt._bulk_nodes = (fake_getnodevalues, np.zeros(3, dtype=np.float32), np.array([0]))
+    mock_et.ENgetnodevalue.reset_mock()
+
+    assert opt.check(mode='PD')[0] == 5.0
+    assert opt.check(mode='TF') is False
+    mock_et.ENgetnodevalue.assert_not_called()
+    assert opt._node_violations == [1]
+
+def test_evaluate_many_serial_and_workers_option(mock_et, tmp_path):
+    ext = tmp_path / "w.ext"
+    (tmp_path / "test.inp").write_text("")
+    ext.write_text("[INP]\ntest.inp\n[OPTIONS]\nWorkers 4\nMaxTime 30\n[PIPES]\np1 s1\n"
+                   "[PRESSURES]\nn1 20.0\n[CATALOG]\ns1 100.0 0.1 10.0\ns1 200.0 0.1 20.0\n")
+    opt = Optimization(ext)
+    assert opt.config['Workers'] == 4
+    assert opt.config['MaxTime'] == 30
+    assert Optimization(ext, workers=1).config['Workers'] == 1
+    with pytest.raises(ValueError, match="workers"):
+        Optimization(ext, workers=0)
+    ext.write_text(ext.read_text().replace("Workers 4", "Workers 0"))
+    with pytest.raises(ValueError, match="Line 4: Invalid Workers"):
+        Optimization(ext)
+    ext.write_text(ext.read_text().replace("Workers 0", "Workers 4"))
+
+    # A failing pool falls back to serial evaluation
+    mock_et.ENgetnodevalue.return_value = 15.0
+    with patch.object(Optimization, '_get_evaluator', side_effect=RuntimeError("no pool")):
+        costs, deficits, feasible = opt.evaluate_many(np.array([[0], [1]]))
+    assert np.allclose(costs, [1000.0, 2000.0])
+    assert np.allclose(deficits, [5.0, 5.0])
+    assert not feasible.any()
+    assert opt.config['Workers'] == 1
+
+def test_evaluate_goes_through_shared_cache(mock_et, tmp_path):
+    ext = tmp_path / "c.ext"
+    (tmp_path / "test.inp").write_text("")
+    ext.write_text("[INP]\ntest.inp\n[OPTIONS]\nCacheMemory 1\n[PIPES]\np1 s1\n"
+                   "[PRESSURES]\nn1 20.0\n[CATALOG]\ns1 100.0 0.1 10.0\ns1 200.0 0.1 20.0\n")
+    opt = Optimization(ext)
+    assert opt.eval_cache.max_memory_mb == 1.0
+
+    mock_et.ENgetnodevalue.return_value = 15.0
+    assert opt.evaluate(np.array([0])) == (1000.0, np.inf)
+    cycles = opt.simulation_cycles
+    assert opt.evaluate(np.array([0])) == (1000.0, np.inf)
+    assert opt.simulation_cycles == cycles
+    # A fast-fail entry does not answer exact requests
+    assert opt.evaluate(np.array([0]), exact=True) == (1000.0, 5.0)
+    assert opt.simulation_cycles == cycles + 1
+
+    # Batches reuse cached designs and simulate repeated rows once
+    costs, deficits, _ = opt.evaluate_many(np.array([[0], [1], [1]]))
+    assert np.allclose(costs, [1000.0, 2000.0, 2000.0])
+    assert np.allclose(deficits, [5.0, 5.0, 5.0])
+    assert opt.simulation_cycles == cycles + 2
+
+def test_cli_workers_flag(mock_et, example_files):
+    ext_path, _ = example_files
+    with patch('sys.argv', ['ppno', str(ext_path), '--workers', '3']), \
+         patch('ppno.ppno.Optimization') as m_opt:
+        m_opt.return_value.solve.return_value = None
+        main()
+    m_opt.assert_called_once_with(str(ext_path), workers=3)
+
+    with patch('sys.argv', ['ppno', str(ext_path), '--workers']):
+        with pytest.raises(SystemExit): main()
+    # No problem file, or fewer than one worker: usage, not a fatal error
+    for argv in (['ppno', '--workers', '4'], ['ppno', str(ext_path), '--workers', '0']):
+        with patch('sys.argv', argv), patch('ppno.ppno.Optimization') as m_opt, \
+             patch('builtins.print') as m_print:
+            with pytest.raises(SystemExit) as exc: main()
+        assert exc.value.code == 1
+        m_print.assert_called_once_with("Usage: ppno <problem_file.ext> [--workers N]")
+        m_opt.assert_not_called()
+
 def test_check_and_print_branches(mock_et, example_files, caplog):
     caplog.set_level(logging.INFO)
     opt = Optimization(example_files[0])
@@ -122,3 +272,12 @@ def test_cli_and_errors_final(mock_et, example_files):
          patch.object(Optimization, 'solve', side_effect=Exception("API Error")):
         with pytest.raises(SystemExit): main()
 
+
+def test_batch_capable(mock_et, example_files):
+    opt = Optimization(example_files[0])
+    assert opt.config['Engine'] in ('AUTO', 'TOOLKIT')
+    assert not opt.batch_capable
+    opt.config['Workers'] = 2
+    assert opt.batch_capable
+    opt.config.update({'Workers': 1, 'Engine': 'TREE'})
+    assert opt.batch_capable
@@ -0,0 +1,52 @@
+import numpy as np
+from ppno.ppno import Optimization
+from ppno.preprocess import minimum_sizes, tighten_bounds
+
+
+def test_minimum_sizes_are_tight(example_problem):
+    opt = Optimization(example_problem("example_1.ext", Algorithm=None))
+    try:
+        sizes = minimum_sizes(opt)
+        assert sizes is not None and sizes.any()
+        for i in np.flatnonzero(sizes):
+            x = opt.ubound.copy()
+            x[i] = sizes[i]
+            assert opt.evaluate(x, exact=True)[1] <= 0
+            x[i] -= 1
+            assert opt.evaluate(x, exact=True)[1] > 0
+    finally:
+        opt.close()
+
+
+def test_velocity_upper_bounds(example_problem):
+    opt = Optimization(example_problem("example_1.ext", Algorithm=None, MinVelocity=0.5))
+    try:
+        catalog_end = opt.ubound.copy()
+        lbound, ubound = tighten_bounds(opt, opt.config['MinVelocity'])
+        assert np.all(lbound <= ubound) and np.all(ubound <= catalog_end)
+        assert np.any(ubound < catalog_end)
+        assert opt.evaluate(ubound, exact=True)[1] <= 0
+    finally:
+        opt.close()
+
+
+def test_multiple_sources_keep_lower_bounds(example_problem):
+    opt = Optimization(example_problem("example_3.ext", Algorithm=None))
+    try:
+        assert opt.n_sources > 1
+        lbound, ubound = tighten_bounds(opt)
+        assert not lbound.any() and np.array_equal(ubound, opt.ubound)
+        assert opt.simulation_cycles == 0
+    finally:
+        opt.close()
+
+
+def test_solve_with_tightened_bounds(example_problem):
+    opt = Optimization(example_problem("example_1.ext", Algorithm=None, TightenBounds="YES"))
+    try:
+        assert opt.config['TightenBounds']
+        x = opt.solve()
+        assert opt.lbound.any()
+        assert np.all(x >= opt.lbound) and np.all(x <= opt.ubound)
+    finally:
+        opt.close()
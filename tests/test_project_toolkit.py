@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from ppno.ppno import Optimization
+from ppno.evaluator import ThreadEvaluator
+
+def test_project_backend_matches_legacy(example_problem):
+    legacy = Optimization(example_problem("example_1.ext", Backend="LEGACY"))
+    try:
+        x = legacy.ubound.copy()
+        x[::3] = 0
+        legacy.set_x(x)
+        legacy_deficits = legacy.check(mode='PD')
+    finally:
+        legacy.close()
+
+    project = Optimization(example_problem("example_1.ext", Backend="PROJECT"))
+    try:
+        assert project.backend == 'PROJECT'
+        project.set_x(x)
+        assert np.allclose(project.check(mode='PD'), legacy_deficits, atol=1e-3)
+    finally:
+        project.close()
+
+
+def test_independent_models_in_one_process(example_problem):
+    han = Optimization(example_problem("example_1.ext", Backend="PROJECT"))
+    nyt = Optimization(example_problem("example_2.ext", Backend="PROJECT"))
+    try:
+        han.set_x(han.ubound)
+        nyt.set_x(nyt.lbound)
+        # Each instance keeps its own design loaded in its own project
+        assert han.check(mode='TF') is True
+        assert nyt.check(mode='TF') is False
+        assert han.check(mode='TF') is True
+    finally:
+        han.close()
+        nyt.close()
+
+
+def test_thread_evaluator_matches_serial(example_problem):
+    ext = example_problem("example_1.ext", Backend="PROJECT")
+    opt = Optimization(ext)
+    pool = ThreadEvaluator(ext, workers=2)
+    try:
+        rng = np.random.default_rng(1)
+        X = rng.integers(opt.lbound, opt.ubound + 1, size=(5, opt.dimension))
+        _, serial, _ = opt.evaluate_many(X)
+        deficits, cycles = pool.max_deficits(X)
+        assert cycles == len(X)
+        assert np.allclose(deficits, serial, atol=1e-3)
+    finally:
+        pool.close()
+        opt.close()
+
+
+def test_unknown_backend_is_rejected(example_problem):
+    ext = example_problem("example_1.ext", Backend="MAGIC")
+    with pytest.raises(ValueError, match="Unknown toolkit backend"):
+        Optimization(ext)
+
+
+def test_project_backend_flow_units(example_problem):
+    # New York is in CFS: head losses are converted to psi on both backends
+    legacy = Optimization(example_problem("example_2.ext", Backend="LEGACY"))
+    try:
+        units = legacy._et.ENgetflowunits()
+        _, legacy_losses = legacy.hydraulic_state(legacy.ubound)
+        assert legacy._head_to_pressure == pytest.approx(0.4333)
+    finally:
+        legacy.close()
+
+    project = Optimization(example_problem("example_2.ext", Backend="PROJECT"))
+    try:
+        assert project._et.ENgetflowunits() == units
+        _, project_losses = project.hydraulic_state(project.ubound)
+        assert project._head_to_pressure == pytest.approx(0.4333)
+        assert np.allclose(project_losses, legacy_losses, atol=1e-4)
+    finally:
+        project.close()
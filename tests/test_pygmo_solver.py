@@ -27,6 +27,7 @@ def mock_opt():
         'Generations': 100,
         'MaxTime': 120
     }
+    opt.batch_capable = False
     return opt
 
 def test_ppno_problem_getters(mock_opt):
@@ -36,13 +37,12 @@ def test_ppno_problem_getters(mock_opt):
 
 def test_ppno_problem_fitness(mock_opt):
     problem = PPNOProblem(mock_opt)
-    mock_opt.get_cost.return_value = 500.0
-    mock_opt.check.return_value = np.array([0.0])
+    mock_opt.evaluate.return_value = (500.0, 0.0)
     f = problem.fitness([0.0])
     assert f[0] == 500.0
     
-    # Test min_deficit logic (line 62)
-    mock_opt.check.return_value = np.array([5.0, 2.0])
+    # The exact maximum deficit is the second objective
+    mock_opt.evaluate.return_value = (500.0, 5.0)
     f_infeasible = problem.fitness([0.0])
     assert f_infeasible[1] == 5.0 # Max deficit
 
@@ -107,3 +107,29 @@ def test_evolve_ppno_early_exit(mock_opt, mock_pg):
         mock_opt.config['Patience'] = 1
         evolve_ppno(mock_opt, lambda: MagicMock(), "TEST")
         assert m_alg.evolve.called
+
+def test_ppno_problem_batch_fitness(mock_opt):
+    problem = PPNOProblem(mock_opt)
+    mock_opt.evaluate_many.return_value = (np.array([500.0, 800.0]), np.array([2.0, -1.0]),
+                                           np.array([False, True]))
+    f = problem.batch_fitness(np.array([0.0, 1.0]))
+    assert np.array_equal(f, [500.0, 2.0, 800.0, -1.0])
+    assert mock_opt.evaluate_many.call_args[0][0].shape == (2, 1)
+
+    import copy
+    assert copy.deepcopy(problem).optimization_instance is mock_opt
+
+def test_evolve_ppno_batched_with_native_engine(mock_opt, mock_pg):
+    m_pop = MagicMock()
+    m_pop.get_f.return_value = np.array([[100.0, 0.0]])
+    m_pop.get_x.return_value = np.array([[0]])
+    mock_pg.population.return_value = m_pop
+    mock_pg.algorithm.return_value.evolve.return_value = m_pop
+    uda = MagicMock()
+    mock_opt.config['Patience'] = 1
+    mock_opt.batch_capable = True
+
+    with patch('ppno.pygmo_solver.perf_counter', side_effect=range(100)):
+        evolve_ppno(mock_opt, lambda: uda, "TEST")
+    uda.set_bfe.assert_called_once()
+    assert 'b' in mock_pg.population.call_args.kwargs
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from ppno.ppno import Optimization
+from ppno.local_refiner import LocalRefiner
+
+@pytest.fixture
+def hanoi(example_problem):
+    opt = Optimization(example_problem(Repair="YES", RepairBudget=20))
+    yield opt
+    opt.close()
+
+
+def test_feeding_pipes_reach_the_source(hanoi):
+    slack, headlosses = hanoi.hydraulic_state(hanoi.ubound)
+    graph = hanoi.supply_graph()
+    paths = graph.feeding_pipes(np.arange(len(hanoi.nodes)), headlosses)
+    assert len(paths) == len(hanoi.nodes)
+    # Every supply path starts at the pipe leaving the reservoir
+    first = {int(p[-1]) for p in paths if p.size}
+    assert len(first) == 1
+    assert all(p.size and len(set(p.tolist())) == p.size for p in paths)
+    # Pipes upstream of a node lie within its head loss from the source
+    deepest = int(np.argmax([p.size for p in paths]))
+    assert set(paths[deepest].tolist()) <= set(graph.upstream_pipes(deepest).tolist())
+
+
+def test_repair_restores_feasibility(hanoi):
+    np.random.seed(0)
+    base = hanoi.ubound.copy()
+    x = base.copy()
+    x[np.random.choice(hanoi.dimension, 8, replace=False)] = 0
+    assert hanoi.evaluate(x, exact=True)[1] > 0
+    cycles = hanoi.simulation_cycles
+    repaired = hanoi.repair(x)
+    assert hanoi.simulation_cycles - cycles <= 20
+    assert np.all(repaired >= x) and np.all(repaired <= hanoi.ubound)
+    # The last simulation of the repair is cached as an exact evaluation
+    cycles = hanoi.simulation_cycles
+    assert hanoi.evaluate(repaired, exact=True)[1] <= 0
+    assert hanoi.simulation_cycles == cycles
+
+
+def test_repair_budget_and_feasible_input(hanoi):
+    x = hanoi.lbound.copy()
+    cycles = hanoi.simulation_cycles
+    partial = hanoi.repair(x, max_sims=2)
+    assert hanoi.simulation_cycles - cycles == 2
+    assert partial.sum() > 0
+    hanoi.evaluate(hanoi.ubound)
+    assert np.array_equal(hanoi.repair(hanoi.ubound.astype(float) + 0.2), hanoi.ubound)
+
+
+def test_refiner_repairs_diversified_designs(hanoi):
+    refiner = LocalRefiner(hanoi, {'repair_budget': 20})
+    np.random.seed(1)
+    x = refiner.repair_hydraulics(refiner.diversify(hanoi.ubound - 1))
+    assert refiner.evaluate(x)['feasible']
+    assert LocalRefiner(hanoi).repair_hydraulics(hanoi.lbound) is hanoi.lbound
@@ -11,7 +11,9 @@ def mock_opt():
     opt.ubound = np.array([10, 10])
     opt.get_cost.return_value = 100.0
     opt.check.return_value = np.array([0.0, 0.0]) # No deficit
+    opt.evaluate.return_value = (100.0, 0.0)
     opt.config = {'MaxTime': 120}
+    opt.batch_capable = False
     return opt
 
 def test_solve_scipy_de(mock_opt):
@@ -65,8 +67,8 @@ def test_objective_feasible_path(mock_opt):
             return MagicMock(x=np.array([1, 1]))
         
         mock_de.side_effect = side_effect
-        mock_opt.check.return_value = np.array([-1.0]) # Feasible
-        mock_opt.get_cost.return_value = 100.0
+        mock_opt.evaluate.return_value = (100.0, -1.0) # Feasible
+        mock_opt.check.return_value = True
         
         solve_scipy(mock_opt, ALGORITHM_DE)
 
@@ -89,7 +91,8 @@ def test_objective_penalty_path(mock_opt):
             return MagicMock(x=np.array([1, 1]))
         
         mock_de.side_effect = side_effect
-        mock_opt.check.return_value = np.array([10.0]) # Infeasible deficit
+        mock_opt.evaluate.return_value = (100.0, 10.0) # Infeasible deficit
+        mock_opt.check.return_value = False
         solve_scipy(mock_opt, ALGORITHM_DE)
 
 def test_objective_penalty(mock_opt):
@@ -117,3 +120,48 @@ def test_timeout(mock_opt):
         # we need to actually run it.
         res = solve_scipy(mock_opt, ALGORITHM_DE)
         assert res is None # Should return None on timeout
+
+def test_timeout_returns_incumbent(mock_opt):
+    mock_opt.evaluate.side_effect = [(300.0, 0.0), (200.0, 0.0), (100.0, 5.0)]
+    with patch('ppno.scipy_solver.perf_counter', side_effect=[0, 1, 2, 3, 400]), \
+         patch('scipy.optimize.differential_evolution') as mock_de:
+        def side_effect(obj, bounds, **kwargs):
+            for x in ([1.2, 1.0], [2.0, 3.1], [0.0, 0.0], [4.0, 4.0]):
+                obj(np.array(x))
+            return MagicMock(x=np.array([0, 0]))
+        mock_de.side_effect = side_effect
+        res = solve_scipy(mock_opt, ALGORITHM_DE)
+    # The cheapest feasible design evaluated before the limit; infeasible ones are ignored
+    assert np.array_equal(res, [2, 3])
+    assert mock_opt.timed_out is True
+    mock_opt.set_x.assert_called_with(res)
+
+def test_callback_stops_on_timeout(mock_opt):
+    with patch('ppno.scipy_solver.perf_counter', side_effect=[0, 1, 400]), \
+         patch('scipy.optimize.dual_annealing') as mock_da:
+        def side_effect(obj, bounds, **kwargs):
+            obj(np.array([3.0, 4.0]))
+            # End of a step: the callback asks the solver to stop
+            assert kwargs['callback'](np.array([3.0, 4.0]), 100.0, 0) is True
+            return MagicMock(x=np.array([3, 4]), success=False)
+        mock_da.side_effect = side_effect
+        res = solve_scipy(mock_opt, ALGORITHM_DA)
+    assert np.array_equal(res, [3, 4])
+    mock_opt.check.assert_not_called()
+
+def test_de_parallel_uses_batch_objective(mock_opt):
+    mock_opt.batch_capable = True
+    mock_opt.evaluate_many.return_value = (np.array([100.0, 200.0]), np.array([-1.0, 0.5]),
+                                           np.array([True, False]))
+    with patch('scipy.optimize.differential_evolution') as mock_de:
+        def side_effect(obj, bounds, **kwargs):
+            assert kwargs['vectorized'] is True
+            values = obj(np.array([[1.2, 3.0], [1.0, 2.0]]))
+            assert values[0] == 100.0
+            assert values[1] > 1e9
+            return MagicMock(x=np.array([1, 1]))
+        mock_de.side_effect = side_effect
+        mock_opt.check.return_value = True
+        solve_scipy(mock_opt, ALGORITHM_DE)
+    X = mock_opt.evaluate_many.call_args[0][0]
+    assert np.array_equal(X, [[1, 1], [3, 2]])
@@ -0,0 +1,130 @@
+import numpy as np
+import pytest
+from collections import deque
+from ppno.ppno import Optimization
+from ppno.native_solver import NativeSolver
+from ppno.tree_evaluator import TreeEvaluator
+
+def _non_tree_links(solver):
+    """Links left out of a breadth-first spanning tree grown from the sources."""
+    adjacency = [[] for _ in solver.node_ids]
+    for k, (i, j) in enumerate(zip(solver.from_node, solver.to_node)):
+        adjacency[i].append(k)
+        adjacency[j].append(k)
+    seen = set(range(solver.n_junctions, len(solver.node_ids)))
+    used = set()
+    queue = deque(seen)
+    while queue:
+        node = queue.popleft()
+        for k in adjacency[node]:
+            other = solver.from_node[k] + solver.to_node[k] - node
+            if other not in seen:
+                seen.add(other)
+                used.add(k)
+                queue.append(other)
+    return [solver.link_ids[k] for k in range(len(solver.link_ids)) if k not in used]
+
+
+@pytest.fixture
+def branched_hanoi(tmp_path, examples_dir):
+    """Hanoi with its loops opened: the loop closing pipes are CLOSED and not sized."""
+    closed = _non_tree_links(NativeSolver.from_inp(examples_dir / "HAN.inp"))
+    inp = tmp_path / "HAN_tree.inp"
+    status = "".join(f" {link_id}\tClosed\n" for link_id in closed)
+    inp.write_text((examples_dir / "HAN.inp").read_text().replace("[STATUS]\n", "[STATUS]\n" + status))
+    lines = []
+    for line in (examples_dir / "example_1.ext").read_text().splitlines():
+        if line.split() and (line.split()[0] in closed or line.startswith("Algorithm")):
+            continue
+        lines.append(line.replace("./examples/HAN.inp", str(inp)))
+
+    def make(engine, options="", min_pressure=30.0):
+        ext = tmp_path / f"{engine}_tree.ext"
+        text = "\n".join(lines).replace("[OPTIONS]", f"[OPTIONS]\nEngine {engine}\n{options}")
+        ext.write_text(text.replace("    30.0", f"    {min_pressure}") + "\n")
+        return ext
+    return make
+
+
+def test_detection(examples_dir):
+    assert not TreeEvaluator.is_branched(NativeSolver.from_inp(examples_dir / "HAN.inp"))
+    assert not TreeEvaluator.is_branched(NativeSolver.from_inp(examples_dir / "BIN.inp"))
+    with pytest.raises(ValueError, match="not branched"):
+        TreeEvaluator(NativeSolver.from_inp(examples_dir / "HAN.inp"), np.arange(3), np.arange(3),
+                      np.ones((3, 2)), np.ones((3, 2)))
+
+
+def test_auto_engine_selection(branched_hanoi, examples_dir):
+    opt = Optimization(branched_hanoi("AUTO"))
+    try:
+        assert opt.config['Engine'] == 'TREE'
+    finally:
+        opt.close()
+    opt = Optimization(examples_dir / "example_1.ext")
+    try:
+        assert opt.config['Engine'] == 'TOOLKIT'
+    finally:
+        opt.close()
+
+
+def test_tree_matches_epanet(branched_hanoi):
+    toolkit = Optimization(branched_hanoi("TOOLKIT"))
+    tree = Optimization(branched_hanoi("TREE"))
+    try:
+        rng = np.random.default_rng(3)
+        X = rng.integers(toolkit.lbound, toolkit.ubound + 1, size=(6, toolkit.dimension))
+        expected = []
+        for x in X:
+            toolkit.set_x(x)
+            toolkit._et.ENinitH(0)
+            toolkit._et.ENrunH()
+            pressures = toolkit._read_pressures()
+            expected.append(pressures)
+            tree.set_x(x)
+            assert np.allclose(tree._min_pressure_array - tree.check('PD'), pressures, atol=1e-3)
+            assert np.allclose(tree._tree.headlosses(x)[0], toolkit._read_headlosses(), rtol=1e-4, atol=1e-3)
+            assert tree.check('TF') == toolkit.check('TF')
+        batch = tree._tree.pressures(X)
+        assert np.allclose(batch, np.array(expected), atol=1e-3)
+        cycles = tree.simulation_cycles
+        deficits = tree._simulate_many(X)
+        assert tree.simulation_cycles == cycles + len(X)
+        assert np.allclose(deficits, (tree._min_pressure_array - np.array(expected)).max(axis=1), atol=1e-3)
+    finally:
+        toolkit.close()
+        tree.close()
+
+
+def test_tree_engine_rejects_looped_network(example_problem):
+    ext = example_problem(Engine="TREE")
+    with pytest.raises(ValueError, match="not branched"):
+        Optimization(ext)
+
+
+def test_milp_stage1(branched_hanoi):
+    heuristic = Optimization(branched_hanoi("TREE", min_pressure=25.0))
+    try:
+        heuristic_cost = heuristic.evaluate(heuristic.solve(), exact=True)[0]
+    finally:
+        heuristic.close()
+    exact = Optimization(branched_hanoi("TOOLKIT", "Algorithm MILP", min_pressure=25.0))
+    try:
+        assert exact.use_milp and exact.algorithms == []
+        x = exact.solve()
+        assert x is not None
+        assert exact.results[0]['Algorithm'] == 'MILP'
+        cost, max_deficit = exact.evaluate(x, exact=True)
+        assert max_deficit <= 0
+        assert cost <= heuristic_cost + 1e-6
+    finally:
+        exact.close()
+
+
+def test_milp_falls_back_on_looped_network(example_problem):
+    opt = Optimization(example_problem(Algorithm="MILP"))
+    try:
+        assert opt.tree_model() is None
+        assert opt.solve() is not None
+        assert opt.results[0]['Algorithm'] == 'UH'
+    finally:
+        opt.close()
@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+from ppno.ppno import Optimization
+
+
+@pytest.mark.parametrize("example", ["example_1.ext", "example_3.ext"])
+def test_fast_uh_matches_classic_with_fewer_runs(example, example_problem):
+    results = {}
+    for mode in ('CLASSIC', 'FAST'):
+        opt = Optimization(example_problem(example, UHMode=mode))
+        try:
+            x = opt._solve_uh()
+            assert x is not None
+            assert opt.evaluate(x, exact=True)[1] <= 0
+            results[mode] = (opt.get_cost(), opt.simulation_cycles)
+        finally:
+            opt.close()
+    assert results['FAST'][1] < results['CLASSIC'][1]
+    assert results['FAST'][0] <= 1.05 * results['CLASSIC'][0]
+
+
+def test_unknown_uh_mode(example_problem):
+    with pytest.raises(ValueError, match="Unknown UH mode"):
+        Optimization(example_problem("example_1.ext", UHMode="TURBO"))